@@ -1,11 +1,13 @@
 from fastapi import APIRouter
+from app.core.config import settings
 from app.api.endpoints import (
     user,
     auth,
     chat,
     quantum,
     heatmap,
-    voice
+    voice,
+    metrics
 )
        
 
@@ -13,5 +15,10 @@ api_router = APIRouter()
 api_router.include_router(user.router, prefix="/users", tags=["Users"])
 api_router.include_router(auth.router, prefix="/auth", tags=["login"])
 api_router.include_router(chat.router, prefix="/chat", tags=["Chat"])
-api_router.include_router(quantum.router, prefix="/quantum", tags=["Quantum Integration"])
-api_router.include_router(voice.router, prefix="/Voice", tags=["Voice"])
+if settings.QUANTUM_ENABLED:
+    api_router.include_router(quantum.router, prefix="/quantum", tags=["Quantum Integration"])
+if settings.VOICE_ENABLED:
+    api_router.include_router(voice.router, prefix="/Voice", tags=["Voice"])
+api_router.include_router(heatmap.router, prefix="/heatmap", tags=["Heatmap"])
+if settings.METRICS_ENABLED:
+    api_router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
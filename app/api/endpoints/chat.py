@@ -1,104 +1,196 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+import json
+import time
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 from app.services.ai_services import ai_service
 from app.schemas.chat import Message as MessageSchema
-from app.db.models.user import User
+from app.services.user_cache import CurrentUser
 from app.services.auth import get_current_user
-from app.db.session import get_db
-from app.crud.chat import conversation_crud
-from typing import List
+from app.db.session import get_db, async_session
+from app.crud.chat import HistoryCursor, conversation_crud
+from app.core.metrics import LatencyRecorder, metrics_registry
+from app.services.heatmap import heatmap_engine
+from app.services.chat_pipeline import chat_pipeline, chat_stream_pipeline, quantum_chat_pipeline
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends
 from app.services.ai_services import ai_service
-from app.services.quantum import quantum_engine
 
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+stream_ttfb = LatencyRecorder()
+stream_ttlb = LatencyRecorder()
+metrics_registry.register("chat_stream", lambda: {
+    "time_to_first_byte": stream_ttfb.snapshot(),
+    "time_to_last_byte": stream_ttlb.snapshot()
+})
+
+def _parse_cursor(value: Optional[str], name: str) -> Optional[HistoryCursor]:
+    """A message id, or an ISO-8601 timestamp (UTC when no offset is given)"""
+    if value is None:
+        return None
+    if value.isdigit():
+        return int(value)
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(400, f"{name} must be a message id or an ISO-8601 timestamp")
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @router.post("", response_model=MessageSchema)
 async def chat(
     message: str,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Process user message and return AI response with engagement data
     """
     try:
-        # 1. Get conversation history
-        history = await conversation_crud.get_conversation_history(
+        # History and sentiment run concurrently, then the response is
+        # generated; storage and heatmap update overlap at the end
+        run = await chat_pipeline.run(
             db=db,
-            user_id=current_user.id,
-            limit=10  # Last 10 messages
-        )
-        
-        # 2. Analyze sentiment of incoming message
-        sentiment_score = await ai_service.analyze_sentiment(message)
-        
-        # 3. Generate AI response (with heatmap integration)
-        ai_response = await ai_service.generate_response(
             user=current_user,
             message=message,
-            conversation_history=history,
-            sentiment_score=sentiment_score
+            history_limit=10,  # Last 10 messages
+            started=time.perf_counter()
         )
+        ai_response = run["response"]
+        sentiment_score = run["sentiment"]
+        user_msg, ai_msg = run["store"]
         
-        # 4. Store the interaction
-        user_msg, ai_msg = await conversation_crud.store_interaction(
-            db=db,
-            user_id=current_user.id,
-            user_message=message,
-            ai_response=ai_response,
-            sentiment_score=sentiment_score
+        # Return formatted response
+        return JSONResponse(
+            content={
+                "id": ai_msg.id,
+                "content": ai_response,
+                "is_user": False,
+                "created_at": ai_msg.created_at.isoformat(),
+                "heatmap_data": {
+                    "current_sentiment": sentiment_score,
+                    "engagement_score": heatmap_engine.estimate_engagement(
+                        message, run.total, sentiment_score
+                    )
+                }
+            },
+            headers={"Server-Timing": run.server_timing()}
         )
         
-        # 5. Update heatmap
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Chat processing failed: {str(e)}"
+        )
+
+@router.post("/stream")
+async def chat_stream(
+    message: str,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Server-Sent Events variant of /chat: the response content is sent as soon
+    as it is generated, the heatmap payload follows, and the interaction is
+    persisted after the stream has closed
+    """
+    started = time.perf_counter()
+    state = {}
+
+    async def events():
+        try:
+            async with async_session() as db:
+                run = await chat_stream_pipeline.run(
+                    db=db,
+                    user=current_user,
+                    message=message,
+                    history_limit=10
+                )
+            ai_response = run["response"]
+            sentiment_score = run["sentiment"]
+            response_time = time.perf_counter() - started
+            state.update(response=ai_response, sentiment=sentiment_score, response_time=response_time)
+
+            yield _sse_event("message", {"content": ai_response, "is_user": False})
+            ttfb = time.perf_counter() - started
+            stream_ttfb.record(ttfb)
+
+            yield _sse_event("heatmap", {
+                "current_sentiment": sentiment_score,
+                "engagement_score": heatmap_engine.estimate_engagement(
+                    message, response_time, sentiment_score
+                )
+            })
+            yield _sse_event("done", {"ttfb_ms": round(ttfb * 1000, 3)})
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Chat processing failed: {str(e)}"})
+        finally:
+            stream_ttlb.record(time.perf_counter() - started)
+
+    async def persist():
+        if "response" not in state:
+            return
+        async with async_session() as db:
+            await conversation_crud.store_interaction(
+                db=db,
+                user_id=current_user.id,
+                user_message=message,
+                ai_response=state["response"],
+                sentiment_score=state["sentiment"]
+            )
         await ai_service.update_heatmap(
             user_id=current_user.id,
             interaction_data={
+                "message": message,
+                "response": state["response"],
                 "message_length": len(message),
-                "response_time": 0.5,  # Would calculate this in real implementation
-                "sentiment": sentiment_score
-            }
-        )
-        
-        # 6. Return formatted response
-        return JSONResponse(content={
-            "id": ai_msg.id,
-            "content": ai_response,
-            "is_user": False,
-            "created_at": ai_msg.created_at.isoformat(),
-            "heatmap_data": {
-                "current_sentiment": sentiment_score,
-                "engagement_score": current_user.engagement_score
+                "response_time": state["response_time"],
+                "sentiment": state["sentiment"]
             }
-        })
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Chat processing failed: {str(e)}"
         )
 
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(persist)
+    )
+
 @router.get("/history", response_model=List[MessageSchema])
 async def get_history(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-    limit: int = 20
+    limit: int = Query(20, ge=1, le=100),
+    before: Optional[str] = Query(None, description="Messages older than this message id or timestamp"),
+    after: Optional[str] = Query(None, description="Messages newer than this message id or timestamp")
 ):
-    """Get conversation history"""
-    messages = await conversation_crud.get_conversation_history(
-        db=db,
-        user_id=current_user.id,
-        limit=limit
-    )
+    """
+    Get conversation history, newest first. Page backwards by passing the
+    last message's id as `before`; poll for new messages with the first
+    message's id as `after`.
+    """
+    try:
+        messages = await conversation_crud.get_conversation_history(
+            db=db,
+            user_id=current_user.id,
+            limit=limit,
+            before=_parse_cursor(before, "before"),
+            after=_parse_cursor(after, "after")
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
     return messages
 
 @router.post("/quantum-chat")
 async def quantum_chat(
     message: str,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Endpoint that leverages quantum decision-making"""
@@ -109,17 +201,14 @@ async def quantum_chat(
             detail="Quantum features require premium subscription"
         )
     
-    # Get conversation history
-    history = await conversation_crud.get_conversation_history(
-        db, current_user.id, limit=5
-    )
-    
-    # Generate quantum-optimized response
-    response = await ai_service.generate_response(
+    # History and sentiment run concurrently, then the quantum-optimized response
+    run = await quantum_chat_pipeline.run(
+        db=db,
         user=current_user,
         message=message,
-        conversation_history=history
+        history_limit=5
     )
+    response = run["response"]
     
     return {
         "response": response,
@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Literal
+from typing import Literal, Optional
 from datetime import timedelta,datetime
 from app.services.auth import get_current_user
 from app.db.session import get_db
 from app.services.heatmap import heatmap_engine
-from app.db.models.user import User
+from app.services.downsampling import downsample_series
+from app.crud.heatmap import heatmap_crud
+from app.services import heatmap_analytics
+from app.services.user_cache import CurrentUser
 from app.db.models.heatmap import InteractionHeatmap,UserHeatmapProfile
 from sqlalchemy import select
 
@@ -15,35 +18,55 @@ router = APIRouter()
 @router.get("/raw")
 async def get_raw_heatmap(
     timeframe: Literal['24h', '7d', '30d'] = '7d',
-    current_user: User = Depends(get_current_user),
+    resolution: Literal['raw', '5m', 'hourly', 'daily'] = 'raw',
+    max_points: Optional[int] = Query(None, ge=3, le=10000),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get raw heatmap data for visualization"""
+    """
+    Get heatmap data for visualization as columnar arrays. Coarser
+    resolutions are averaged per time bucket in the database; `max_points`
+    additionally downsamples the series (LTTB) while keeping its shape.
+    """
     time_ago = {
         '24h': timedelta(hours=24),
         '7d': timedelta(days=7),
         '30d': timedelta(days=30)
     }[timeframe]
     
-    result = await db.execute(
-        select(InteractionHeatmap)
-        .where(InteractionHeatmap.user_id == current_user.id)
-        .where(InteractionHeatmap.timestamp >= datetime.utcnow() - time_ago)
-        .order_by(InteractionHeatmap.timestamp)
+    series = await heatmap_crud.get_series(
+        db=db,
+        user_id=current_user.id,
+        since=datetime.utcnow() - time_ago,
+        resolution=resolution
     )
+    if max_points:
+        series = downsample_series(series, max_points)
     
-    interactions = result.scalars().all()
+    series["timestamps"] = [t.isoformat() for t in series["timestamps"]]
+    return JSONResponse(content={"resolution": resolution, **series})
+
+@router.get("/matrix")
+async def get_heatmap_matrix(
+    timeframe: Literal['7d', '30d', '90d'] = '30d',
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Weekday x hour engagement/sentiment matrix with percentiles and peak cells"""
+    time_ago = {
+        '7d': timedelta(days=7),
+        '30d': timedelta(days=30),
+        '90d': timedelta(days=90)
+    }[timeframe]
     
-    return JSONResponse(content={
-        "timestamps": [i.timestamp.isoformat() for i in interactions],
-        "engagement": [i.engagement_score for i in interactions],
-        "sentiment": [i.sentiment_score for i in interactions],
-        "response_times": [i.response_time for i in interactions]
-    })
+    columns = await heatmap_analytics.fetch_columns(
+        db, current_user.id, datetime.utcnow() - time_ago
+    )
+    return heatmap_analytics.engagement_matrix(columns)
 
 @router.get("/summary")
 async def get_heatmap_summary(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get aggregated heatmap insights"""
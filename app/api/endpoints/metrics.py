@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+from app.core.metrics import metrics_registry
+from app.services.user_cache import CurrentUser
+from app.services.auth import get_current_user
+
+router = APIRouter()
+
+@router.get("")
+async def get_metrics(current_user: CurrentUser = Depends(get_current_user)):
+    """Runtime metrics reported by the backend services"""
+    return metrics_registry.collect()
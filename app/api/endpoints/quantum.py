@@ -1,30 +1,60 @@
-from qiskit import QuantumCircuit
-from qiskit.visualization import circuit_drawer
+from typing import Optional
 from fastapi.responses import Response
-from app.db.models.user import User
-from fastapi import Depends, APIRouter
+from app.services.user_cache import CurrentUser
+from fastapi import Depends, APIRouter, HTTPException, Query, Request
+from app.core.config import settings
 from app.services.auth import get_current_user
+from app.core.subsystems import circuit_renderer
+from app.services.quantum_errors import RenderBudgetExceededError
 
 router = APIRouter()
 
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 7232 requires for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
 @router.get("/visualize-circuit")
 async def visualize_circuit(
+    request: Request,
     response_type: str = "text",
-    current_user: User = Depends(get_current_user)
+    circuit: str = "sample",
+    qubits: Optional[int] = None,
+    marked: Optional[str] = Query(None, description="Comma-separated basis states (grover)"),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    """Returns quantum circuit diagram"""
-    # Sample circuit
-    qc = QuantumCircuit(3)
-    qc.h([0,1,2])
-    qc.cz(0,1)
-    qc.cz(1,2)
-    qc.measure_all()
-    
-    if response_type == "text":
-        # ASCII art
-        diagram = circuit_drawer(qc, output='text').single_string()
-        return Response(content=diagram, media_type="text/plain")
-    else:
-        # SVG image
-        diagram = circuit_drawer(qc, output='svg')
-        return Response(content=diagram, media_type="image/svg+xml")
\ No newline at end of file
+    """
+    Returns quantum circuit diagram. Diagrams are cached per circuit
+    structure and format and carry a strong ETag, so polling clients can
+    revalidate with If-None-Match and get a 304.
+    """
+    fmt = "text" if response_type == "text" else "svg"
+    renderer = await circuit_renderer.aload()
+    try:
+        marked_states = [int(m) for m in marked.split(",") if m.strip()] if marked else None
+        qc = renderer.build(circuit, qubits, marked_states)
+        rendered = await renderer.render(qc, fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RenderBudgetExceededError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many new diagrams requested, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=f"Diagram format unavailable: {str(e)}")
+
+    headers = {
+        "ETag": rendered.etag,
+        "Cache-Control": f"private, max-age={settings.CIRCUIT_RENDER_MAX_AGE_SECONDS}"
+    }
+    if _etag_matches(request.headers.get("if-none-match"), rendered.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=rendered.body, media_type=rendered.media_type, headers=headers)
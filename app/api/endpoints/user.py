@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
 from app.schemas.user import UserCreate, UserResponse
 from app.crud.user import create_user,get_user_by_email
-from app.db.models.user import User
+from app.services.user_cache import CurrentUser
 from app.services.auth import get_current_user
 
 router = APIRouter()
@@ -17,5 +17,5 @@ async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     return new_user
 
 @router.get("/me", response_model=UserResponse)
-async def get_profile(current_user: User = Depends(get_current_user)):
+async def get_profile(current_user: CurrentUser = Depends(get_current_user)):
     return current_user
\ No newline at end of file
@@ -1,38 +1,226 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
-from fastapi.responses import JSONResponse
-from app.services.voice import voice_processor
+import asyncio
+import time
+from fastapi import (
+    APIRouter, UploadFile, File, Depends, HTTPException, Query,
+    WebSocket, WebSocketDisconnect, status
+)
+from fastapi.responses import Response
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder, metrics_registry
+from app.core.subsystems import SubsystemDisabledError, voice_processor
 from app.schemas.voice import VoiceResponse
-from app.db.models.user import User
+from app.services.user_cache import CurrentUser
+from app.db.session import async_session
 from app.services.auth import get_current_user
-from typing import Annotated
-from app.services import ai_services
+from app.services.voice_encoding import FEATURE_DTYPES, FEATURE_MODES
+from app.services.voice_stream import (
+    STREAM_ENCODINGS, StreamLimitError, VoiceStreamSession, voice_stream_stats
+)
+from typing import Annotated, Dict, Optional
+from app.services.ai_services import ai_service
 
 router = APIRouter()
 
+
+class _ResponseSizes:
+    """Response bytes and JSON serialization time per features mode"""
+    def __init__(self):
+        self.count = 0
+        self.total_bytes = 0
+        self.max_bytes = 0
+        self.serialize = LatencyRecorder()
+
+    def record(self, size: int):
+        self.count += 1
+        self.total_bytes += size
+        self.max_bytes = max(self.max_bytes, size)
+
+    def snapshot(self) -> dict:
+        return {
+            "responses": self.count,
+            "mean_bytes": round(self.total_bytes / self.count) if self.count else 0,
+            "max_bytes": self.max_bytes,
+            "serialize": self.serialize.snapshot()
+        }
+
+
+response_sizes: Dict[str, _ResponseSizes] = {mode: _ResponseSizes() for mode in FEATURE_MODES}
+metrics_registry.register("voice_responses", lambda: {
+    mode: sizes.snapshot() for mode, sizes in response_sizes.items()
+})
+
 @router.post("/process", response_model=VoiceResponse)
 async def process_voice_input(
-    current_user: Annotated[User, Depends(get_current_user)],
-    audio_file: UploadFile = File(...)
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    audio_file: UploadFile = File(...),
+    features: Optional[str] = Query(
+        None,
+        description="summary | full | full-binary | none (default: server setting)"
+    ),
+    feature_dtype: str = Query("float32", description="Array dtype for full-binary: float16 | float32")
 ):
     """Endpoint for processing voice messages"""
     if not audio_file.content_type.startswith("audio/"):
         raise HTTPException(400, "Only audio files are accepted")
-    
+    features_mode = features or settings.VOICE_FEATURES_DEFAULT_MODE
+    if features_mode not in FEATURE_MODES:
+        raise HTTPException(400, f"features must be one of {', '.join(FEATURE_MODES)}")
+    if feature_dtype not in FEATURE_DTYPES:
+        raise HTTPException(400, f"feature_dtype must be one of {', '.join(FEATURE_DTYPES)}")
+
     audio_bytes = await audio_file.read()
-    text, analysis = await voice_processor.process_audio(
+    processor = await voice_processor.aload()
+    text, analysis = await processor.process_audio(
         user=current_user,
         audio_bytes=audio_bytes,
-        content_type=audio_file.content_type.split("/")[1]
+        content_type=audio_file.content_type.split("/")[1],
+        features_mode=features_mode,
+        feature_dtype=feature_dtype
     )
-    
+
     # Generate response (connect to your AI service)
-    ai_response = await ai_services.generate_voice_response(
+    ai_response = await ai_service.generate_voice_response(
         user=current_user,
         voice_analysis=analysis
     )
-    
-    return VoiceResponse(
+
+    result = VoiceResponse(
         text_response=ai_response,
         emotion_adapted=True,
         voice_analysis=analysis
-    )
\ No newline at end of file
+    )
+    # Serialized here rather than by FastAPI so the cost and size of each
+    # features mode can be measured
+    sizes = response_sizes[features_mode]
+    with sizes.serialize.time():
+        body = result.model_dump_json()
+    sizes.record(len(body))
+    return Response(content=body, media_type="application/json")
+
+
+@router.websocket("/stream")
+async def stream_voice_input(
+    websocket: WebSocket,
+    token: str = Query(...),
+    sample_rate: int = Query(16000, ge=8000, le=48000),
+    encoding: str = Query("pcm16", description="pcm16 | f32 (mono, little-endian)"),
+    transcribe: bool = Query(True)
+):
+    """
+    Streaming voice messages. Send audio as binary frames, then the text
+    frame "end". Replies with JSON events: "ready", "progress" (partial
+    emotion), "emotion" as soon as the last chunk is analyzed, then "result"
+    (a VoiceResponse). Only the running analysis is held, plus the PCM
+    itself when `transcribe` is on (bounded by the stream duration limit).
+    Any other text frame is rejected, and sessions are limited in idle and
+    total time.
+    """
+    # Browsers can't set headers on a WebSocket, so the token comes in the
+    # query; the session is only held for the lookup
+    async with async_session() as db:
+        try:
+            user = await get_current_user(token=token, db=db)
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+    if encoding not in STREAM_ENCODINGS:
+        await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+        return
+    try:
+        processor = await voice_processor.aload()
+    except SubsystemDisabledError:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    stats = voice_stream_stats
+    if stats.active >= settings.VOICE_STREAM_MAX_SESSIONS:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    # Counted before the first await so concurrent handshakes can't all pass the check
+    stats.active += 1
+    try:
+        await websocket.accept()
+        stats.started += 1
+        loop = asyncio.get_running_loop()
+        session = VoiceStreamSession(
+            sample_rate=sample_rate,
+            encoding=encoding,
+            max_seconds=settings.VOICE_STREAM_MAX_SECONDS,
+            max_chunk_bytes=settings.VOICE_STREAM_MAX_CHUNK_BYTES,
+            keep_audio=transcribe
+        )
+        progress_every = settings.VOICE_STREAM_PROGRESS_SECONDS
+        next_progress = progress_every
+        deadline = loop.time() + settings.VOICE_STREAM_SESSION_TIMEOUT_SECONDS
+        await websocket.send_json({
+            "event": "ready",
+            "sample_rate": sample_rate,
+            "max_seconds": settings.VOICE_STREAM_MAX_SECONDS,
+            "max_chunk_bytes": settings.VOICE_STREAM_MAX_CHUNK_BYTES
+        })
+        while True:
+            timeout = min(settings.VOICE_STREAM_IDLE_TIMEOUT_SECONDS, deadline - loop.time())
+            if timeout <= 0:
+                raise asyncio.TimeoutError
+            message = await asyncio.wait_for(websocket.receive(), timeout)
+            if message["type"] == "websocket.disconnect":
+                return
+            chunk = message.get("bytes")
+            if chunk is None:
+                if (message.get("text") or "").strip() == "end":
+                    break
+                stats.rejected += 1
+                await websocket.send_json({
+                    "event": "error",
+                    "detail": 'Send audio as binary frames and the text frame "end" to finish'
+                })
+                await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+                return
+
+            stats.bytes += len(chunk)
+            with stats.chunk_latency.time():
+                await loop.run_in_executor(None, session.feed, chunk)
+            stats.peak_buffered_bytes = max(stats.peak_buffered_bytes, session.buffered_bytes())
+            if progress_every and session.seconds >= next_progress:
+                next_progress = session.seconds + progress_every
+                emotion = await loop.run_in_executor(None, processor.stream_emotion, session)
+                await websocket.send_json({
+                    "event": "progress",
+                    "seconds": round(session.seconds, 3),
+                    "emotion": emotion
+                })
+
+        ended = time.perf_counter()
+        session.finish()
+        emotion = await loop.run_in_executor(None, processor.stream_emotion, session)
+        stats.emotion_latency.record(time.perf_counter() - ended)
+        await websocket.send_json({
+            "event": "emotion",
+            "seconds": round(session.seconds, 3),
+            "emotion": emotion
+        })
+
+        text, analysis = await processor.finish_stream(session, emotion)
+        ai_response = await ai_service.generate_voice_response(
+            user=user,
+            voice_analysis=analysis
+        )
+        result = VoiceResponse(
+            text_response=ai_response,
+            emotion_adapted=True,
+            voice_analysis=analysis
+        )
+        await websocket.send_json({"event": "result", "response": result.model_dump(mode="json")})
+        stats.completed += 1
+        await websocket.close()
+    except StreamLimitError as e:
+        stats.rejected += 1
+        await websocket.send_json({"event": "error", "detail": str(e)})
+        await websocket.close(code=status.WS_1009_MESSAGE_TOO_BIG)
+    except asyncio.TimeoutError:
+        stats.rejected += 1
+        await websocket.send_json({"event": "error", "detail": "Stream idle for too long or over its time limit"})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        stats.active -= 1
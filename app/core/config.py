@@ -1,12 +1,22 @@
 # app/core/config.py
 from pydantic_settings import BaseSettings
 from datetime import timedelta
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Quantum AI Chatbot"
     VERSION: str = "1.0.0"
     DEBUG: bool = True
 
+    # Heavy subsystems are imported on first use unless preloaded at startup
+    # ("quantum", "voice", "sentiment"); disabled ones aren't mounted at all
+    QUANTUM_ENABLED: bool = True
+    VOICE_ENABLED: bool = True
+    PRELOAD_SUBSYSTEMS: List[str] = ["sentiment"]
+    # /metrics (internal counters and latencies) needs a logged-in user;
+    # False doesn't mount it at all
+    METRICS_ENABLED: bool = True
+
     # Local PostgreSQL DB
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "seven"
@@ -17,6 +27,85 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Password hashing (bcrypt runs on a dedicated thread pool)
+    HASHING_MAX_WORKERS: int = 4
+    HASHING_MAX_QUEUE: int = 64
+
+    # Authenticated user cache (skips the users lookup on every request)
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    # Also the longest another worker can serve a user changed elsewhere
+    AUTH_CACHE_TTL_SECONDS: int = 60
+
+    # Heatmap write-behind ingestion
+    HEATMAP_BATCH_SIZE: int = 500
+    HEATMAP_FLUSH_INTERVAL_SECONDS: float = 1.0
+    HEATMAP_MAX_PENDING: int = 10000
+
+    # Sentiment model (empty name = lexicon scorer only)
+    SENTIMENT_MODEL: str = "distilbert-base-uncased-finetuned-sst-2-english"
+    SENTIMENT_MAX_BATCH_SIZE: int = 32
+    SENTIMENT_MAX_WAIT_MS: int = 10
+    SENTIMENT_CACHE_SIZE: int = 4096
+
+    # Quantum decision engine: aer (sampled), statevector or analytic (exact NumPy)
+    QUANTUM_EXECUTION_MODE: str = "analytic"
+    QUANTUM_SEED: Optional[int] = None
+    QUANTUM_CIRCUIT_CACHE_SIZE: int = 256
+    QUANTUM_PREWARM_MAX_CANDIDATES: int = 4
+    QUANTUM_BATCH_MAX_SIZE: int = 16
+    QUANTUM_BATCH_WINDOW_MS: int = 5
+    # Simulating past this (statevector/aer) costs seconds; larger searches use analytic
+    QUANTUM_SIMULATION_MAX_QUBITS: int = 6
+    # Adaptive shots (aer): rounds double the shots until the leader is clear
+    # at the tier's confidence or the tier's cap is reached
+    QUANTUM_ADAPTIVE_SHOTS: bool = True
+    QUANTUM_MIN_SHOTS: int = 64
+    QUANTUM_MAX_SHOTS: int = 1024
+    QUANTUM_CONFIDENCE: float = 0.95
+    QUANTUM_INDIFFERENCE: float = 0.1
+    QUANTUM_TIER_CONFIDENCE: Dict[str, float] = {"premium": 0.95, "elite": 0.99}
+    # A tier's own cap replaces QUANTUM_MAX_SHOTS whether it is lower or higher;
+    # QUANTUM_MAX_SHOTS only applies to tiers not listed and to untiered calls
+    QUANTUM_TIER_MAX_SHOTS: Dict[str, int] = {"premium": 512, "elite": 2048}
+    # Worker processes that run simulator jobs (aer mode)
+    QUANTUM_WORKERS: int = 2
+    QUANTUM_MAX_PENDING_JOBS: int = 64  # Circuits waiting for a worker; more get a 503
+    QUANTUM_JOB_TIMEOUT_SECONDS: float = 10.0
+    QUANTUM_WORKER_MAX_JOBS: int = 500
+
+    # Circuit diagrams for /quantum/visualize-circuit
+    CIRCUIT_RENDER_CACHE_SIZE: int = 128
+    CIRCUIT_RENDER_MAX_QUBITS: int = 8
+    CIRCUIT_RENDER_MAX_MARKED: int = 4
+    CIRCUIT_RENDER_BUDGET_PER_MINUTE: int = 30  # Uncached renders; cache hits are free
+    CIRCUIT_RENDER_MAX_AGE_SECONDS: int = 60
+
+    # Voice feature extraction worker processes
+    VOICE_FEATURE_WORKERS: int = 2
+    VOICE_FEATURE_TIMEOUT_SECONDS: float = 30.0
+    VOICE_FEATURE_WORKER_MAX_JOBS: int = 200
+    # summary | full | full-binary | none, when the request doesn't say
+    VOICE_FEATURES_DEFAULT_MODE: str = "summary"
+    # Results of byte-identical uploads (client retries), 0 bytes = off
+    VOICE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    VOICE_CACHE_TTL_SECONDS: float = 300.0
+    # Speech-to-text: google (network), sphinx (offline, needs pocketsphinx)
+    # or stub (fixed text, for tests); the fallback runs when the backend is
+    # unreachable or times out ("" = none)
+    TRANSCRIPTION_BACKEND: str = "google"
+    TRANSCRIPTION_FALLBACK: str = "sphinx"
+    TRANSCRIPTION_LANGUAGE: str = "en-US"
+    TRANSCRIPTION_WORKERS: int = 4
+    TRANSCRIPTION_MAX_QUEUE: int = 16
+    TRANSCRIPTION_TIMEOUT_SECONDS: float = 15.0
+    # Streaming voice sessions (/Voice/stream WebSocket)
+    VOICE_STREAM_MAX_SESSIONS: int = 32
+    VOICE_STREAM_MAX_SECONDS: float = 120.0
+    VOICE_STREAM_MAX_CHUNK_BYTES: int = 256 * 1024
+    VOICE_STREAM_IDLE_TIMEOUT_SECONDS: float = 15.0
+    VOICE_STREAM_SESSION_TIMEOUT_SECONDS: float = 180.0  # Whole session, however frames are paced
+    VOICE_STREAM_PROGRESS_SECONDS: float = 2.0  # 0 = no partial emotion events
+
     @property
     
     def DATABASE_URL(self) -> str:
@@ -0,0 +1,67 @@
+import time
+from collections import deque
+from typing import Callable, Dict
+
+
+class LatencyRecorder:
+    """Keeps a rolling window of latency samples and summarises them"""
+    def __init__(self, window: int = 1024):
+        self._samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def time(self) -> "_Timer":
+        """Context manager that records the elapsed time of its block"""
+        return _Timer(self)
+
+    def snapshot(self) -> dict:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"count": self.count}
+
+        def pct(p: float) -> float:
+            idx = min(len(samples) - 1, int(p * len(samples)))
+            return round(samples[idx] * 1000, 3)
+
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3),
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": round(samples[-1] * 1000, 3)
+        }
+
+
+class _Timer:
+    def __init__(self, recorder: LatencyRecorder):
+        self.recorder = recorder
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        self.recorder.record(self.elapsed)
+        return False
+
+
+class MetricsRegistry:
+    """Collects stats providers from services so they can be exposed in one place"""
+    def __init__(self):
+        self._providers: Dict[str, Callable[[], dict]] = {}
+
+    def register(self, name: str, provider: Callable[[], dict]):
+        self._providers[name] = provider
+
+    def collect(self) -> dict:
+        return {name: provider() for name, provider in self._providers.items()}
+
+
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,129 @@
+import asyncio
+import importlib
+import os
+import resource
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+
+
+class SubsystemDisabledError(RuntimeError):
+    """Raised when a disabled subsystem is used"""
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # No procfs: fall back to the peak RSS (kilobytes on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Subsystem:
+    """
+    A heavy, optional part of the app (and the modules it's made of). Its
+    modules are imported on first use, or at startup when listed in
+    PRELOAD_SUBSYSTEMS, and the import time and RSS growth are recorded.
+    """
+    def __init__(self, name: str, modules: List[str], enabled: bool = True):
+        self.name = name
+        self.modules = modules
+        self.enabled = enabled
+        self.imports: Dict[str, dict] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def loaded(self) -> bool:
+        return any(module in sys.modules for module in self.modules)
+
+    def import_module(self, module: str):
+        if not self.enabled:
+            raise SubsystemDisabledError(f"The {self.name} subsystem is disabled")
+        # Modules already pulled in by another import cost nothing more
+        # (import_module still waits if another thread is mid-import)
+        if module in sys.modules:
+            return importlib.import_module(module)
+        with self._lock:
+            if module not in sys.modules:
+                rss = current_rss()
+                start = time.perf_counter()
+                imported = importlib.import_module(module)
+                self.imports[module] = {
+                    "seconds": round(time.perf_counter() - start, 4),
+                    "rss_mb": round((current_rss() - rss) / 2 ** 20, 2)
+                }
+                return imported
+        return importlib.import_module(module)
+
+    def load(self):
+        """Import every module of the subsystem"""
+        for module in self.modules:
+            self.import_module(module)
+
+    def lazy(self, module: str, attr: str) -> "LazyService":
+        return LazyService(self, module, attr)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "loaded": self.loaded,
+            "load_seconds": round(sum(i["seconds"] for i in self.imports.values()), 4),
+            "modules": dict(self.imports)
+        }
+
+
+class LazyService:
+    """
+    Stands in for a module-level singleton of a subsystem. Attribute access
+    imports the module on first use; async code should `await aload()`
+    first so that the import runs off the event loop.
+    """
+    def __init__(self, subsystem: Subsystem, module: str, attr: str):
+        self._subsystem = subsystem
+        self._module = module
+        self._attr = attr
+
+    @property
+    def loaded(self) -> bool:
+        return self._module in sys.modules
+
+    def load(self) -> Any:
+        return getattr(self._subsystem.import_module(self._module), self._attr)
+
+    async def aload(self) -> Any:
+        if self.loaded:
+            return self.load()
+        return await asyncio.get_running_loop().run_in_executor(None, self.load)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.load(), name)
+
+
+quantum = Subsystem(
+    "quantum",
+    modules=["app.services.quantum", "app.services.quantum_executor", "app.services.circuit_render"],
+    enabled=settings.QUANTUM_ENABLED
+)
+voice = Subsystem(
+    "voice",
+    modules=["app.services.voice", "app.services.voice_features", "app.services.transcription"],
+    enabled=settings.VOICE_ENABLED
+)
+SUBSYSTEMS = {s.name: s for s in (quantum, voice)}
+
+quantum_engine = quantum.lazy("app.services.quantum", "quantum_engine")
+quantum_executor = quantum.lazy("app.services.quantum_executor", "quantum_executor")
+circuit_renderer = quantum.lazy("app.services.circuit_render", "circuit_renderer")
+voice_processor = voice.lazy("app.services.voice", "voice_processor")
+voice_feature_engine = voice.lazy("app.services.voice_features", "voice_feature_engine")
+transcription_service = voice.lazy("app.services.transcription", "transcription_service")
+
+metrics_registry.register("subsystems", lambda: {
+    name: subsystem.stats() for name, subsystem in SUBSYSTEMS.items()
+})
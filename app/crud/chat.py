@@ -1,25 +1,109 @@
+from sqlalchemy import Select, true, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
 from app.db.models.chat import Conversation, Message
 from app.db.models.user import User
 from datetime import datetime
+from typing import Optional, Tuple, Union
+
+# A page boundary: a message id, or a timestamp
+HistoryCursor = Union[int, datetime]
+# The boundary resolved to its keyset position; id is None for timestamps
+Keyset = Tuple[datetime, Optional[int]]
 
 class ConversationCRUD:
     async def get_conversation_history(
         self, 
         db: AsyncSession, 
         user_id: int,
-        limit: int = 20
+        limit: int = 20,
+        before: Optional[HistoryCursor] = None,
+        after: Optional[HistoryCursor] = None
     ) -> list[Message]:
-        """Get last N messages for a user"""
-        result = await db.execute(
-            select(Message)
-            .join(Conversation)
+        """
+        Get N messages for a user, newest first: the latest ones, the ones
+        just older than `before`, or the ones just newer than `after`.
+        Raises ValueError for a message id cursor the user doesn't own.
+        """
+        stmt = self.history_statement(
+            user_id,
+            limit,
+            before=await self._resolve_cursor(db, user_id, before),
+            after=await self._resolve_cursor(db, user_id, after)
+        )
+        messages = (await db.execute(stmt)).scalars().all()
+        # "after" pages are fetched oldest first so they start at the cursor
+        return messages[::-1] if after is not None else messages
+
+    def history_statement(
+        self,
+        user_id: int,
+        limit: int,
+        before: Optional[Keyset] = None,
+        after: Optional[Keyset] = None
+    ) -> Select:
+        """
+        Keyset page over (created_at, id). Each of the user's conversations
+        contributes at most `limit` rows from the front of
+        ix_messages_conversation_id_created_at_id (LATERAL ... LIMIT), and
+        only those are merged and cut to `limit`, so the cost follows the
+        page size and conversation count, not the length of the history.
+        """
+        if after is not None:
+            order = (Message.created_at.asc(), Message.id.asc())
+        else:
+            order = (Message.created_at.desc(), Message.id.desc())
+
+        page = select(Message).where(Message.conversation_id == Conversation.id)
+        if before is not None:
+            page = page.where(self._keyset_filter(before, older=True))
+        if after is not None:
+            page = page.where(self._keyset_filter(after, older=False))
+        page = page.order_by(*order).limit(limit).lateral("page")
+
+        message = aliased(Message, page)
+        if after is not None:
+            outer_order = (message.created_at.asc(), message.id.asc())
+        else:
+            outer_order = (message.created_at.desc(), message.id.desc())
+        return (
+            select(message)
+            .select_from(Conversation)
+            .join(page, true())
             .where(Conversation.user_id == user_id)
-            .order_by(Message.created_at.desc())
+            .order_by(*outer_order)
             .limit(limit)
         )
-        return result.scalars().all()
+
+    @staticmethod
+    def _keyset_filter(cursor: Keyset, older: bool):
+        created_at, message_id = cursor
+        if message_id is None:
+            return Message.created_at < created_at if older else Message.created_at > created_at
+        position = tuple_(Message.created_at, Message.id)
+        boundary = tuple_(created_at, message_id)
+        return position < boundary if older else position > boundary
+
+    async def _resolve_cursor(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        cursor: Optional[HistoryCursor]
+    ) -> Optional[Keyset]:
+        if cursor is None:
+            return None
+        if isinstance(cursor, datetime):
+            return cursor, None
+        result = await db.execute(
+            select(Message.created_at, Message.id)
+            .join(Conversation)
+            .where(Message.id == cursor, Conversation.user_id == user_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise ValueError(f"Unknown message {cursor}")
+        return row.created_at, row.id
 
     async def store_interaction(
         self,
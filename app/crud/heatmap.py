@@ -0,0 +1,84 @@
+from datetime import datetime
+from sqlalchemy import func, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.db.models.heatmap import InteractionHeatmap
+
+
+def _bucket(resolution: str):
+    """SQL expression truncating the interaction timestamp to a bucket start"""
+    # Constants are inlined so the SELECT and GROUP BY expressions are identical
+    ts = InteractionHeatmap.timestamp
+    if resolution == "hourly":
+        return func.date_trunc(literal_column("'hour'"), ts)
+    if resolution == "daily":
+        return func.date_trunc(literal_column("'day'"), ts)
+    if resolution == "5m":
+        five_minute_slot = func.floor(func.extract("minute", ts) / literal_column("5"))
+        return (
+            func.date_trunc(literal_column("'hour'"), ts)
+            + five_minute_slot * literal_column("interval '5 minutes'")
+        )
+    raise ValueError(f"Unknown resolution '{resolution}'")
+
+
+class HeatmapCRUD:
+    async def get_series(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        since: datetime,
+        resolution: str = "raw"
+    ) -> dict:
+        """
+        Interaction series as columnar lists. Non-raw resolutions are
+        aggregated in Postgres with one row per time bucket.
+        """
+        if resolution == "raw":
+            query = (
+                select(
+                    InteractionHeatmap.timestamp,
+                    InteractionHeatmap.engagement_score,
+                    InteractionHeatmap.sentiment_score,
+                    InteractionHeatmap.response_time
+                )
+                .where(InteractionHeatmap.user_id == user_id)
+                .where(InteractionHeatmap.timestamp >= since)
+                .order_by(InteractionHeatmap.timestamp)
+            )
+        else:
+            bucket = _bucket(resolution).label("bucket")
+            query = (
+                select(
+                    bucket,
+                    func.avg(InteractionHeatmap.engagement_score),
+                    func.avg(InteractionHeatmap.sentiment_score),
+                    func.avg(InteractionHeatmap.response_time),
+                    func.count()
+                )
+                .where(InteractionHeatmap.user_id == user_id)
+                .where(InteractionHeatmap.timestamp >= since)
+                .group_by(bucket)
+                .order_by(bucket)
+            )
+
+        rows = (await db.execute(query)).all()
+        columns = list(zip(*rows)) if rows else [()] * (4 if resolution == "raw" else 5)
+
+        series = {
+            "timestamps": list(columns[0]),
+            "engagement": [_as_float(v) for v in columns[1]],
+            "sentiment": [_as_float(v) for v in columns[2]],
+            "response_times": [_as_float(v) for v in columns[3]]
+        }
+        if resolution != "raw":
+            series["counts"] = list(columns[4])
+        return series
+
+
+def _as_float(value):
+    # avg() comes back as Decimal for some drivers
+    return float(value) if value is not None else None
+
+
+heatmap_crud = HeatmapCRUD()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, JSON,func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, JSON, Index, func
 from app.db.base import Base
 
 class Conversation(Base):
@@ -10,6 +10,11 @@ class Conversation(Base):
     ended_at = Column(DateTime(timezone=True), nullable=True)
     summary = Column(String(500), nullable=True)
 
+    # A user's conversations, and the active one (ended_at IS NULL)
+    __table_args__ = (
+        Index("ix_conversations_user_id_ended_at", "user_id", "ended_at"),
+    )
+
 class Message(Base):
     __tablename__ = "messages"
     
@@ -19,4 +24,9 @@ class Message(Base):
     is_user = Column(Boolean)
     sentiment_score = Column(Float)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    heatmap_metadata = Column(JSON)  # For engagement tracking
\ No newline at end of file
+    heatmap_metadata = Column(JSON)  # For engagement tracking
+
+    # Newest-first history per conversation, with id as the keyset tiebreak
+    __table_args__ = (
+        Index("ix_messages_conversation_id_created_at_id", "conversation_id", "created_at", "id"),
+    )
\ No newline at end of file
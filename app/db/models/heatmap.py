@@ -40,4 +40,12 @@ class UserHeatmapProfile(Base):
     avg_sentiment = Column(Float)
     avg_response_time = Column(Float)
     engagement_trend = Column(Float)  # Slope of last 7 days
+
+    # Running aggregates over the 30-day window, updated per interaction
+    window_buckets = Column(JSON)     # {"2025-05-11": {"n": 3, "hours": [0, ...], ...}}
+    hour_counts = Column(JSON)        # 24 interaction counters
+    weekday_counts = Column(JSON)     # 7 interaction counters, monday first
+    interaction_count = Column(Integer)
+    sentiment_sum = Column(Float)
+    response_time_sum = Column(Float)
     user = relationship("User", back_populates="heatmap_profile", uselist=False)
\ No newline at end of file
@@ -1,12 +1,80 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from app.api.api import api_router
 from app.core.config import settings
+from app.services.hashing import password_hasher, HashingOverloadedError
+from app.services.heatmap import heatmap_engine
+from app.services.quantum_errors import QuantumOverloadedError
+from app.services.sentiment import sentiment_engine
+from app.core.subsystems import (
+    SubsystemDisabledError, circuit_renderer, quantum, quantum_engine, quantum_executor,
+    transcription_service, voice, voice_feature_engine
+)
 
 app = FastAPI(title=settings.PROJECT_NAME,
             version=settings.VERSION)
 
 app.include_router(api_router)
 
+@app.exception_handler(HashingOverloadedError)
+async def hashing_overloaded_handler(request: Request, exc: HashingOverloadedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is busy, please retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+@app.exception_handler(QuantumOverloadedError)
+async def quantum_overloaded_handler(request: Request, exc: QuantumOverloadedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Quantum processing is busy, please retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+@app.exception_handler(SubsystemDisabledError)
+async def subsystem_disabled_handler(request: Request, exc: SubsystemDisabledError):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+@app.on_event("startup")
+async def startup():
+    loop = asyncio.get_running_loop()
+    preload = set(settings.PRELOAD_SUBSYSTEMS)
+    if "sentiment" in preload:
+        await sentiment_engine.warm()
+
+    if quantum.enabled and "quantum" in preload:
+        await loop.run_in_executor(None, quantum.load)
+        # Compile the common Grover circuits off the event loop
+        await loop.run_in_executor(
+            None, quantum_engine.prewarm, settings.QUANTUM_PREWARM_MAX_CANDIDATES
+        )
+        if settings.QUANTUM_EXECUTION_MODE == "aer":
+            await quantum_executor.start()
+        await circuit_renderer.prerender()
+
+    if voice.enabled and "voice" in preload:
+        await loop.run_in_executor(None, voice.load)
+        await voice_feature_engine.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await heatmap_engine.shutdown()
+    sentiment_engine.shutdown()
+    # Only subsystems that were actually loaded have anything to stop
+    if quantum_engine.loaded:
+        quantum_engine.scheduler.shutdown()
+    if quantum_executor.loaded:
+        quantum_executor.shutdown()
+    if circuit_renderer.loaded:
+        circuit_renderer.shutdown()
+    if voice_feature_engine.loaded:
+        voice_feature_engine.shutdown()
+    if transcription_service.loaded:
+        transcription_service.shutdown()
+    password_hasher.shutdown()
+
 @app.get("/")
 def root():
     return {"message": "Quantum AI Chatbot Backend is running"}
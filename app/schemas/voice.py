@@ -1,10 +1,14 @@
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Any, Optional, Dict
 
 class VoiceAnalysisResult(BaseModel):
     text: Optional[str]
     emotion: Dict[str, float]  # {arousal, valence, dominance}
-    voice_features: Dict[str, List[List[float]]]
+    features_mode: str = "full"
+    # Per feature, depending on features_mode: summary stats, a base64
+    # array ({dtype, shape, data}), or frame lists; None for "none".
+    # Typed loosely so large frame lists aren't validated float by float
+    voice_features: Optional[Dict[str, Any]] = None
     
 class VoiceResponse(BaseModel):
     text_response: str
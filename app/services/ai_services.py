@@ -1,134 +1,197 @@
 from typing import Optional, List
-from app.db.models.user import User
+from app.services.user_cache import CurrentUser
 from app.db.models.chat import Message
-from app.services.quantum import quantum_engine
+from app.core.metrics import metrics_registry
+from app.core.subsystems import quantum, quantum_engine
 from app.services.heatmap import heatmap_engine
+from app.services.pipeline import StageGraph
+from app.services.quantum_errors import QuantumOverloadedError
+from app.services.sentiment import sentiment_engine
 from app.schemas.voice import VoiceAnalysisResult
 
-async def analyze_sentiment(self, text: str) -> float:
+# Context for response generation: sentiment, engagement and topics don't
+# depend on each other, so they are gathered concurrently
+context_pipeline = StageGraph("response_context")
+
+@context_pipeline.stage("current_sentiment", timeout=1.0, fallback=0.0)
+async def _sentiment_stage(ctx: dict) -> float:
+    if ctx["sentiment_score"] is not None:
+        return ctx["sentiment_score"]
+    return await ctx["service"].analyze_sentiment(ctx["message"])
+
+@context_pipeline.stage("engagement_level", timeout=0.5, fallback=0.5)
+async def _engagement_stage(ctx: dict) -> float:
+    return heatmap_engine.get_current_engagement(ctx["user"].id)
+
+@context_pipeline.stage("recent_topics", timeout=1.0, fallback=["general"])
+async def _topics_stage(ctx: dict) -> List[str]:
+    return await ctx["service"]._extract_topics(ctx["conversation_history"])
+
+
+class AIService:
+    def __init__(self):
+        self.quantum_fallbacks = 0
+
+    async def analyze_sentiment(self, text: str) -> float:
         """Improved sentiment analysis with error handling"""
         try:
-            # Replace with your actual sentiment analysis implementation
-            # Example using transformers:
-            # from transformers import pipeline
-            # sentiment_pipeline = pipeline("sentiment-analysis")
-            # return sentiment_pipeline(text)[0]['score']
-            return 0.5  # Neutral sentiment placeholder
+            return await sentiment_engine.score(text)
         except Exception as e:
             print(f"Sentiment analysis error: {str(e)}")
             return 0.0  # Fallback neutral score
 
-async def _extract_topics(self, messages: List[Message]) -> List[str]:
+    async def _extract_topics(self, messages: List[Message]) -> List[str]:
         """Extract conversation topics from history"""
         # Implement your topic extraction logic
         return ["general"]  # Placeholder
 
-async def _generate_candidate_responses(self, message: str, context: dict) -> List[str]:
+    async def _generate_candidate_responses(self, message: str, context: dict) -> List[str]:
         """Generate multiple response variations"""
         return [
-            self._generate_standard_response(message),
-            self._generate_empathetic_response(message, context),
-            self._generate_humorous_response(message),
-            self._generate_technical_response(message)
+            await self._generate_standard_response(message),
+            await self._generate_empathetic_response(message, context),
+            await self._generate_humorous_response(message),
+            await self._generate_technical_response(message)
         ]
 
-async def _generate_standard_response(self, message: str) -> str:
+    async def _generate_standard_response(self, message: str) -> str:
         return f"I received your message about '{message}'. Let me think about that."
 
-async def _generate_empathetic_response(self, message: str, context: dict) -> str:
+    async def _generate_empathetic_response(self, message: str, context: dict) -> str:
         if context.get('current_sentiment', 0) < -0.3:
             return "I sense this is important to you. Let's discuss it carefully."
         return "I appreciate you sharing this with me."
 
-async def _generate_humorous_response(self, message: str) -> str:
+    async def _generate_humorous_response(self, message: str) -> str:
         return f"'{message}'? That's almost as funny as quantum physics!"
 
-async def _generate_technical_response(self, message: str) -> str:
+    async def _generate_technical_response(self, message: str) -> str:
         return f"Analyzing your query about '{message}' through our quantum decision matrix..."
 
-async def update_heatmap(self, user_id: int, interaction_data: dict):
+    async def update_heatmap(self, user_id: int, interaction_data: dict):
         """Update user engagement metrics with error handling"""
         try:
             await heatmap_engine.record_interaction(
                 user_id=user_id,
                 user_message=interaction_data.get('message', ''),
                 ai_response=interaction_data.get('response', ''),
-                response_time=interaction_data.get('response_time', 0)
+                response_time=interaction_data.get('response_time', 0),
+                sentiment=interaction_data.get('sentiment')
             )
         except Exception as e:
             print(f"Heatmap update failed: {str(e)}")
 
-async def generate_response(
+    async def generate_response(
         self,
-        user: User,
+        user: CurrentUser,
         message: str,
-        conversation_history: Optional[List[Message]] = None
+        conversation_history: Optional[List[Message]] = None,
+        sentiment_score: Optional[float] = None
     ) -> str:
         """Main response generation with quantum integration"""
         # 1. Get current context
+        context_run = await context_pipeline.run(
+            service=self,
+            user=user,
+            message=message,
+            conversation_history=conversation_history or [],
+            sentiment_score=sentiment_score
+        )
         context = {
-            "current_sentiment": await self.analyze_sentiment(message),
-            "engagement_level": heatmap_engine.get_current_engagement(user.id),
-            "recent_topics": await self._extract_topics(conversation_history or [])
+            "current_sentiment": context_run["current_sentiment"],
+            "engagement_level": context_run["engagement_level"],
+            "recent_topics": context_run["recent_topics"]
         }
-        
+
         # 2. Generate candidate responses
         candidates = await self._generate_candidate_responses(message, context)
-        
+
         # 3. Apply quantum optimization for premium users
-        if hasattr(user, 'subscription_tier') and user.subscription_tier in ["premium", "elite"]:
+        if quantum.enabled and getattr(user, 'subscription_tier', None) in ["premium", "elite"]:
             try:
-                return await quantum_engine.optimize_response(
+                engine = await quantum_engine.aload()
+                personality = user.personality_matrix
+                return await engine.optimize_response(
                     candidates,
                     user_profile={
-                        "ideal_response_length": getattr(user.heatmap_profile, 'avg_message_length', 50),
-                        "empathy": getattr(user.personality_matrix, 'empathy', 0.5),
-                        "humor": getattr(user.personality_matrix, 'humor', 0.3),
-                        "formality": getattr(user.personality_matrix, 'formality', 0.6)
+                        "ideal_response_length": personality.get('ideal_response_length', 50),
+                        "empathy": personality.get('empathy', 0.5),
+                        "humor": personality.get('humor', 0.3),
+                        "formality": personality.get('formality', 0.6)
                     },
-                    conversation_context=context
+                    conversation_context=context,
+                    tier=user.subscription_tier
                 )
-            except Exception as e:
-                print(f"Quantum optimization failed, using fallback: {str(e)}")
-        
+            except QuantumOverloadedError:
+                # Answered with 503 + Retry-After rather than a silent downgrade
+                raise
+            except Exception:
+                self.quantum_fallbacks += 1
+
         # 4. Fallback to standard response selection
-        return self._select_best_classic_response(candidates, context)
+        return await self._select_best_classic_response(candidates, context)
 
-async def _select_best_classic_response(self, candidates: List[str], context: dict) -> str:
+    async def _select_best_classic_response(self, candidates: List[str], context: dict) -> str:
         """Classical fallback response selection"""
         if context['current_sentiment'] < -0.5:
             return next((r for r in candidates if "sense" in r or "important" in r), candidates[0])
         elif context['current_sentiment'] > 0.6:
             return next((r for r in candidates if "appreciate" in r or "happy" in r), candidates[0])
         return candidates[0]
-    
-
-async def generate_voice_response(
-    self,
-    user: User,
-    voice_analysis: VoiceAnalysisResult
-) -> str:
-    """Generate response adapted to voice emotion"""
-    context = {
-        "current_sentiment": voice_analysis.emotion["valence"],
-        "voice_energy": voice_analysis.emotion["arousal"],
-        "is_voice": True
-    }
-    
-    if user.subscription_tier in ["premium", "elite"]:
-        return await quantum_engine.optimize_voice_response(
-            user_profile=user.personality_matrix,
-            voice_context=context
-        )
-    else:
-        return self._classic_voice_response(context)
-
-async def _classic_voice_response(self, context: dict) -> str:
-    """Fallback for non-premium users"""
-    if context["current_sentiment"] < 0.3:
-        return "I hear some frustration in your voice. Let me help."
-    elif context["voice_energy"] > 0.7:
-        return "You sound excited! What else can I do for you?"
-    return "Thanks for your message. How can I assist?"    
-    
 
+    async def generate_voice_response(
+        self,
+        user: CurrentUser,
+        voice_analysis: VoiceAnalysisResult
+    ) -> str:
+        """Generate response adapted to voice emotion"""
+        context = {
+            "current_sentiment": voice_analysis.emotion["valence"],
+            "voice_energy": voice_analysis.emotion["arousal"],
+            "is_voice": True
+        }
+
+        if quantum.enabled and user.subscription_tier in ["premium", "elite"]:
+            engine = await quantum_engine.aload()
+            personality = user.personality_matrix
+            try:
+                return await engine.optimize_response(
+                    self._voice_candidates(),
+                    user_profile={
+                        # Spoken replies are kept short
+                        "ideal_response_length": personality.get('ideal_response_length', 10),
+                        "empathy": personality.get('empathy', 0.5),
+                        "humor": personality.get('humor', 0.3),
+                        "formality": personality.get('formality', 0.6)
+                    },
+                    conversation_context=context,
+                    tier=user.subscription_tier
+                )
+            except QuantumOverloadedError:
+                raise
+            except Exception:
+                self.quantum_fallbacks += 1
+        return await self._classic_voice_response(context)
+
+    def _voice_candidates(self) -> List[str]:
+        """Replies the quantum selection chooses between for a voice message"""
+        return [
+            "I hear some frustration in your voice. Let me help.",
+            "You sound excited! What else can I do for you?",
+            "Thanks for your message. How can I assist?"
+        ]
+
+    def stats(self) -> dict:
+        return {"quantum_fallbacks": self.quantum_fallbacks}
+
+    async def _classic_voice_response(self, context: dict) -> str:
+        """Fallback for non-premium users"""
+        if context["current_sentiment"] < 0.3:
+            return "I hear some frustration in your voice. Let me help."
+        elif context["voice_energy"] > 0.7:
+            return "You sound excited! What else can I do for you?"
+        return "Thanks for your message. How can I assist?"
+
+
+ai_service = AIService()
+metrics_registry.register("ai_service", ai_service.stats)
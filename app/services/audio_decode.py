@@ -0,0 +1,54 @@
+import io
+import numpy as np
+
+# Upload subtypes (audio/<subtype>) and the container they name
+FORMAT_ALIASES = {
+    "x-wav": "wav",
+    "wave": "wav",
+    "vnd.wave": "wav",
+    "mpeg": "mp3",
+    "mpeg3": "mp3",
+    "x-mpeg-3": "mp3",
+    "x-flac": "flac",
+    "x-m4a": "m4a",
+    "mp4": "m4a",
+    "vorbis": "ogg"
+}
+# Containers libsndfile decodes without ffmpeg
+SOUNDFILE_FORMATS = {"wav", "flac", "ogg"}
+
+
+def normalize_format(content_type: str) -> str:
+    subtype = content_type.split("/")[-1].split(";")[0].strip().lower()
+    return FORMAT_ALIASES.get(subtype, subtype)
+
+
+def decode_audio(audio_bytes: bytes, content_type: str, sample_rate: int) -> np.ndarray:
+    """
+    Decode an upload straight from memory into mono float32 samples in
+    -1..1 at `sample_rate`. WAV/FLAC/OGG go through libsndfile; other
+    containers go through pydub (ffmpeg reads from a pipe, not a file).
+    """
+    fmt = normalize_format(content_type)
+    if fmt in SOUNDFILE_FORMATS:
+        import soundfile as sf
+
+        samples, source_rate = sf.read(io.BytesIO(audio_bytes), dtype="float32", always_2d=True)
+        samples = samples.mean(axis=1)
+    else:
+        from pydub import AudioSegment
+
+        segment = AudioSegment.from_file(io.BytesIO(audio_bytes), format=fmt).set_channels(1)
+        source_rate = segment.frame_rate
+        scale = float(1 << (8 * segment.sample_width - 1))
+        samples = np.array(segment.get_array_of_samples(), dtype=np.float32) / scale
+
+    if source_rate != sample_rate:
+        import librosa
+        samples = librosa.resample(samples, orig_sr=source_rate, target_sr=sample_rate)
+    return np.ascontiguousarray(samples, dtype=np.float32)
+
+
+def to_pcm16(samples: np.ndarray) -> bytes:
+    """Little-endian 16-bit PCM frames, as speech recognizers expect"""
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
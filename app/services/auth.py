@@ -6,26 +6,30 @@ from jose import JWTError, jwt
 from app.db.session import get_db
 from app.crud.user import get_user_by_email
 from app.core.config import settings
-from app.core.security import verify_password
-from app.db.models.user import User
+from app.services.hashing import password_hasher
+from app.services.user_cache import CurrentUser, auth_user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 async def authenticate_user(db: AsyncSession, email: str, password: str):
     user = await get_user_by_email(db, email)
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await password_hasher.verify(password, user.hashed_password):
         return None
     return user
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
-) -> User:
+) -> CurrentUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    cached = auth_user_cache.get(token)
+    if cached is not None:
+        return cached[1]
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
@@ -34,7 +38,9 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
+    seen = auth_user_cache.generation
     user = await get_user_by_email(db, email)
     if user is None:
         raise credentials_exception
-    return user
+    # Hits and misses both hand out a CurrentUser, never the ORM row
+    return auth_user_cache.set(token, payload, user, seen)
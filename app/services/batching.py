@@ -0,0 +1,20 @@
+import asyncio
+
+
+async def collect_batch(queue: asyncio.Queue, max_size: int, max_wait: float) -> list:
+    """
+    Wait for one item, then keep taking items until `max_size` are collected
+    or `max_wait` seconds have passed since the first one arrived
+    """
+    loop = asyncio.get_running_loop()
+    batch = [await queue.get()]
+    deadline = loop.time() + max_wait
+    while len(batch) < max_size:
+        timeout = deadline - loop.time()
+        if timeout <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(queue.get(), timeout))
+        except asyncio.TimeoutError:
+            break
+    return batch
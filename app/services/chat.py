@@ -1,7 +1,7 @@
 from datetime import datetime
 from app.services.heatmap import heatmap_engine
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.services import ai_services
+from app.services.ai_services import ai_service
 
 class ChatService:
     async def process_message(
@@ -13,14 +13,13 @@ class ChatService:
         start_time = datetime.now()
         
         # Generate AI response (your existing logic)
-        response = await ai_services.generate_response(message)
+        response = await ai_service.generate_response(message)
         
         # Calculate response time
         response_time = (datetime.now() - start_time).total_seconds()
         
         # Record heatmap data
         await heatmap_engine.record_interaction(
-            db=db,
             user_id=user_id,
             user_message=message,
             ai_response=response,
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from typing import List
+from app.crud.chat import conversation_crud
+from app.db.models.chat import Message
+from app.db.session import async_session
+from app.services.ai_services import ai_service
+from app.services.pipeline import StageGraph
+
+
+def _response_graph(name: str) -> StageGraph:
+    """History load and sentiment run side by side, then the response is generated"""
+    graph = StageGraph(name)
+
+    # Own session: a read cancelled by the timeout mustn't leave the request
+    # session (used later to store the interaction) mid-query. Only a slow
+    # read falls back to no history; database errors still fail the request.
+    @graph.stage("history", timeout=2.0, fallback=[], fallback_on=(asyncio.TimeoutError,))
+    async def history(ctx: dict) -> List[Message]:
+        async with async_session() as db:
+            return await conversation_crud.get_conversation_history(
+                db=db,
+                user_id=ctx["user"].id,
+                limit=ctx["history_limit"]
+            )
+
+    @graph.stage("sentiment", timeout=1.0, fallback=0.0)
+    async def sentiment(ctx: dict) -> float:
+        return await ai_service.analyze_sentiment(ctx["message"])
+
+    @graph.stage("response", depends_on=("history", "sentiment"))
+    async def response(ctx: dict) -> str:
+        return await ai_service.generate_response(
+            user=ctx["user"],
+            message=ctx["message"],
+            conversation_history=ctx["history"],
+            sentiment_score=ctx["sentiment"]
+        )
+
+    return graph
+
+
+# /chat: response generation, then storage and heatmap update side by side
+chat_pipeline = _response_graph("chat")
+
+@chat_pipeline.stage("store", depends_on=("response",))
+async def _store_stage(ctx: dict):
+    return await conversation_crud.store_interaction(
+        db=ctx["db"],
+        user_id=ctx["user"].id,
+        user_message=ctx["message"],
+        ai_response=ctx["response"],
+        sentiment_score=ctx["sentiment"]
+    )
+
+@chat_pipeline.stage("heatmap", depends_on=("response",), timeout=2.0, fallback=None)
+async def _heatmap_stage(ctx: dict):
+    await ai_service.update_heatmap(
+        user_id=ctx["user"].id,
+        interaction_data={
+            "message": ctx["message"],
+            "response": ctx["response"],
+            "message_length": len(ctx["message"]),
+            "response_time": time.perf_counter() - ctx["started"],
+            "sentiment": ctx["sentiment"]
+        }
+    )
+
+# /chat/quantum-chat and /chat/stream only need the response itself
+quantum_chat_pipeline = _response_graph("quantum_chat")
+chat_stream_pipeline = _response_graph("chat_stream")
@@ -0,0 +1,177 @@
+import asyncio
+import hashlib
+import io
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from qiskit import QuantumCircuit
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder, metrics_registry
+from app.services.inflight import InFlight
+from app.services.quantum import build_grover_circuit, optimal_iterations
+from app.services.quantum_errors import RenderBudgetExceededError
+from app.services.quantum_optimizer import CircuitCache, circuit_fingerprint
+
+RENDER_FORMATS = {
+    "text": "text/plain; charset=utf-8",
+    "svg": "image/svg+xml"
+}
+
+# Circuits rendered at startup: (name, qubits, marked)
+BUILTIN_CIRCUITS: List[Tuple[str, Optional[int], Optional[List[int]]]] = [
+    ("sample", None, None),
+    ("ghz", None, None),
+    ("grover", None, None)
+]
+
+
+def sample_circuit(qubits: int = 3) -> QuantumCircuit:
+    """Hadamards on every qubit, then a chain of CZs"""
+    qc = QuantumCircuit(qubits)
+    qc.h(range(qubits))
+    for q in range(qubits - 1):
+        qc.cz(q, q + 1)
+    qc.measure_all()
+    return qc
+
+
+def ghz_circuit(qubits: int = 3) -> QuantumCircuit:
+    qc = QuantumCircuit(qubits)
+    qc.h(0)
+    for q in range(qubits - 1):
+        qc.cx(q, q + 1)
+    qc.measure_all()
+    return qc
+
+
+def grover_circuit(qubits: int = 2, marked: Optional[List[int]] = None) -> QuantumCircuit:
+    marked = marked or [2 ** qubits - 1]
+    qc = build_grover_circuit(qubits, marked, optimal_iterations(2 ** qubits, len(marked)))
+    qc.measure_all()
+    return qc
+
+
+class RenderedCircuit:
+    def __init__(self, body: bytes, media_type: str):
+        self.body = body
+        self.media_type = media_type
+        # Strong validator: derived from the exact bytes served
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+class CircuitRenderer:
+    """
+    Renders circuit diagrams once per (circuit structure, format) and serves
+    repeats from an LRU. Drawing runs on a single worker thread, since
+    matplotlib isn't thread-safe, and concurrent misses for the same diagram
+    share one render. Parameters can describe more diagrams than the cache
+    holds, so at most `renders_per_minute` uncached renders are started
+    (token bucket); past that, misses raise RenderBudgetExceededError.
+    """
+    def __init__(self, cache_size: int, max_qubits: int, max_marked: int, renders_per_minute: int):
+        self.max_qubits = max_qubits
+        self.max_marked = max_marked
+        self.cache = CircuitCache(cache_size)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="circuit-render")
+        self._in_flight = InFlight()
+        self.render_latency = LatencyRecorder()
+        self.renders_per_minute = renders_per_minute
+        self._tokens = float(renders_per_minute)
+        self._refilled = time.monotonic()
+        self.over_budget = 0
+
+    def build(self, name: str, qubits: Optional[int] = None, marked: Optional[List[int]] = None) -> QuantumCircuit:
+        """Build a named circuit, raising ValueError for unknown names or bad parameters"""
+        if qubits is not None and not 1 <= qubits <= self.max_qubits:
+            raise ValueError(f"qubits must be between 1 and {self.max_qubits}")
+        if name == "sample":
+            return sample_circuit(qubits or 3)
+        if name == "ghz":
+            return ghz_circuit(qubits or 3)
+        if name == "grover":
+            qubits = qubits or 2
+            if marked and not all(0 <= m < 2 ** qubits for m in marked):
+                raise ValueError(f"marked states must be between 0 and {2 ** qubits - 1}")
+            if marked and len(set(marked)) > self.max_marked:
+                raise ValueError(f"at most {self.max_marked} marked states")
+            return grover_circuit(qubits, sorted(set(marked)) if marked else None)
+        raise ValueError(f"Unknown circuit '{name}'")
+
+    async def render(self, circuit: QuantumCircuit, fmt: str) -> RenderedCircuit:
+        if fmt not in RENDER_FORMATS:
+            raise ValueError(f"Unknown render format '{fmt}'")
+        key = circuit_fingerprint(circuit, fmt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        return await self._in_flight.run(key, lambda: self._render_uncached(key, circuit, fmt))
+
+    def _take_render_token(self):
+        now = time.monotonic()
+        rate = self.renders_per_minute / 60
+        self._tokens = min(self.renders_per_minute, self._tokens + (now - self._refilled) * rate)
+        self._refilled = now
+        if self._tokens < 1:
+            self.over_budget += 1
+            raise RenderBudgetExceededError(math.ceil((1 - self._tokens) / rate))
+        self._tokens -= 1
+
+    async def _render_uncached(self, key: tuple, circuit: QuantumCircuit, fmt: str) -> RenderedCircuit:
+        self._take_render_token()
+        loop = asyncio.get_running_loop()
+        with self.render_latency.time():
+            body = await loop.run_in_executor(self._executor, self._draw, circuit, fmt)
+        rendered = RenderedCircuit(body, RENDER_FORMATS[fmt])
+        self.cache.set(key, rendered)
+        return rendered
+
+    def _draw(self, circuit: QuantumCircuit, fmt: str) -> bytes:
+        from qiskit.visualization import circuit_drawer
+
+        if fmt == "text":
+            return circuit_drawer(circuit, output="text").single_string().encode("utf-8")
+
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        # Fixed id salt and no date metadata keep the SVG bytes (and ETag) stable
+        with plt.rc_context({"svg.hashsalt": "circuit-render"}):
+            figure = circuit_drawer(circuit, output="mpl")
+            try:
+                buffer = io.StringIO()
+                figure.savefig(buffer, format="svg", metadata={"Date": None})
+            finally:
+                plt.close(figure)
+        return buffer.getvalue().encode("utf-8")
+
+    async def prerender(self):
+        """Render the built-in circuits in every format ahead of the first request"""
+        for name, qubits, marked in BUILTIN_CIRCUITS:
+            circuit = self.build(name, qubits, marked)
+            for fmt in RENDER_FORMATS:
+                try:
+                    await self.render(circuit, fmt)
+                except Exception as e:
+                    print(f"Pre-rendering {name} ({fmt}) failed: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            **self.cache.stats(),
+            "over_budget": self.over_budget,
+            "render_latency": self.render_latency.snapshot()
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+circuit_renderer = CircuitRenderer(
+    cache_size=settings.CIRCUIT_RENDER_CACHE_SIZE,
+    max_qubits=settings.CIRCUIT_RENDER_MAX_QUBITS,
+    max_marked=settings.CIRCUIT_RENDER_MAX_MARKED,
+    renders_per_minute=settings.CIRCUIT_RENDER_BUDGET_PER_MINUTE
+)
+metrics_registry.register("circuit_render", circuit_renderer.stats)
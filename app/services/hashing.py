@@ -0,0 +1,88 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder, metrics_registry
+from app.core.security import get_password_hash, verify_password
+
+
+class HashingOverloadedError(Exception):
+    """Raised when the hashing queue is full and new work is rejected"""
+
+
+class PasswordHashingService:
+    """Runs bcrypt on a dedicated thread pool so it never blocks the event loop"""
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="bcrypt"
+        )
+        self._pending = 0
+        self._running = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.hash_latency = LatencyRecorder()
+        self.verify_latency = LatencyRecorder()
+        self.queue_wait = LatencyRecorder()
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(get_password_hash, self.hash_latency, password)
+
+    async def verify(self, plain_pw: str, hashed_pw: str) -> bool:
+        return await self._submit(verify_password, self.verify_latency, plain_pw, hashed_pw)
+
+    async def _submit(self, fn, recorder: LatencyRecorder, *args):
+        # Executor threads cap concurrency; everything beyond them waits in the
+        # executor queue, which we bound here so bursts fail fast instead of piling up
+        if self._pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise HashingOverloadedError("Password hashing queue is full")
+
+        loop = asyncio.get_running_loop()
+        submitted = loop.time()
+        self._pending += 1
+        try:
+            return await loop.run_in_executor(
+                self._executor, self._timed, fn, recorder, submitted, loop, *args
+            )
+        finally:
+            self._pending -= 1
+
+    def _timed(self, fn, recorder: LatencyRecorder, submitted: float, loop, *args):
+        self.queue_wait.record(loop.time() - submitted)
+        with self._lock:
+            self._running += 1
+        try:
+            with recorder.time():
+                return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._pending - self._running)
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._running,
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+            "queue_wait": self.queue_wait.snapshot(),
+            "hash_latency": self.hash_latency.snapshot(),
+            "verify_latency": self.verify_latency.snapshot()
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHashingService(
+    max_workers=settings.HASHING_MAX_WORKERS,
+    max_queue=settings.HASHING_MAX_QUEUE
+)
+metrics_registry.register("password_hashing", password_hasher.stats)
@@ -1,9 +1,127 @@
-import numpy as np
+from typing import Optional
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models.heatmap import InteractionHeatmap, UserHeatmapProfile
-from app.db.models.chat import Message
-from sqlalchemy import select
+from app.db.session import async_session
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+from app.services.heatmap_ingest import WriteBehindQueue
+from app.services.sentiment import sentiment_engine
+from sqlalchemy import select, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+PROFILE_WINDOW_DAYS = 30
+TREND_WINDOW_DAYS = 7
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _day_number(key: str) -> int:
+    return (datetime.fromisoformat(key) - _EPOCH).days
+
+
+class ProfileAggregates:
+    """
+    Running aggregates behind a UserHeatmapProfile. Interactions are added in
+    constant time into per-day buckets plus window totals; buckets leaving the
+    30-day window are subtracted back out. Loaded JSON values are copied
+    before being changed so SQLAlchemy sees the new values on flush.
+    """
+    def __init__(self, profile: UserHeatmapProfile):
+        self.buckets = dict(profile.window_buckets or {})
+        self.hour_counts = list(profile.hour_counts or [0] * 24)
+        self.weekday_counts = list(profile.weekday_counts or [0] * 7)
+        self.count = profile.interaction_count or 0
+        self.sentiment_sum = profile.sentiment_sum or 0.0
+        self.response_time_sum = profile.response_time_sum or 0.0
+        self._copied = set()
+
+    def add(self, timestamp: datetime, sentiment: float, response_time: float, engagement: float):
+        key = timestamp.date().isoformat()
+        bucket = self._writable_bucket(key)
+        # Fraction of the bucket's day, for the trend regression; small x keeps
+        # the sums of squares free of cancellation
+        x = (timestamp - datetime.combine(timestamp.date(), datetime.min.time())).total_seconds() / 86400
+
+        bucket["n"] += 1
+        bucket["sentiment"] += sentiment
+        bucket["response_time"] += response_time
+        bucket["hours"][timestamp.hour] += 1
+        bucket["sx"] += x
+        bucket["sy"] += engagement
+        bucket["sxx"] += x * x
+        bucket["sxy"] += x * engagement
+
+        self.hour_counts[timestamp.hour] += 1
+        self.weekday_counts[timestamp.weekday()] += 1
+        self.count += 1
+        self.sentiment_sum += sentiment
+        self.response_time_sum += response_time
+
+    def expire(self, now: datetime):
+        """Drop day buckets that have slid out of the window"""
+        cutoff = (now - timedelta(days=PROFILE_WINDOW_DAYS - 1)).date().isoformat()
+        for key in [k for k in self.buckets if k < cutoff]:
+            bucket = self.buckets.pop(key)
+            weekday = datetime.fromisoformat(key).weekday()
+            self.hour_counts = [c - h for c, h in zip(self.hour_counts, bucket["hours"])]
+            self.weekday_counts[weekday] -= bucket["n"]
+            self.count -= bucket["n"]
+            self.sentiment_sum -= bucket["sentiment"]
+            self.response_time_sum -= bucket["response_time"]
+
+        if self.count <= 0:
+            # Avoid carrying float residue into an empty window
+            self.count, self.sentiment_sum, self.response_time_sum = 0, 0.0, 0.0
+
+    def trend(self, now: datetime) -> float:
+        """Least-squares slope of engagement per day over the trend window"""
+        cutoff = (now - timedelta(days=TREND_WINDOW_DAYS - 1)).date().isoformat()
+        origin = _day_number(cutoff)
+        n = sx = sy = sxx = sxy = 0.0
+        for key, bucket in self.buckets.items():
+            if key >= cutoff:
+                # Shift the bucket's sums to x = days since the window start
+                d = _day_number(key) - origin
+                n += bucket["n"]
+                sx += bucket["sx"] + bucket["n"] * d
+                sy += bucket["sy"]
+                sxx += bucket["sxx"] + 2 * d * bucket["sx"] + bucket["n"] * d * d
+                sxy += bucket["sxy"] + d * bucket["sy"]
+
+        denominator = n * sxx - sx * sx
+        if n < 2 or abs(denominator) < 1e-9:
+            return 0.0
+        return (n * sxy - sx * sy) / denominator
+
+    def apply_to(self, profile: UserHeatmapProfile, hourly: dict, weekly: dict, now: datetime):
+        profile.window_buckets = self.buckets
+        profile.hour_counts = self.hour_counts
+        profile.weekday_counts = self.weekday_counts
+        profile.interaction_count = self.count
+        profile.sentiment_sum = self.sentiment_sum
+        profile.response_time_sum = self.response_time_sum
+
+        profile.peak_hours = hourly
+        profile.weekly_pattern = weekly
+        profile.avg_sentiment = self.sentiment_sum / self.count if self.count else None
+        profile.avg_response_time = self.response_time_sum / self.count if self.count else None
+        profile.engagement_trend = self.trend(now)
+        profile.last_updated = now
+
+    def _writable_bucket(self, key: str) -> dict:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = {
+                "n": 0, "sentiment": 0.0, "response_time": 0.0, "hours": [0] * 24,
+                "sx": 0.0, "sy": 0.0, "sxx": 0.0, "sxy": 0.0
+            }
+        elif key not in self._copied:
+            bucket = dict(bucket, hours=list(bucket["hours"]))
+        self.buckets[key] = bucket
+        self._copied.add(key)
+        return bucket
+
 
 class HeatmapEngine:
     def __init__(self):
@@ -13,19 +131,31 @@ class HeatmapEngine:
             'response_time': 0.4,
             'sentiment': 0.3
         }
+        self._last_engagement: dict = {}
+        self.last_engagement_score = 0.5
+
+        # Rows are written behind the request in multi-row batches
+        self.ingestion = WriteBehindQueue(
+            flush=self._persist_batch,
+            batch_size=settings.HEATMAP_BATCH_SIZE,
+            flush_interval=settings.HEATMAP_FLUSH_INTERVAL_SECONDS,
+            max_pending=settings.HEATMAP_MAX_PENDING
+        )
+        metrics_registry.register("heatmap_ingestion", self.ingestion.stats)
     
     async def record_interaction(
         self,
-        db: AsyncSession,
         user_id: int,
         user_message: str,
         ai_response: str,
-        response_time: float
-    ) -> InteractionHeatmap:
-        """Log a new interaction with calculated metrics"""
+        response_time: float,
+        sentiment: Optional[float] = None
+    ) -> dict:
+        """Queue a new interaction with calculated metrics for batched storage"""
         
-        # Calculate metrics
-        sentiment = await self._analyze_sentiment(user_message)
+        # Calculate metrics (reusing the caller's sentiment when it already has one)
+        if sentiment is None:
+            sentiment = await self._analyze_sentiment(user_message)
         engagement = self._calculate_engagement(
             message_length=len(user_message),
             response_time=response_time,
@@ -33,46 +163,105 @@ class HeatmapEngine:
         )
         
         # Create heatmap entry
-        heatmap = InteractionHeatmap(
-            user_id=user_id,
-            message_length=len(user_message),
-            response_time=response_time,
-            sentiment_score=sentiment,
-            engagement_score=engagement,
-            cognitive_load=self._estimate_cognitive_load(ai_response)
-        )
+        heatmap = {
+            "user_id": user_id,
+            "timestamp": datetime.utcnow(),
+            "message_length": len(user_message),
+            "response_time": response_time,
+            "sentiment_score": float(sentiment),
+            "engagement_score": float(engagement),
+            "cognitive_load": self._estimate_cognitive_load(ai_response)
+        }
         
-        db.add(heatmap)
-        await self._update_user_profile(db, user_id)
+        self._last_engagement[user_id] = engagement
+        self.last_engagement_score = engagement
+
+        await self.ingestion.put(heatmap)
         return heatmap
+
+    async def _persist_batch(self, rows: list):
+        """Insert a batch of interactions and fold them into the affected profiles"""
+        by_user = {}
+        for row in rows:
+            by_user.setdefault(row["user_id"], []).append(row)
+
+        async with async_session() as db:
+            await db.execute(insert(InteractionHeatmap).values(rows))
+            # Profiles are row-locked; a fixed order keeps concurrent flushes
+            # from deadlocking on each other
+            for user_id, user_rows in sorted(by_user.items()):
+                await self._update_user_profile(db, user_id, user_rows)
+            await db.commit()
+
+    async def shutdown(self):
+        await self.ingestion.drain()
     
-    async def _update_user_profile(self, db: AsyncSession, user_id: int):
-        """Update aggregated user profile"""
-        # Get last 30 days of data
-        interactions = await db.execute(
-            select(InteractionHeatmap)
+    async def _update_user_profile(self, db: AsyncSession, user_id: int, rows: list):
+        """Update aggregated user profile with new interactions"""
+        now = datetime.utcnow()
+        # Make sure the row exists, then hold its lock for the read-modify-write
+        # of the running sums, so concurrent flushes for a user can't lose updates
+        await db.execute(
+            pg_insert(UserHeatmapProfile)
+            .values(user_id=user_id)
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        result = await db.execute(
+            select(UserHeatmapProfile)
+            .where(UserHeatmapProfile.user_id == user_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        profile = result.scalar_one()
+
+        if profile.window_buckets is None:
+            # New profile, or one created before running aggregates existed:
+            # seed it once from the stored window (already includes `rows`)
+            rows = await self._load_window(db, user_id, now)
+
+        aggregates = ProfileAggregates(profile)
+        for row in rows:
+            aggregates.add(
+                timestamp=row["timestamp"],
+                sentiment=row["sentiment_score"] or 0.0,
+                response_time=row["response_time"] or 0.0,
+                engagement=row["engagement_score"] or 0.0
+            )
+        aggregates.expire(now)
+
+        aggregates.apply_to(
+            profile,
+            hourly=self._calculate_hourly_pattern(aggregates.hour_counts),
+            weekly=self._calculate_weekly_pattern(aggregates.weekday_counts),
+            now=now
+        )
+        db.add(profile)
+
+    async def _load_window(self, db: AsyncSession, user_id: int, now: datetime) -> list:
+        result = await db.execute(
+            select(
+                InteractionHeatmap.timestamp,
+                InteractionHeatmap.sentiment_score,
+                InteractionHeatmap.response_time,
+                InteractionHeatmap.engagement_score
+            )
             .where(InteractionHeatmap.user_id == user_id)
-            .where(InteractionHeatmap.timestamp >= datetime.utcnow() - timedelta(days=30))
+            .where(InteractionHeatmap.timestamp >= now - timedelta(days=PROFILE_WINDOW_DAYS))
         )
-        interactions = interactions.scalars().all()
-        
-        if interactions:
-            profile = await db.get(UserHeatmapProfile, user_id) or \
-                     UserHeatmapProfile(user_id=user_id)
-            
-            # Calculate time-based patterns
-            hourly = self._calculate_hourly_pattern(interactions)
-            weekly = self._calculate_weekly_pattern(interactions)
-            
-            # Update profile
-            profile.peak_hours = hourly
-            profile.weekly_pattern = weekly
-            profile.avg_sentiment = np.mean([i.sentiment_score for i in interactions])
-            profile.avg_response_time = np.mean([i.response_time for i in interactions])
-            profile.last_updated = datetime.utcnow()
-            
-            db.add(profile)
+        return [row._asdict() for row in result]
     
+    def get_current_engagement(self, user_id: int) -> float:
+        """Most recent engagement score seen for the user in this process"""
+        return self._last_engagement.get(user_id, 0.5)
+
+    def estimate_engagement(self, message: str, response_time: float, sentiment: float) -> float:
+        """Engagement score for a message without recording it"""
+        return self._calculate_engagement(
+            message_length=len(message),
+            response_time=response_time,
+            sentiment=sentiment
+        )
+
     def _calculate_engagement(self, **metrics) -> float:
         """Composite engagement score (0-1)"""
         # Normalize metrics
@@ -88,37 +277,29 @@ class HeatmapEngine:
         )
     
     async def _analyze_sentiment(self, text: str) -> float:
-        """Replace with actual sentiment analysis model"""
-        # Mock implementation - integrate your PDF's VADER/TextBlob here
-        return np.clip(len(text) / 200 - 0.5, -1, 1)  # Simple length-based mock
+        """Shared sentiment engine score (-1..1)"""
+        return await sentiment_engine.score(text)
     
     def _estimate_cognitive_load(self, response: str) -> float:
         """Estimate mental effort required (0-1)"""
         word_count = len(response.split())
         return min(word_count / 100, 1.0)
     
-    def _calculate_hourly_pattern(self, interactions: list) -> dict:
+    def _calculate_hourly_pattern(self, hour_counts: list) -> dict:
         """Identify peak engagement hours"""
-        hours = [i.timestamp.hour for i in interactions]
-        if hours:
-            peak_hour = max(set(hours), key=hours.count)
+        total = sum(hour_counts)
+        if total:
+            peak_hour = max(range(24), key=hour_counts.__getitem__)
             return {
                 "hour": peak_hour,
-                "score": hours.count(peak_hour) / len(hours)
+                "score": hour_counts[peak_hour] / total
             }
         return {}
     
-    def _calculate_weekly_pattern(self, interactions: list) -> dict:
+    def _calculate_weekly_pattern(self, weekday_counts: list) -> dict:
         """Weekly engagement trends"""
-        weekdays = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        counts = {day: 0 for day in weekdays}
-        
-        for i in interactions:
-            weekday = i.timestamp.weekday()
-            counts[weekdays[weekday]] += 1
-        
-        total = max(1, len(interactions))
-        return {day: counts[day]/total for day in weekdays}
+        total = max(1, sum(weekday_counts))
+        return {day: weekday_counts[i]/total for i, day in enumerate(WEEKDAYS)}
     
 
 heatmap_engine = HeatmapEngine()
\ No newline at end of file
@@ -0,0 +1,118 @@
+import numpy as np
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.db.models.heatmap import InteractionHeatmap
+
+HOURS = 24
+DAYS = 7
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+async def fetch_columns(db: AsyncSession, user_id: int, since: datetime) -> dict:
+    """Timestamp, engagement and sentiment for a user as NumPy column arrays"""
+    result = await db.execute(
+        select(
+            InteractionHeatmap.timestamp,
+            InteractionHeatmap.engagement_score,
+            InteractionHeatmap.sentiment_score
+        )
+        .where(InteractionHeatmap.user_id == user_id)
+        .where(InteractionHeatmap.timestamp >= since)
+    )
+    rows = result.all()
+    if not rows:
+        return {
+            "timestamps": np.empty(0, dtype="datetime64[us]"),
+            "engagement": np.empty(0),
+            "sentiment": np.empty(0)
+        }
+
+    timestamps, engagement, sentiment = zip(*rows)
+    return {
+        "timestamps": np.array(timestamps, dtype="datetime64[us]"),
+        "engagement": np.array(engagement, dtype=np.float64),
+        "sentiment": np.array(sentiment, dtype=np.float64)
+    }
+
+
+def hour_weekday_cells(timestamps: np.ndarray) -> np.ndarray:
+    """Flat weekday * 24 + hour cell index for every timestamp"""
+    hours_since_epoch = timestamps.astype("datetime64[h]").astype(np.int64)
+    hours = hours_since_epoch % HOURS
+    # 1970-01-01 was a Thursday (weekday 3 with Monday = 0)
+    weekdays = (hours_since_epoch // HOURS + 3) % DAYS
+    return weekdays * HOURS + hours
+
+
+def _cell_means(cells: np.ndarray, values: np.ndarray) -> np.ndarray:
+    valid = ~np.isnan(values)
+    sums = np.bincount(cells[valid], weights=values[valid], minlength=HOURS * DAYS)
+    valid_counts = np.bincount(cells[valid], minlength=HOURS * DAYS)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(valid_counts > 0, sums / valid_counts, np.nan)
+    return means.reshape(DAYS, HOURS)
+
+
+def _percentiles(values: np.ndarray) -> dict:
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {}
+    return {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def engagement_matrix(columns: dict, top_cells: int = 5) -> dict:
+    """
+    7x24 (weekday x hour) interaction counts and mean engagement/sentiment,
+    with overall percentiles and the highest-engagement cells
+    """
+    timestamps = columns["timestamps"]
+    engagement = columns["engagement"]
+    sentiment = columns["sentiment"]
+
+    cells = hour_weekday_cells(timestamps)
+    counts = np.bincount(cells, minlength=HOURS * DAYS)
+    engagement_means = _cell_means(cells, engagement)
+    sentiment_means = _cell_means(cells, sentiment)
+
+    # Peak cells by mean engagement among cells with any scored traffic
+    ranked = np.where(np.isnan(engagement_means.ravel()), -np.inf, engagement_means.ravel())
+    k = min(top_cells, int(np.isfinite(ranked).sum()))
+    peak_idx = np.argpartition(-ranked, k - 1)[:k] if k else np.empty(0, dtype=np.int64)
+    peak_idx = peak_idx[np.argsort(-ranked[peak_idx])]
+
+    hourly_counts = counts.reshape(DAYS, HOURS).sum(axis=0)
+    weekday_counts = counts.reshape(DAYS, HOURS).sum(axis=1)
+    total = int(counts.sum())
+
+    return {
+        "total": total,
+        "counts": counts.reshape(DAYS, HOURS).tolist(),
+        "engagement": _nan_to_none(engagement_means),
+        "sentiment": _nan_to_none(sentiment_means),
+        "percentiles": {
+            "engagement": _percentiles(engagement),
+            "sentiment": _percentiles(sentiment)
+        },
+        "peak_cells": [
+            {
+                "weekday": WEEKDAYS[i // HOURS],
+                "hour": int(i % HOURS),
+                "engagement": float(engagement_means.ravel()[i]),
+                "count": int(counts[i])
+            }
+            for i in peak_idx
+        ],
+        "peak_hour": {
+            "hour": int(np.argmax(hourly_counts)),
+            "score": float(hourly_counts.max() / total)
+        } if total else {},
+        "weekly_pattern": {
+            day: float(weekday_counts[i] / max(1, total)) for i, day in enumerate(WEEKDAYS)
+        }
+    }
+
+
+def _nan_to_none(matrix: np.ndarray) -> list:
+    return [[None if np.isnan(v) else float(v) for v in row] for row in matrix]
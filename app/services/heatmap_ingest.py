@@ -0,0 +1,109 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional
+from app.core.metrics import LatencyRecorder
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """
+    Buffers rows in memory and hands them to `flush` in batches, either when
+    `batch_size` rows are waiting or `flush_interval` seconds after the first
+    one arrived. The worker task starts on first use and `drain` flushes
+    everything still pending.
+    """
+    def __init__(
+        self,
+        flush: Callable[[List[dict]], Awaitable[None]],
+        batch_size: int,
+        flush_interval: float,
+        max_pending: int
+    ):
+        self._flush = flush
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.enqueued = 0
+        self.flushed = 0
+        self.failed = 0
+        self.batches = 0
+        self.queue_lag = LatencyRecorder()
+        self.flush_latency = LatencyRecorder()
+
+    async def put(self, row: dict):
+        if self._worker is None or self._worker.done():
+            self._start()
+        # Blocks only when max_pending rows are already waiting
+        await self._queue.put((time.monotonic(), row))
+        self.enqueued += 1
+
+    def _start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            stopping = False
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush_batch(batch)
+            if stopping:
+                return
+
+    async def _flush_batch(self, batch: list):
+        rows = [row for _, row in batch]
+        try:
+            with self.flush_latency.time():
+                await self._flush(rows)
+            self.flushed += len(rows)
+            self.batches += 1
+        except Exception as e:
+            self.failed += len(rows)
+            print(f"Heatmap batch flush failed ({len(rows)} rows): {str(e)}")
+        finally:
+            # Oldest row in the batch waited longest
+            self.queue_lag.record(time.monotonic() - batch[0][0])
+
+    async def drain(self):
+        """Flush every pending row and stop the worker"""
+        if self._worker is None or self._worker.done():
+            return
+        await self._queue.put(_STOP)
+        await self._worker
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "batches": self.batches,
+            "queue_lag": self.queue_lag.snapshot(),
+            "flush_latency": self.flush_latency.snapshot()
+        }
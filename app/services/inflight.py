@@ -0,0 +1,50 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+# Result handed to waiters when the caller doing the work goes away
+_ABANDONED = object()
+
+
+class InFlight:
+    """
+    Lets concurrent calls for the same key share one computation. Errors
+    raised by the computation reach every caller sharing it. If the caller
+    running it is cancelled, only that caller sees the CancelledError: the
+    others start over and one of them takes the computation on.
+    """
+    def __init__(self):
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            pending = self._futures.get(key)
+            if pending is None:
+                break
+            self.shared += 1
+            result = await asyncio.shield(pending)
+            if result is not _ABANDONED:
+                return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._futures[key] = future
+        try:
+            result = await compute()
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may await it; don't leave an unretrieved exception behind
+            future.exception()
+            raise
+        except BaseException:
+            future.set_result(_ABANDONED)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._futures.pop(key, None)
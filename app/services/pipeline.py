@@ -0,0 +1,142 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple, Type
+from app.core.metrics import LatencyRecorder, metrics_registry
+
+StageFn = Callable[[dict], Awaitable[Any]]
+
+_NO_FALLBACK = object()
+
+
+class Stage:
+    def __init__(
+        self,
+        name: str,
+        fn: StageFn,
+        depends_on: Iterable[str] = (),
+        timeout: Optional[float] = None,
+        fallback: Any = _NO_FALLBACK,
+        fallback_on: Tuple[Type[BaseException], ...] = (Exception,)
+    ):
+        self.name = name
+        self.fn = fn
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+        self.fallback = fallback
+        self.fallback_on = fallback_on
+
+    @property
+    def has_fallback(self) -> bool:
+        return self.fallback is not _NO_FALLBACK
+
+
+class PipelineRun:
+    """Results and per-stage timings of one graph execution"""
+    def __init__(self):
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, float] = {}
+        self.fallbacks: Dict[str, str] = {}
+        self.total: float = 0.0
+
+    def __getitem__(self, name: str) -> Any:
+        return self.results[name]
+
+    def server_timing(self) -> str:
+        """Timings formatted for a Server-Timing response header"""
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.1f}"
+            for name, seconds in self.timings.items()
+        )
+
+
+class StageGraph:
+    """
+    Runs async stages as soon as their dependencies have finished, so
+    independent stages overlap. A stage that fails or exceeds its timeout
+    yields its fallback value; without a fallback, or for errors outside
+    its `fallback_on`, the error propagates and the other stages are cancelled.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.stages: Dict[str, Stage] = {}
+        self.stage_latency: Dict[str, LatencyRecorder] = {}
+        self.fallback_counts: Dict[str, int] = {}
+        metrics_registry.register(f"pipeline.{name}", self.stats)
+
+    def stage(
+        self,
+        name: str,
+        depends_on: Iterable[str] = (),
+        timeout: Optional[float] = None,
+        fallback: Any = _NO_FALLBACK,
+        fallback_on: Tuple[Type[BaseException], ...] = (Exception,)
+    ):
+        """Decorator registering a stage function that receives the run context"""
+        def decorator(fn: StageFn) -> StageFn:
+            self.add(Stage(name, fn, depends_on, timeout, fallback, fallback_on))
+            return fn
+        return decorator
+
+    def add(self, stage: Stage):
+        for dep in stage.depends_on:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+        self.stages[stage.name] = stage
+        self.stage_latency[stage.name] = LatencyRecorder()
+        self.fallback_counts[stage.name] = 0
+
+    async def run(self, **inputs) -> PipelineRun:
+        run = PipelineRun()
+        context = dict(inputs)
+        tasks: Dict[str, asyncio.Task] = {}
+        started = time.perf_counter()
+
+        async def execute(stage: Stage):
+            if stage.depends_on:
+                await asyncio.gather(*(tasks[dep] for dep in stage.depends_on))
+
+            stage_started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(stage.fn(context), timeout=stage.timeout)
+            except Exception as e:
+                if not stage.has_fallback or not isinstance(e, stage.fallback_on):
+                    raise
+                reason = "timeout" if isinstance(e, asyncio.TimeoutError) else repr(e)
+                run.fallbacks[stage.name] = reason
+                self.fallback_counts[stage.name] += 1
+                result = stage.fallback
+            finally:
+                elapsed = time.perf_counter() - stage_started
+                run.timings[stage.name] = elapsed
+                self.stage_latency[stage.name].record(elapsed)
+
+            context[stage.name] = result
+            run.results[stage.name] = result
+            return result
+
+        # Stages are registered in dependency order, so every dependency
+        # already has a task by the time a dependent stage is scheduled
+        for name, stage in self.stages.items():
+            tasks[name] = asyncio.ensure_future(execute(stage))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except Exception:
+            for task in tasks.values():
+                task.cancel()
+            # Let cancelled stages finish unwinding (closing cursors and the
+            # like) before the caller reuses anything they were touching
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        finally:
+            run.total = time.perf_counter() - started
+        return run
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                **self.stage_latency[name].snapshot(),
+                "fallbacks": self.fallback_counts[name]
+            }
+            for name in self.stages
+        }
@@ -1,101 +1,474 @@
-from qiskit import QuantumCircuit, Aer, execute
-from qiskit.algorithms import Grover, AmplificationProblem
-from qiskit.circuit.library import PhaseOracle
+from qiskit import QuantumCircuit
 from qiskit.quantum_info import Statevector
+from itertools import combinations
+import asyncio
+import math
+import re
+import time
 import numpy as np
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional
+from app.core.config import settings
+from app.services.sentiment import lexicon_score
+from app.core.metrics import metrics_registry
+from app.services.quantum_optimizer import grover_fingerprint, quantum_optimizer
+from app.services.quantum_batching import QuantumBatchScheduler
+from app.services.quantum_executor import quantum_executor
+from app.services.quantum_security import QuantumSecurity
+from app.services.quantum_sampling import DecisionStats, QuantumDecision, ShotPolicy, decision_confidence
+
+EXECUTION_MODES = ("aer", "statevector", "analytic")
+SCORE_THRESHOLD = 0.7
+
+EMPATHY_MARKERS = ("sense", "appreciate", "understand", "feel", "sorry", "important", "carefully")
+HUMOR_MARKERS = ("funny", "haha", "joke", "!", "lol")
+INFORMAL_MARKERS = ("'", "!", "?", "lol", "haha")
+
+
+class QuantumOracle:
+    """Scores candidate responses and marks the ones worth amplifying"""
+    def __init__(self, responses: List[str], user_profile: Dict, context: Dict):
+        self.response_scores = score_candidates(
+            candidate_features(responses), user_profile, context
+        )
+
+    def evaluate(self, bitstring: str) -> bool:
+        idx = int(bitstring, 2)
+        return idx < len(self.response_scores) and self.response_scores[idx] > SCORE_THRESHOLD
+
+    def marked_states(self) -> List[int]:
+        """Indices above the threshold, or the best candidate(s) if none qualify"""
+        scores = self.response_scores
+        if not len(scores):
+            return []
+        marked = np.flatnonzero(scores > SCORE_THRESHOLD)
+        if not len(marked):
+            marked = np.flatnonzero(scores == scores.max())
+        return marked.tolist()
+
+
+_EMPATHY = re.compile("|".join(map(re.escape, EMPATHY_MARKERS)))
+_HUMOR = re.compile("|".join(map(re.escape, HUMOR_MARKERS)))
+_INFORMAL = re.compile("|".join(map(re.escape, INFORMAL_MARKERS)))
+
+
+def candidate_features(responses: List[str]) -> np.ndarray:
+    """
+    One row per response: length, lexicon sentiment, and whether it carries
+    empathy, humor and informality markers (0/1).
+    """
+    features = np.empty((len(responses), 5))
+    for i, response in enumerate(responses):
+        text = response.lower()
+        features[i] = (
+            len(response),
+            lexicon_score(response),
+            _EMPATHY.search(text) is not None,
+            _HUMOR.search(text) is not None,
+            _INFORMAL.search(text) is not None
+        )
+    return features
+
+
+def score_candidates(features: np.ndarray, profile: Dict, context: Dict) -> np.ndarray:
+    """
+    Score 0-1 per row of `candidate_features`: the mean of sentiment
+    alignment, engagement (length against the ideal) and personality
+    alignment, weighted 0.3 empathy / 0.2 humor / 0.5 formality.
+    """
+    # Targets for sentiment, empathy, humor and informality (1 - formality)
+    targets = np.array([
+        context['current_sentiment'], profile['empathy'], profile['humor'], 1 - profile['formality']
+    ])
+    matches = 1 - np.abs(features[:, 1:] - targets) * np.array([0.5, 1.0, 1.0, 1.0])
+    engagement = np.minimum(features[:, 0] / profile['ideal_response_length'], 1.0)
+    return (matches[:, 0] + engagement + matches[:, 1:] @ np.array([0.3, 0.2, 0.5])) / 3
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first (ties go to the lower index)"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        # Partition on (score, -index) so ties at the cut are resolved the same way
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        cutoff = scores[candidates].min()
+        candidates = np.flatnonzero(scores >= cutoff)
+    else:
+        candidates = np.arange(len(scores))
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order][:k]
+
+
+def optimal_iterations(num_states: int, num_marked: int) -> int:
+    """Grover iteration count that maximises the marked-state probability"""
+    # With half or more of the states marked, amplification can't help
+    if num_marked == 0 or 2 * num_marked >= num_states:
+        return 0
+    theta = math.asin(math.sqrt(num_marked / num_states))
+    return max(1, int(math.floor(math.pi / (4 * theta))))
+
+
+def grover_probabilities(num_qubits: int, marked: Iterable[int], iterations: int) -> np.ndarray:
+    """
+    Exact measurement distribution after `iterations` Grover steps, computed
+    on the amplitude vector directly: the oracle flips marked amplitudes and
+    the diffuser reflects every amplitude about the mean.
+    """
+    amplitudes = np.full(2 ** num_qubits, 1 / math.sqrt(2 ** num_qubits))
+    marked = np.fromiter(marked, dtype=np.int64)
+    for _ in range(iterations):
+        amplitudes[marked] *= -1
+        amplitudes = 2 * amplitudes.mean() - amplitudes
+    return amplitudes ** 2
+
+
+def build_grover_circuit(num_qubits: int, marked: Iterable[int], iterations: int) -> QuantumCircuit:
+    """Grover circuit (without measurement) amplifying the marked basis states"""
+    qc = QuantumCircuit(num_qubits)
+    qc.h(range(num_qubits))
+    for _ in range(iterations):
+        for state in marked:
+            _phase_flip(qc, num_qubits, state)
+        qc.h(range(num_qubits))
+        _phase_flip(qc, num_qubits, 0)
+        qc.h(range(num_qubits))
+    return qc
+
+
+def _phase_flip(qc: QuantumCircuit, num_qubits: int, state: int):
+    """Flip the phase of one basis state (qubit j holds bit j)"""
+    zeros = [q for q in range(num_qubits) if not (state >> q) & 1]
+    if zeros:
+        qc.x(zeros)
+    if num_qubits == 1:
+        qc.z(0)
+    else:
+        target = num_qubits - 1
+        qc.h(target)
+        qc.mcx(list(range(target)), target)
+        qc.h(target)
+    if zeros:
+        qc.x(zeros)
+
 
 class QuantumDecisionEngine:
-    def __init__(self):
-        self.backend = Aer.get_backend('qasm_simulator')
-        self.shots = 1024  # Measurement shots
+    def __init__(
+        self,
+        mode: str = "analytic",
+        seed: Optional[int] = None,
+        batch_size: int = 16,
+        batch_wait: float = 0.005,
+        shot_policy: Optional[ShotPolicy] = None,
+        tier_policies: Optional[Dict[str, ShotPolicy]] = None,
+        simulation_max_qubits: int = 6
+    ):
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown quantum execution mode '{mode}'")
+        # Shares the optimizer's simulator so cached transpiled circuits match it
+        self.optimizer = quantum_optimizer
+        self.backend = quantum_optimizer.optimized_backend
+        self.shot_policy = shot_policy or ShotPolicy(initial_shots=64, max_shots=1024, confidence=0.95)
+        self.tier_policies = tier_policies or {}
+        self.shots = self.shot_policy.max_shots  # Measurement shots for one-shot runs
+        self.mode = mode
+        self.seed = seed
+        self.simulation_max_qubits = simulation_max_qubits
+        self.decision_stats = DecisionStats()
+        metrics_registry.register("quantum_decisions", self.decision_stats.stats)
+        self.scheduler = QuantumBatchScheduler(
+            executor=quantum_executor,
+            max_batch_size=batch_size,
+            max_wait=batch_wait,
+            max_queued=settings.QUANTUM_MAX_PENDING_JOBS,
+            seed=seed
+        )
+        metrics_registry.register("quantum_batching", self.scheduler.stats)
 
     async def optimize_response(
-        self, 
+        self,
         candidate_responses: List[str],
         user_profile: Dict,
-        conversation_context: Dict
+        conversation_context: Dict,
+        mode: Optional[str] = None,
+        tier: Optional[str] = None
     ) -> str:
         """
         Uses Grover's algorithm to select the optimal response
         based on user profile and conversation context
         """
-        # 1. Encode preferences as quantum oracle
+        decision = await self.decide(
+            candidate_responses, user_profile, conversation_context, mode, tier
+        )
+        return decision.response
+
+    async def decide(
+        self,
+        candidate_responses: List[str],
+        user_profile: Dict,
+        conversation_context: Dict,
+        mode: Optional[str] = None,
+        tier: Optional[str] = None
+    ) -> QuantumDecision:
+        """Select a response and report the shots and confidence it took"""
+        started = time.perf_counter()
+        mode = self._resolve_mode(mode, len(candidate_responses))
+        if mode == "analytic":
+            # Microseconds of NumPy: cheaper inline than a thread hop
+            index = self.select_index(candidate_responses, user_profile, conversation_context, mode)
+            decision = QuantumDecision(index, mode)
+        elif mode == "statevector":
+            index = await asyncio.get_running_loop().run_in_executor(
+                None, self.select_index, candidate_responses, user_profile, conversation_context, mode
+            )
+            decision = QuantumDecision(index, mode)
+        else:
+            decision = await self._sample_decision(
+                candidate_responses, user_profile, conversation_context, self.policy_for(tier)
+            )
+        decision.response = candidate_responses[decision.index]
+        self.decision_stats.record(tier, decision, time.perf_counter() - started)
+        return decision
+
+    def policy_for(self, tier: Optional[str]) -> ShotPolicy:
+        return self.tier_policies.get(tier, self.shot_policy)
+
+    async def _sample_decision(
+        self,
+        candidate_responses: List[str],
+        user_profile: Dict,
+        conversation_context: Dict,
+        policy: ShotPolicy
+    ) -> QuantumDecision:
+        """
+        Sample the Grover circuit in rounds until the leader passes the
+        sequential confidence test or the policy's shot cap is spent
+        """
+        oracle, num_qubits, marked, iterations = self._prepare(
+            candidate_responses, user_profile, conversation_context
+        )
+        if num_qubits > QuantumSecurity.MAX_QUBITS:
+            return QuantumDecision(int(top_k(oracle.response_scores, 1)[0]), "classical")
+
+        # Transpiling takes tens of milliseconds on a cache miss, so it runs
+        # off the loop; simulator runs are batched with other requests and
+        # run in worker processes
+        circuit = await asyncio.get_running_loop().run_in_executor(
+            None, self._grover_circuit, num_qubits, marked, iterations, True
+        )
+        options_count = len(candidate_responses)
+        scores = oracle.response_scores
+        totals = np.zeros(2 ** num_qubits)
+        rounds = policy.rounds()
+        target = policy.per_round_confidence
+        for round_number, shots in enumerate(rounds):
+            # Each round needs fresh samples, so seeded runs advance the seed
+            seed = None if self.seed is None else self.seed + round_number
+            counts = await self.scheduler.submit(circuit, shots, seed)
+            totals += self._count_vector(counts, options_count)
+
+            index = self._decode_counts(totals, options_count, scores)
+            confidence = decision_confidence(
+                totals[:options_count], index, scores, policy.indifference
+            )
+            if confidence >= target:
+                break
+
+        return QuantumDecision(
+            index,
+            "aer",
+            shots=int(totals.sum()),
+            confidence=confidence,
+            rounds=round_number + 1,
+            stopped_early=round_number + 1 < len(rounds)
+        )
+
+    def select_index(
+        self,
+        candidate_responses: List[str],
+        user_profile: Dict,
+        conversation_context: Dict,
+        mode: Optional[str] = None
+    ) -> int:
+        """Synchronous selection in any mode (aer runs its own job directly)"""
+        mode = self._resolve_mode(mode, len(candidate_responses))
+        oracle, num_qubits, marked, iterations = self._prepare(
+            candidate_responses, user_profile, conversation_context
+        )
+        if num_qubits > QuantumSecurity.MAX_QUBITS:
+            # Too many states to search; Grover would settle on the top score anyway
+            return int(top_k(oracle.response_scores, 1)[0])
+
+        # Run Grover and read out the basis state distribution
+        if mode == "analytic":
+            probabilities = grover_probabilities(num_qubits, marked, iterations)
+            return self._decode_probabilities(
+                probabilities, len(candidate_responses), oracle.response_scores
+            )
+
+        if mode == "statevector":
+            circuit = self._grover_circuit(num_qubits, marked, iterations, measured=False)
+            probabilities = Statevector(circuit).probabilities()
+            return self._decode_probabilities(
+                probabilities, len(candidate_responses), oracle.response_scores
+            )
+
+        circuit = self._grover_circuit(num_qubits, marked, iterations, measured=True)
+        job = self.backend.run(circuit, shots=self.shots, seed_simulator=self.seed)
+        counts = job.result().get_counts()
+
+        # Decode best response
+        return self._decode_measurement(counts, len(candidate_responses), oracle.response_scores)
+
+    def rank(
+        self,
+        candidate_responses: List[str],
+        user_profile: Dict,
+        conversation_context: Dict,
+        k: int
+    ) -> List[int]:
+        """Classical top-k: indices of the k best-scoring candidates, best first"""
+        oracle = self._create_oracle(candidate_responses, user_profile, conversation_context)
+        return top_k(oracle.response_scores, k).tolist()
+
+    def _check_mode(self, mode: Optional[str]) -> str:
+        mode = mode or self.mode
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown quantum execution mode '{mode}'")
+        return mode
+
+    def _resolve_mode(self, mode: Optional[str], options_count: int) -> str:
+        """Requested mode, or analytic when the search is too big to simulate"""
+        mode = self._check_mode(mode)
+        num_qubits = max(1, math.ceil(math.log2(max(options_count, 2))))
+        if mode != "analytic" and num_qubits > self.simulation_max_qubits:
+            # Same distribution as the simulators, without building the circuit
+            return "analytic"
+        return mode
+
+    def _prepare(self, candidate_responses: List[str], user_profile: Dict, conversation_context: Dict):
+        """Encode preferences as quantum oracle and size the Grover search"""
         oracle = self._create_oracle(
             responses=candidate_responses,
             user_profile=user_profile,
             context=conversation_context
         )
-        
-        # 2. Configure Grover's algorithm
-        problem = AmplificationProblem(
-            oracle=PhaseOracle(oracle),
-            is_good_state=oracle.evaluate  # Custom evaluation function
-        )
-        grover = Grover(iterations=2)  # Optimal iterations for 4-16 options
-        
-        # 3. Execute quantum circuit
-        circuit = grover.construct_circuit(problem)
-        circuit.measure_all()
-        
-        job = execute(circuit, self.backend, shots=self.shots)
-        result = job.result()
-        counts = result.get_counts(circuit)
-        
-        # 4. Decode best response
-        optimal_index = self._decode_measurement(counts, len(candidate_responses))
-        return candidate_responses[optimal_index]
-
-    def _create_oracle(self, responses: List[str], user_profile: Dict, context: Dict) -> 'QuantumOracle':
+        marked = oracle.marked_states()
+        num_qubits = max(1, math.ceil(math.log2(len(candidate_responses))))
+        iterations = optimal_iterations(2 ** num_qubits, len(marked))
+        return oracle, num_qubits, marked, iterations
+
+    def _grover_circuit(self, num_qubits: int, marked: List[int], iterations: int, measured: bool) -> QuantumCircuit:
+        """Grover circuit from the shared cache, transpiled for the simulator when measured"""
+        backend = self.optimizer.backend_name if measured else "statevector"
+        key = grover_fingerprint(num_qubits, marked, iterations, backend)
+
+        def build() -> QuantumCircuit:
+            circuit = build_grover_circuit(num_qubits, marked, iterations)
+            if measured:
+                circuit.measure_all()
+            return circuit
+
+        return self.optimizer.get_or_compile(key, build, transpiled=measured)
+
+    def prewarm(self, max_candidates: int):
+        """Compile every Grover circuit reachable with up to `max_candidates` options"""
+        seen = set()
+        for options in range(2, max_candidates + 1):
+            num_qubits = max(1, math.ceil(math.log2(options)))
+            for size in range(1, options + 1):
+                for marked in combinations(range(options), size):
+                    iterations = optimal_iterations(2 ** num_qubits, len(marked))
+                    key = (num_qubits, marked, iterations)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    if self.mode == "aer":
+                        self._grover_circuit(num_qubits, list(marked), iterations, measured=True)
+                    elif self.mode == "statevector":
+                        self._grover_circuit(num_qubits, list(marked), iterations, measured=False)
+
+    def _create_oracle(self, responses: List[str], user_profile: Dict, context: Dict) -> QuantumOracle:
         """Creates a phase oracle based on user preferences"""
-        class QuantumOracle:
-            def __init__(self):
-                self.response_scores = [
-                    self._calculate_score(r, user_profile, context)
-                    for r in responses
-                ]
-            
-            def evaluate(self, bitstring: str) -> bool:
-                idx = int(bitstring, 2)
-                return self.response_scores[idx] > 0.7  # Threshold
-            
-            def _calculate_score(self, response: str, profile: Dict, context: Dict) -> float:
-                """Score 0-1 based on PDF's heatmap and personality factors"""
-                # 1. Sentiment alignment
-                sentiment_match = 1 - abs(
-                    self._analyze_sentiment(response) - context['current_sentiment']
-                )
-                
-                # 2. Engagement factor
-                engagement_factor = min(
-                    len(response) / profile['ideal_response_length'],
-                    1.0
-                )
-                
-                # 3. Personality alignment
-                personality_score = (
-                    0.3 * self._match_empathy(response, profile) +
-                    0.2 * self._match_humor(response, profile) +
-                    0.5 * self._match_formality(response, profile)
-                )
-                
-                return (sentiment_match + engagement_factor + personality_score) / 3
-            
-            # ... (helper methods for sentiment/personality analysis) ...
-        
-        return QuantumOracle()
-
-    def _decode_measurement(self, counts: Dict[str, int], options_count: int) -> int:
+        return QuantumOracle(responses, user_profile, context)
+
+    def _decode_measurement(
+        self,
+        counts: Dict[str, int],
+        options_count: int,
+        scores: Optional[List[float]] = None
+    ) -> int:
         """Convert quantum measurements to response index"""
-        # Normalize probabilities
-        total = sum(counts.values())
-        probabilities = {
-            int(k, 2): v/total 
-            for k, v in counts.items() 
-            if int(k, 2) < options_count
-        }
-        
-        # Return index with highest probability
-        return max(probabilities.items(), key=lambda x: x[1])[0]
-
-quantum_engine = QuantumDecisionEngine()
\ No newline at end of file
+        return self._decode_counts(self._count_vector(counts, options_count), options_count, scores)
+
+    def _count_vector(self, counts: Dict[str, int], options_count: int) -> np.ndarray:
+        """Counts per basis state, including the padding states past the candidates"""
+        vector = np.zeros(2 ** max(1, math.ceil(math.log2(max(options_count, 2)))))
+        for k, v in counts.items():
+            idx = int(k.replace(" ", ""), 2)
+            if idx < len(vector):
+                vector[idx] += v
+        return vector
+
+    def _decode_counts(
+        self,
+        counts: np.ndarray,
+        options_count: int,
+        scores: Optional[List[float]] = None
+    ) -> int:
+        # Normalize probabilities over every shot taken, padding states included
+        total = max(counts.sum(), 1)
+        probabilities = counts / total
+
+        # Sampled states within ~4 standard errors of the leader (for the
+        # difference of two counts) count as ties, so marked states that are
+        # exactly tied in theory stay tied under shot noise
+        peak = probabilities[:options_count].max()
+        tolerance = 4 * math.sqrt(2 * peak / total)
+        return self._decode_probabilities(probabilities, options_count, scores, tolerance)
+
+    def _decode_probabilities(
+        self,
+        probabilities: np.ndarray,
+        options_count: int,
+        scores: Optional[List[float]] = None,
+        tolerance: float = 1e-9
+    ) -> int:
+        """
+        Index with the highest probability among real candidates. States tied
+        with the leader are settled by oracle score, then by lowest index, so
+        every execution mode makes the same choice.
+        """
+        valid = np.asarray(probabilities[:options_count], dtype=np.float64)
+        leaders = np.flatnonzero(valid >= valid.max() - tolerance)
+        if scores is None:
+            return int(leaders[0])
+        order = np.lexsort((leaders, -np.asarray(scores)[leaders]))
+        return int(leaders[order[0]])
+
+
+def _shot_policy(confidence: float, max_shots: int) -> ShotPolicy:
+    return ShotPolicy(
+        initial_shots=settings.QUANTUM_MIN_SHOTS,
+        max_shots=max_shots,
+        confidence=confidence,
+        indifference=settings.QUANTUM_INDIFFERENCE,
+        adaptive=settings.QUANTUM_ADAPTIVE_SHOTS
+    )
+
+
+quantum_engine = QuantumDecisionEngine(
+    mode=settings.QUANTUM_EXECUTION_MODE,
+    seed=settings.QUANTUM_SEED,
+    batch_size=settings.QUANTUM_BATCH_MAX_SIZE,
+    batch_wait=settings.QUANTUM_BATCH_WINDOW_MS / 1000,
+    shot_policy=_shot_policy(settings.QUANTUM_CONFIDENCE, settings.QUANTUM_MAX_SHOTS),
+    simulation_max_qubits=settings.QUANTUM_SIMULATION_MAX_QUBITS,
+    tier_policies={
+        tier: _shot_policy(
+            settings.QUANTUM_TIER_CONFIDENCE.get(tier, settings.QUANTUM_CONFIDENCE),
+            settings.QUANTUM_TIER_MAX_SHOTS.get(tier, settings.QUANTUM_MAX_SHOTS)
+        )
+        for tier in set(settings.QUANTUM_TIER_CONFIDENCE) | set(settings.QUANTUM_TIER_MAX_SHOTS)
+    }
+)
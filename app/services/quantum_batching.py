@@ -0,0 +1,127 @@
+import asyncio
+import time
+from typing import Dict, Optional
+from qiskit import QuantumCircuit
+from app.core.metrics import LatencyRecorder
+from app.services.batching import collect_batch
+from app.services.quantum_errors import QuantumOverloadedError
+
+
+class QuantumBatchScheduler:
+    """
+    Collects circuits submitted by concurrent requests and runs them as one
+    multi-circuit simulator job (per shot count and seed) on the quantum executor's
+    worker processes. Each caller gets back the counts for its own circuit.
+    Up to one job per executor worker runs at a time; circuits arriving
+    meanwhile queue up (at most `max_queued`) and go out in the next batch.
+    """
+    def __init__(
+        self,
+        executor,
+        max_batch_size: int,
+        max_wait: float,
+        max_queued: int,
+        seed: Optional[int] = None
+    ):
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_queued = max_queued
+        self.seed = seed
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._running: set = set()
+        self.jobs = 0
+        self.rejected = 0
+        self.circuits = 0
+        self.max_batch_seen = 0
+        self.queue_wait = LatencyRecorder()
+        self.job_latency = LatencyRecorder()
+
+    async def submit(self, circuit: QuantumCircuit, shots: int, seed: Optional[int] = None) -> Dict[str, int]:
+        """Counts for `circuit`; `seed` overrides the scheduler's simulator seed"""
+        # Reject invalid circuits here so they can't fail a whole batch
+        self.executor.security.validate_circuit(circuit)
+        if self._worker is None or self._worker.done():
+            self._start()
+        future = asyncio.get_running_loop().create_future()
+        seed = self.seed if seed is None else seed
+        try:
+            self._queue.put_nowait((circuit, (shots, seed), time.perf_counter(), future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QuantumOverloadedError("Quantum batch queue is full")
+        return await future
+
+    def _start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queued)
+            self._slots = asyncio.Semaphore(self.executor.workers)
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for a free worker first so the queue keeps filling meanwhile
+            await self._slots.acquire()
+            try:
+                batch = await collect_batch(self._queue, self.max_batch_size, self.max_wait)
+            except BaseException:
+                self._slots.release()
+                raise
+            started = time.perf_counter()
+            for _, _, submitted, _ in batch:
+                self.queue_wait.record(started - submitted)
+
+            # One job per distinct shot count and seed
+            by_run: Dict[tuple, list] = {}
+            for item in batch:
+                by_run.setdefault(item[1], []).append(item)
+
+            for i, ((shots, seed), items) in enumerate(by_run.items()):
+                if i:
+                    await self._slots.acquire()
+                task = loop.create_task(self._dispatch(items, shots, seed))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _dispatch(self, items: list, shots: int, seed: Optional[int]):
+        circuits = [circuit for circuit, _, _, _ in items]
+        try:
+            with self.job_latency.time():
+                all_counts = await self.executor.run_batch(circuits, shots, seed)
+        except Exception as e:
+            for *_, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+
+        self.jobs += 1
+        self.circuits += len(circuits)
+        self.max_batch_seen = max(self.max_batch_seen, len(circuits))
+        for (*_, future), counts in zip(items, all_counts):
+            if not future.done():
+                future.set_result(counts)
+
+    def stats(self) -> dict:
+        return {
+            "jobs": self.jobs,
+            "circuits": self.circuits,
+            "mean_batch_size": round(self.circuits / self.jobs, 2) if self.jobs else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queued": self.max_queued,
+            "running_jobs": len(self._running),
+            "rejected": self.rejected,
+            "queue_wait": self.queue_wait.snapshot(),
+            "job_latency": self.job_latency.snapshot()
+        }
+
+    def shutdown(self):
+        if self._worker is not None:
+            self._worker.cancel()
+        for task in list(self._running):
+            task.cancel()
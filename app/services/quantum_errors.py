@@ -0,0 +1,17 @@
+# Kept free of qiskit so the app can handle these without loading the
+# quantum subsystem
+
+
+class QuantumExecutionError(Exception):
+    """Raised when a quantum job can't be run"""
+
+
+class QuantumOverloadedError(QuantumExecutionError):
+    """Raised when the batch queue or the executor is full"""
+
+
+class RenderBudgetExceededError(Exception):
+    """Raised when a diagram isn't cached and the render budget is used up"""
+    def __init__(self, retry_after: int):
+        super().__init__("Circuit render budget exhausted")
+        self.retry_after = retry_after
@@ -0,0 +1,143 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+from qiskit import QuantumCircuit
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder, metrics_registry
+from app.services import quantum_worker
+from app.services.quantum_errors import QuantumExecutionError, QuantumOverloadedError
+from app.services.quantum_security import QuantumSecurity
+
+
+class QuantumExecutionService:
+    """
+    Runs simulator jobs in a pool of worker processes that import qiskit/Aer
+    once at spawn, so simulations never block the event loop. Circuits are
+    validated before submission, the number of outstanding jobs is bounded,
+    jobs time out, and workers are replaced after `max_jobs_per_worker` jobs.
+    A pool that breaks (a worker died) or has a timed-out job stuck in it is
+    replaced, so later jobs don't wait on it.
+    """
+    def __init__(
+        self,
+        workers: int,
+        max_pending: int,
+        timeout: float,
+        max_jobs_per_worker: int
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.security = QuantumSecurity()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.invalid = 0
+        self.timeouts = 0
+        self.pool_restarts = 0
+        self.job_latency = LatencyRecorder()
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=quantum_worker.init_worker,
+                max_tasks_per_child=self.max_jobs_per_worker
+            )
+        return self._pool
+
+    async def start(self):
+        """Spawn and warm every worker ahead of the first job"""
+        loop = asyncio.get_running_loop()
+        pool = self._ensure_pool()
+        await asyncio.gather(*(
+            loop.run_in_executor(pool, quantum_worker.ping)
+            for _ in range(self.workers)
+        ))
+
+    async def run(self, circuit: QuantumCircuit, shots: int, seed: Optional[int] = None) -> Dict[str, int]:
+        return (await self.run_batch([circuit], shots, seed))[0]
+
+    async def run_batch(
+        self,
+        circuits: List[QuantumCircuit],
+        shots: int,
+        seed: Optional[int] = None
+    ) -> List[Dict[str, int]]:
+        """Validate and run circuits as one simulator job in a worker process"""
+        try:
+            for circuit in circuits:
+                self.security.validate_circuit(circuit)
+        except ValueError:
+            self.invalid += 1
+            raise
+
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise QuantumOverloadedError("Quantum executor queue is full")
+
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        pool = self._ensure_pool()
+        try:
+            future = pool.submit(quantum_worker.run_circuits, circuits, shots, seed)
+            with self.job_latency.time():
+                counts = await asyncio.wait_for(asyncio.wrap_future(future, loop=loop), self.timeout)
+            self.completed += 1
+            return counts
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            if not future.cancel():
+                # Already running in a worker: stop sending jobs to that pool
+                self._restart_pool(pool)
+            raise QuantumExecutionError(f"Quantum job exceeded {self.timeout}s timeout")
+        except BrokenProcessPool as e:
+            self._restart_pool(pool)
+            raise QuantumExecutionError(f"Quantum worker died: {str(e)}")
+        finally:
+            self._pending -= 1
+
+    def _restart_pool(self, pool: ProcessPoolExecutor):
+        """
+        Replace `pool` with a fresh one on the next job. Queued jobs on the
+        old pool are cancelled; a worker still running a job exits once
+        it's done, which QuantumSecurity's circuit limits keep bounded.
+        Several jobs can fail on the same pool, so only the first replaces it.
+        """
+        if pool is not self._pool:
+            return
+        self._pool = None
+        self.pool_restarts += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "invalid": self.invalid,
+            "timeouts": self.timeouts,
+            "pool_restarts": self.pool_restarts,
+            "job_latency": self.job_latency.snapshot()
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+quantum_executor = QuantumExecutionService(
+    workers=settings.QUANTUM_WORKERS,
+    max_pending=settings.QUANTUM_MAX_PENDING_JOBS,
+    timeout=settings.QUANTUM_JOB_TIMEOUT_SECONDS,
+    max_jobs_per_worker=settings.QUANTUM_WORKER_MAX_JOBS
+)
+metrics_registry.register("quantum_executor", quantum_executor.stats)
@@ -1,19 +1,146 @@
-from qiskit import QuantumCircuit, transpile  
-from qiskit.providers import AerSimulator  
-from typing import Dict
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+from qiskit import QuantumCircuit, transpile
+from qiskit_aer import AerSimulator
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+
+
+def grover_fingerprint(
+    num_qubits: int,
+    marked: Iterable[int],
+    iterations: int,
+    backend: str
+) -> Tuple:
+    """Cache key for a Grover circuit: everything that determines its structure"""
+    return ("grover", num_qubits, frozenset(marked), iterations, backend)
+
+
+def circuit_fingerprint(circuit: QuantumCircuit, backend: str) -> Tuple:
+    """Structural key for an arbitrary circuit, cheaper than serializing to QASM"""
+    operations = tuple(
+        (
+            instruction.operation.name,
+            tuple(circuit.find_bit(q).index for q in instruction.qubits),
+            tuple(circuit.find_bit(c).index for c in instruction.clbits),
+            tuple(float(p) if isinstance(p, (int, float)) else str(p)
+                  for p in instruction.operation.params)
+        )
+        for instruction in circuit.data
+    )
+    return ("circuit", circuit.num_qubits, circuit.num_clbits, operations, backend)
+
+
+class CircuitCache:
+    """Size-bounded LRU keyed by circuit fingerprint (compiled circuits, rendered diagrams)"""
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._circuits: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            self.misses += 1
+            return None
+        self._circuits.move_to_end(key)
+        self.hits += 1
+        return circuit
+
+    def set(self, key: Hashable, circuit: Any):
+        self._circuits[key] = circuit
+        self._circuits.move_to_end(key)
+        while len(self._circuits) > self.max_size:
+            self._circuits.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._circuits)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._circuits),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions
+        }
+
 
 class QuantumOptimizer:
-    def __init__(self):
+    def __init__(self, cache_size: int = 256):
         self.optimized_backend = AerSimulator()
-        self.cache: Dict[str, QuantumCircuit] = {}  
-    async def get_optimized_circuit(self, circuit: QuantumCircuit) -> QuantumCircuit:
-        """Applies Qiskit's optimization passes"""
-        cache_key = circuit.qasm()
-        if cache_key not in self.cache:
-            optimized = transpile(
-                circuit,
-                backend=self.optimized_backend,
-                optimization_level=3
-            )
-            self.cache[cache_key] = optimized
-        return self.cache[cache_key]
\ No newline at end of file
+        self.cache = CircuitCache(cache_size)
+        # Circuits are compiled on executor threads as well as at startup.
+        # The lock only guards the cache and the in-flight table; compiles
+        # run outside it, and one per key at a time.
+        self._lock = threading.Lock()
+        self._compiling: Dict[Hashable, Future] = {}
+        self.shared_compiles = 0
+
+    @property
+    def backend_name(self) -> str:
+        name = self.optimized_backend.name
+        return name() if callable(name) else name
+
+    def get_optimized_circuit(self, circuit: QuantumCircuit) -> QuantumCircuit:
+        """Applies Qiskit's optimization passes (blocking: call it off the event loop)"""
+        key = circuit_fingerprint(circuit, self.backend_name)
+        return self.get_or_compile(key, lambda: circuit)
+
+    def get_or_compile(
+        self,
+        key: Hashable,
+        build: Callable[[], QuantumCircuit],
+        transpiled: bool = True
+    ) -> QuantumCircuit:
+        """
+        Cached circuit for `key`; on a miss `build` runs (and is transpiled if
+        asked). Threads missing on a key that is already compiling wait for
+        that compile, and see its error if it fails.
+        """
+        with self._lock:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+            pending = self._compiling.get(key)
+            if pending is not None:
+                self.shared_compiles += 1
+            else:
+                self._compiling[key] = future = Future()
+
+        if pending is not None:
+            return pending.result()
+
+        try:
+            circuit = build()
+            if transpiled:
+                circuit = transpile(
+                    circuit,
+                    backend=self.optimized_backend,
+                    optimization_level=3
+                )
+        except BaseException as e:
+            with self._lock:
+                del self._compiling[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self.cache.set(key, circuit)
+            del self._compiling[key]
+        future.set_result(circuit)
+        return circuit
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "shared_compiles": self.shared_compiles}
+
+
+quantum_optimizer = QuantumOptimizer(cache_size=settings.QUANTUM_CIRCUIT_CACHE_SIZE)
+metrics_registry.register("quantum_circuit_cache", quantum_optimizer.stats)
@@ -0,0 +1,145 @@
+import math
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from app.core.metrics import LatencyRecorder
+
+
+def _normal_cdf(z: float) -> float:
+    return 0.5 * math.erfc(-z / math.sqrt(2))
+
+
+class ShotPolicy:
+    """
+    How a measured decision spends shots: start with `initial_shots`, double
+    the running total each round up to `max_shots`, and stop as soon as the
+    leader is clear at `confidence`. Probability gaps below `indifference`
+    are treated as ties.
+    """
+    def __init__(
+        self,
+        initial_shots: int,
+        max_shots: int,
+        confidence: float,
+        indifference: float = 0.1,
+        adaptive: bool = True
+    ):
+        self.initial_shots = max(1, min(initial_shots, max_shots))
+        self.max_shots = max_shots
+        self.confidence = confidence
+        self.indifference = indifference
+        self.adaptive = adaptive
+
+    def rounds(self) -> List[int]:
+        """Shots to take in each round"""
+        if not self.adaptive:
+            return [self.max_shots]
+        rounds = [self.initial_shots]
+        total = self.initial_shots
+        while total < self.max_shots:
+            shots = min(total, self.max_shots - total)
+            rounds.append(shots)
+            total += shots
+        return rounds
+
+    @property
+    def per_round_confidence(self) -> float:
+        # Every round is a look at the data; split the error budget across them
+        return 1 - (1 - self.confidence) / len(self.rounds())
+
+
+def decision_confidence(
+    counts: np.ndarray,
+    chosen: int,
+    scores: Sequence[float],
+    indifference: float
+) -> float:
+    """
+    How sure the sampled counts make us that `chosen` is the right pick: the
+    weakest one-sided z-test of its probability against every other
+    candidate. Candidates that would win a tie (higher score, or equal score
+    and lower index) must be clearly less likely. The rest only need to be
+    not clearly more likely than `indifference`, since ties go to `chosen`.
+    """
+    total = counts.sum()
+    if total == 0 or len(counts) < 2:
+        return 1.0 if len(counts) == 1 else 0.0
+
+    p = counts / total
+    scores = np.asarray(scores, dtype=np.float64)
+    others = np.flatnonzero(np.arange(len(p)) != chosen)
+    beats_chosen = (scores[others] > scores[chosen]) | (
+        (scores[others] == scores[chosen]) & (others < chosen)
+    )
+
+    diff = p[chosen] - p[others]
+    margin = np.where(beats_chosen, 0.0, indifference)
+    # Variance of the difference of two multinomial proportions, floored so
+    # all-or-nothing counts don't divide by zero
+    variance = np.maximum(p[chosen] + p[others] - diff ** 2, 1 / total) / total
+    z = (diff + margin) / np.sqrt(variance)
+    return _normal_cdf(float(z.min()))
+
+
+class QuantumDecision:
+    """Outcome of one decision and what it cost"""
+    def __init__(
+        self,
+        index: int,
+        mode: str,
+        shots: int = 0,
+        confidence: float = 1.0,
+        rounds: int = 0,
+        stopped_early: bool = False
+    ):
+        self.index = index
+        self.mode = mode
+        self.shots = shots
+        self.confidence = confidence
+        self.rounds = rounds
+        self.stopped_early = stopped_early
+        self.response: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "index": self.index,
+            "mode": self.mode,
+            "shots": self.shots,
+            "confidence": round(self.confidence, 6),
+            "rounds": self.rounds,
+            "stopped_early": self.stopped_early
+        }
+
+
+class DecisionStats:
+    """Shots, confidence and latency of decisions, per subscription tier"""
+    def __init__(self):
+        self._tiers: Dict[str, dict] = {}
+
+    def record(self, tier: Optional[str], decision: QuantumDecision, seconds: float):
+        tier_stats = self._tiers.setdefault(tier or "default", {
+            "decisions": 0,
+            "shots": 0,
+            "stopped_early": 0,
+            "confidence_sum": 0.0,
+            "min_confidence": 1.0,
+            "latency": LatencyRecorder()
+        })
+        tier_stats["decisions"] += 1
+        tier_stats["shots"] += decision.shots
+        tier_stats["stopped_early"] += decision.stopped_early
+        tier_stats["confidence_sum"] += decision.confidence
+        tier_stats["min_confidence"] = min(tier_stats["min_confidence"], decision.confidence)
+        tier_stats["latency"].record(seconds)
+
+    def stats(self) -> dict:
+        return {
+            tier: {
+                "decisions": s["decisions"],
+                "mean_shots": round(s["shots"] / s["decisions"], 1),
+                "early_stop_rate": round(s["stopped_early"] / s["decisions"], 4),
+                "mean_confidence": round(s["confidence_sum"] / s["decisions"], 6),
+                "min_confidence": round(s["min_confidence"], 6),
+                "latency": s["latency"].snapshot()
+            }
+            for tier, s in self._tiers.items()
+        }
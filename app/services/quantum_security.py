@@ -1,7 +1,6 @@
-from qiskit import QiskitError
 from qiskit import QuantumCircuit
-from qiskit import execute
-from qiskit.exceptions import QuantumExecutionError
+from app.services.quantum_errors import QuantumExecutionError, QuantumOverloadedError
+
 
 class QuantumSecurity:
     MAX_QUBITS = 16  # Prevent resource exhaustion
@@ -13,9 +12,13 @@ class QuantumSecurity:
         if not circuit.clbits:
             raise ValueError("Measurement operations required")
 
-    async def safe_execute(self, circuit: QuantumCircuit):
+    async def safe_execute(self, circuit: QuantumCircuit, shots: int = 1024):
+        # Imported here: the executor validates through this class
+        from app.services.quantum_executor import quantum_executor
+
         try:
-            self.validate_circuit(circuit)
-            return await execute(circuit, self.backend)
-        except QiskitError as e:
-            raise QuantumExecutionError(f"Quantum processing failed: {str(e)}")
\ No newline at end of file
+            return await quantum_executor.run(circuit, shots)
+        except (ValueError, QuantumOverloadedError):
+            raise
+        except Exception as e:
+            raise QuantumExecutionError(f"Quantum processing failed: {str(e)}")
@@ -0,0 +1,27 @@
+"""Code that runs inside quantum executor worker processes"""
+from typing import Dict, List, Optional
+
+_simulator = None
+
+
+def init_worker():
+    """Import qiskit/Aer and build the simulator once per worker process"""
+    global _simulator
+    from qiskit import QuantumCircuit
+    from qiskit_aer import AerSimulator
+
+    _simulator = AerSimulator()
+    # Run a trivial circuit so the first real job doesn't pay for lazy setup
+    warmup = QuantumCircuit(1)
+    warmup.h(0)
+    warmup.measure_all()
+    _simulator.run(warmup, shots=1).result()
+
+
+def ping() -> bool:
+    return _simulator is not None
+
+
+def run_circuits(circuits: list, shots: int, seed: Optional[int] = None) -> List[Dict[str, int]]:
+    result = _simulator.run(circuits, shots=shots, seed_simulator=seed).result()
+    return [result.get_counts(i) for i in range(len(circuits))]
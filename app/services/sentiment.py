@@ -0,0 +1,231 @@
+import asyncio
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder, metrics_registry
+from app.services.batching import collect_batch
+from app.services.inflight import InFlight
+
+_WORD = re.compile(r"[a-z']+")
+_POSITIVE = {
+    "good", "great", "love", "like", "happy", "glad", "thanks", "thank", "awesome",
+    "excellent", "nice", "amazing", "wonderful", "fantastic", "perfect", "cool",
+    "helpful", "enjoy", "fun", "best", "yes", "excited", "beautiful", "pleased"
+}
+_NEGATIVE = {
+    "bad", "hate", "sad", "angry", "terrible", "awful", "horrible", "worst", "annoyed",
+    "upset", "frustrated", "frustrating", "broken", "wrong", "useless", "problem",
+    "fail", "failed", "sucks", "disappointed", "confused", "stupid"
+}
+_NEGATIONS = {"not", "no", "never", "don't", "doesn't", "didn't", "isn't", "wasn't", "can't", "won't"}
+
+
+def lexicon_score(text: str) -> float:
+    """Fast word-list sentiment in -1..1 with simple negation flipping"""
+    score = 0
+    hits = 0
+    negate = False
+    for word in _WORD.findall(text.lower()):
+        if word in _NEGATIONS:
+            negate = True
+            continue
+        polarity = (word in _POSITIVE) - (word in _NEGATIVE)
+        if polarity:
+            score += -polarity if negate else polarity
+            hits += 1
+        negate = False
+    return score / hits if hits else 0.0
+
+
+def text_key(text: str) -> bytes:
+    """Hash of case- and whitespace-normalized text"""
+    normalized = " ".join(text.lower().split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
+
+class SentimentCache:
+    """Bounded LRU of scores keyed by normalized-text hash"""
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._scores: "OrderedDict[bytes, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes) -> Optional[float]:
+        score = self._scores.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self._scores.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def set(self, key: bytes, score: float):
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        if len(self._scores) > self.max_size:
+            self._scores.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._scores),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class SentimentEngine:
+    """
+    Scores text with a locally loaded CPU model. Concurrent requests are
+    collected into micro-batches (up to `max_batch_size` texts or
+    `max_wait` seconds) and inferred on a worker thread. When the model
+    can't be loaded, the lexicon scorer is used instead. Repeated texts are
+    answered from an LRU, and identical texts already in flight share one
+    inference.
+    """
+    def __init__(
+        self,
+        model_name: Optional[str],
+        max_batch_size: int,
+        max_wait: float,
+        cache_size: int = 4096
+    ):
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sentiment")
+        self._model = None
+        self._model_failed = model_name is None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._started = time.monotonic()
+        self.scored = 0
+        self.batched = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+        self.inference_latency = LatencyRecorder()
+        self.cache = SentimentCache(cache_size)
+        self._in_flight = InFlight()
+
+    @property
+    def backend(self) -> str:
+        if self._model is not None:
+            return "model"
+        return "lexicon" if self._model_failed else "loading"
+
+    async def score(self, text: str) -> float:
+        """Sentiment in -1 (negative) .. 1 (positive)"""
+        key = text_key(text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        return await self._in_flight.run(key, lambda: self._score_and_cache(key, text))
+
+    async def _score_and_cache(self, key: bytes, text: str) -> float:
+        value = await self._score_uncached(text)
+        self.cache.set(key, value)
+        return value
+
+    async def _score_uncached(self, text: str) -> float:
+        if self._model_failed:
+            self.scored += 1
+            return lexicon_score(text)
+
+        if self._worker is None or self._worker.done():
+            self._start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    def _start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await collect_batch(self._queue, self.max_batch_size, self.max_wait)
+
+            texts = [text for text, _ in batch]
+            try:
+                with self.inference_latency.time():
+                    scores = await loop.run_in_executor(self._executor, self._infer, texts)
+            except Exception as e:
+                print(f"Sentiment batch failed, using lexicon: {str(e)}")
+                scores = [lexicon_score(text) for text in texts]
+
+            self.batches += 1
+            self.batched += len(batch)
+            self.scored += len(batch)
+            self.max_batch_seen = max(self.max_batch_seen, len(batch))
+            for (_, future), value in zip(batch, scores):
+                if not future.done():
+                    future.set_result(value)
+
+    async def warm(self):
+        """Load the model ahead of the first request"""
+        if not self._model_failed:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._load_model)
+
+    def _infer(self, texts: List[str]) -> List[float]:
+        model = self._load_model()
+        if model is None:
+            return [lexicon_score(text) for text in texts]
+        results = model(texts, truncation=True, batch_size=len(texts))
+        return [self._to_score(r["label"], r["score"]) for r in results]
+
+    def _load_model(self):
+        if self._model is None and not self._model_failed:
+            try:
+                from transformers import pipeline
+                self._model = pipeline("sentiment-analysis", model=self.model_name, device=-1)
+            except Exception as e:
+                print(f"Sentiment model unavailable, falling back to lexicon: {str(e)}")
+                self._model_failed = True
+        return self._model
+
+    @staticmethod
+    def _to_score(label: str, confidence: float) -> float:
+        label = label.upper()
+        if label.startswith("NEG") or label == "LABEL_0":
+            return -float(confidence)
+        if label.startswith("NEU"):
+            return 0.0
+        return float(confidence)
+
+    def stats(self) -> dict:
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        return {
+            "backend": self.backend,
+            "scored": self.scored,
+            "throughput_per_s": round(self.scored / elapsed, 3),
+            "batches": self.batches,
+            "mean_batch_size": round(self.batched / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "inference_latency": self.inference_latency.snapshot(),
+            "cache": self.cache.stats(),
+            "shared_in_flight": self._in_flight.shared
+        }
+
+    def shutdown(self):
+        if self._worker is not None:
+            self._worker.cancel()
+        self._executor.shutdown(wait=False)
+
+
+sentiment_engine = SentimentEngine(
+    model_name=settings.SENTIMENT_MODEL or None,
+    max_batch_size=settings.SENTIMENT_MAX_BATCH_SIZE,
+    max_wait=settings.SENTIMENT_MAX_WAIT_MS / 1000,
+    cache_size=settings.SENTIMENT_CACHE_SIZE
+)
+metrics_registry.register("sentiment", sentiment_engine.stats)
@@ -0,0 +1,216 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from speech_recognition import AudioData, Recognizer, RequestError, UnknownValueError
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder, metrics_registry
+from app.services.audio_decode import to_pcm16
+
+
+class TranscriptionUnavailableError(Exception):
+    """The backend can't be reached or isn't installed"""
+
+
+class TranscriptionOverloadedError(Exception):
+    """Raised when the transcription queue is full and new work is rejected"""
+
+
+class TranscriptionBackend:
+    """Turns PCM audio into text; runs on a transcription worker thread"""
+    name = "base"
+
+    def transcribe(self, audio: AudioData) -> Optional[str]:
+        """Transcript, None when no speech is understood"""
+        raise NotImplementedError
+
+
+class GoogleTranscriber(TranscriptionBackend):
+    """Google Web Speech API (network round trip)"""
+    name = "google"
+
+    def __init__(self, language: str = "en-US"):
+        self.language = language
+        self.recognizer = Recognizer()
+
+    def transcribe(self, audio: AudioData) -> Optional[str]:
+        try:
+            return self.recognizer.recognize_google(audio, language=self.language)
+        except UnknownValueError:
+            return None
+        except RequestError as e:
+            raise TranscriptionUnavailableError(str(e))
+
+
+class SphinxTranscriber(TranscriptionBackend):
+    """CMU PocketSphinx, fully offline (needs the pocketsphinx package)"""
+    name = "sphinx"
+
+    def __init__(self, language: str = "en-US"):
+        self.language = language
+        self.recognizer = Recognizer()
+
+    def transcribe(self, audio: AudioData) -> Optional[str]:
+        try:
+            return self.recognizer.recognize_sphinx(audio, language=self.language) or None
+        except UnknownValueError:
+            return None
+        except RequestError as e:
+            # Also how SpeechRecognition reports a missing pocketsphinx
+            raise TranscriptionUnavailableError(str(e))
+
+
+class StubTranscriber(TranscriptionBackend):
+    """Deterministic transcript for tests and load runs; never touches the audio content"""
+    name = "stub"
+
+    def __init__(self, text: str = "stub transcript", delay: float = 0.0):
+        self.text = text
+        self.delay = delay
+
+    def transcribe(self, audio: AudioData) -> Optional[str]:
+        if self.delay:
+            time.sleep(self.delay)
+        return self.text
+
+
+BACKENDS = {
+    "google": GoogleTranscriber,
+    "sphinx": SphinxTranscriber,
+    "stub": StubTranscriber
+}
+
+
+def create_backend(name: str, language: str = "en-US") -> TranscriptionBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown transcription backend '{name}'")
+    if name == "stub":
+        return StubTranscriber()
+    return BACKENDS[name](language=language)
+
+
+class _BackendStats:
+    def __init__(self):
+        self.calls = 0
+        self.no_speech = 0
+        self.unavailable = 0
+        self.timeouts = 0
+        self.latency = LatencyRecorder()
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "no_speech": self.no_speech,
+            "unavailable": self.unavailable,
+            "timeouts": self.timeouts,
+            "latency": self.latency.snapshot()
+        }
+
+
+class TranscriptionService:
+    """
+    Runs transcription backends on a bounded thread pool so network calls
+    and offline decoding never block the event loop. The primary backend is
+    tried first; the fallback only when the primary is unreachable or times
+    out. Work beyond the workers plus `max_queue` is rejected.
+    """
+    def __init__(
+        self,
+        backends: List[TranscriptionBackend],
+        workers: int,
+        max_queue: int,
+        timeout: float
+    ):
+        self.backends = backends
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="transcribe")
+        # Released when the job itself finishes or is cancelled, so a call
+        # that timed out but is still running keeps holding its slot
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.backend_stats: Dict[str, _BackendStats] = {b.name: _BackendStats() for b in backends}
+
+    async def transcribe(self, y: np.ndarray, sample_rate: int) -> Tuple[Optional[str], bool]:
+        """
+        Transcript of mono float32 audio, and whether a backend answered. The
+        transcript is None both when there's no speech in the audio (answered)
+        and when every backend failed, timed out or the queue was full (not
+        answered, so worth retrying later)
+        """
+        for backend in self.backends:
+            try:
+                return await self._submit(backend, y, sample_rate), True
+            except TranscriptionUnavailableError as e:
+                print(f"Transcription backend '{backend.name}' unavailable: {str(e)}")
+            except asyncio.TimeoutError:
+                print(f"Transcription backend '{backend.name}' timed out after {self.timeout}s")
+            except TranscriptionOverloadedError:
+                return None, False
+        return None, False
+
+    async def _submit(self, backend: TranscriptionBackend, y: np.ndarray, sample_rate: int) -> Optional[str]:
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise TranscriptionOverloadedError("Transcription queue is full")
+            self._pending += 1
+
+        stats = self.backend_stats[backend.name]
+        future = self._executor.submit(self._run, backend, stats, y, sample_rate)
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    @staticmethod
+    def _run(backend: TranscriptionBackend, stats: _BackendStats, y: np.ndarray, sample_rate: int):
+        stats.calls += 1
+        try:
+            with stats.latency.time():
+                text = backend.transcribe(AudioData(to_pcm16(y), sample_rate, 2))
+        except TranscriptionUnavailableError:
+            stats.unavailable += 1
+            raise
+        if text is None:
+            stats.no_speech += 1
+        return text
+
+    def stats(self) -> dict:
+        return {
+            "backends": [b.name for b in self.backends],
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "rejected": self.rejected,
+            "per_backend": {name: s.snapshot() for name, s in self.backend_stats.items()}
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _configured_backends() -> List[TranscriptionBackend]:
+    names = [settings.TRANSCRIPTION_BACKEND]
+    if settings.TRANSCRIPTION_FALLBACK and settings.TRANSCRIPTION_FALLBACK not in names:
+        names.append(settings.TRANSCRIPTION_FALLBACK)
+    return [create_backend(name, language=settings.TRANSCRIPTION_LANGUAGE) for name in names]
+
+
+transcription_service = TranscriptionService(
+    backends=_configured_backends(),
+    workers=settings.TRANSCRIPTION_WORKERS,
+    max_queue=settings.TRANSCRIPTION_MAX_QUEUE,
+    timeout=settings.TRANSCRIPTION_TIMEOUT_SECONDS
+)
+metrics_registry.register("transcription", transcription_service.stats)
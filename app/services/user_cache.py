@@ -0,0 +1,210 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, Set, Tuple
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+from app.db.models.user import User
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """
+    Read-only copy of the authenticated user's columns, shared across
+    requests by the auth cache. It isn't mapped: it can't be added to a
+    session and has no relationships, so load the User row to change
+    anything or to read related rows.
+    """
+    id: int
+    username: str
+    email: str
+    is_active: bool
+    subscription_tier: str
+    quantum_access: bool
+    voice_enabled: bool
+    personality_matrix: dict
+    heatmap_preferences: dict
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_active=user.is_active,
+            subscription_tier=user.subscription_tier,
+            quantum_access=bool(user.quantum_access),
+            voice_enabled=bool(user.voice_enabled),
+            personality_matrix=dict(user.personality_matrix or {}),
+            heatmap_preferences=dict(user.heatmap_preferences or {})
+        )
+
+
+# Changing any of these must drop cached entries for the user
+WATCHED_FIELDS = tuple(f.name for f in fields(CurrentUser)) + ("hashed_password",)
+
+
+class AuthUserCache:
+    """
+    Bounded TTL/LRU cache of decoded token claims and CurrentUser copies.
+    Entries are dropped once a transaction changing the user commits in
+    this process. Other workers only notice when their entry expires, so a
+    tier or access change can take up to AUTH_CACHE_TTL_SECONDS to reach
+    every worker.
+    """
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[dict, CurrentUser, float]]" = OrderedDict()
+        self._tokens_by_subject: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.skipped = 0
+        # Bumped on every invalidation; see set()
+        self.generation = 0
+
+    def get(self, token: str) -> Optional[Tuple[dict, CurrentUser]]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        claims, user, expires_at = entry
+        if expires_at <= time.time():
+            self._remove(token)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return claims, user
+
+    def set(self, token: str, claims: dict, user: User, seen: int) -> CurrentUser:
+        """
+        Cache the user loaded for `token`. `seen` is `generation` from before
+        the row was read; if anything was invalidated since, the row may
+        predate that commit and is returned without being cached.
+        """
+        current = CurrentUser.from_user(user)
+        if seen != self.generation:
+            self.skipped += 1
+            return current
+
+        expires_at = time.time() + self.ttl
+        if claims.get("exp"):
+            expires_at = min(expires_at, float(claims["exp"]))
+
+        subject = claims["sub"]
+        self._entries[token] = (claims, current, expires_at)
+        self._entries.move_to_end(token)
+        self._tokens_by_subject.setdefault(subject, set()).add(token)
+
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+        return current
+
+    def invalidate_subject(self, subject: str):
+        """Drop every cached token for a subject (user email)"""
+        for token in self._tokens_by_subject.pop(subject, set()):
+            self._entries.pop(token, None)
+        self.generation += 1
+        self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._tokens_by_subject.clear()
+        self.generation += 1
+
+    def _remove(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        subject = entry[0]["sub"]
+        tokens = self._tokens_by_subject.get(subject)
+        if tokens:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_subject[subject]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "skipped_stale": self.skipped
+        }
+
+
+auth_user_cache = AuthUserCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+metrics_registry.register("auth_user_cache", auth_user_cache.stats)
+
+
+# Changes are collected per session and applied only after the commit, so a
+# request that reads the user between flush and commit can't re-cache the
+# old row afterwards (see AuthUserCache.set)
+_PENDING = "auth_cache_pending"
+_ALL = object()
+
+
+def _pending(session: Optional[Session]) -> Optional[set]:
+    return None if session is None else session.info.setdefault(_PENDING, set())
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_on_update(mapper, connection, target: User):
+    state = inspect(target)
+    if not any(state.attrs[field].history.has_changes() for field in WATCHED_FIELDS):
+        return
+
+    pending = _pending(state.session)
+    if pending is not None:
+        # Tokens issued before an email change are keyed by the old address
+        pending.update({target.email, *(state.attrs.email.history.deleted or ())})
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_on_delete(mapper, connection, target: User):
+    pending = _pending(inspect(target).session)
+    if pending is not None:
+        pending.add(target.email)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_change(orm_execute_state):
+    # update(User)/delete(User) statements bypass the mapper events and can
+    # touch any number of rows, so the whole cache goes after the commit
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and \
+            orm_execute_state.bind_mapper is inspect(User):
+        _pending(orm_execute_state.session).add(_ALL)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session):
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    if _ALL in pending:
+        auth_user_cache.clear()
+        auth_user_cache.invalidations += 1
+        return
+    for subject in pending:
+        auth_user_cache.invalidate_subject(subject)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session):
+    session.info.pop(_PENDING, None)
@@ -1,105 +1,137 @@
-import os
+import asyncio
 from typing import Tuple, Optional
 import numpy as np
-import librosa
-from pydub import AudioSegment
-from speech_recognition import Recognizer, AudioFile, UnknownValueError, RequestError
 from app.core.config import settings
-from app.db.models.user import User
-from app.schemas.voice import VoiceAnalysisResult  
+from app.core.metrics import metrics_registry
+from app.services.user_cache import CurrentUser
+from app.schemas.voice import VoiceAnalysisResult
+from app.services.audio_decode import decode_audio
+from app.services.inflight import InFlight
+from app.services.voice_features import voice_feature_engine
+from app.services.voice_encoding import encode_features
+from app.services.voice_stream import VoiceStreamSession
+from app.services.transcription import transcription_service
+from app.services.voice_cache import VoiceResult, audio_key, voice_result_cache
 
 class VoiceProcessor:
     def __init__(self):
-        self.recognizer = Recognizer()
         self.sample_rate = 16000  # Standard for speech recognition
-        
+        self.cache = voice_result_cache
+        self._in_flight = InFlight()
+        self.uncached_failures = 0
+
     async def process_audio(
         self, 
-        user: User,
+        user: CurrentUser,
         audio_bytes: bytes,
-        content_type: str = "wav"
+        content_type: str = "wav",
+        features_mode: Optional[str] = None,
+        feature_dtype: str = "float32"
     ) -> Tuple[Optional[str], VoiceAnalysisResult]:
         """
         Processes voice input and returns:
         - Transcribed text
-        - Emotional analysis
+        - Emotional analysis, with voice features encoded per `features_mode`
+          (VOICE_FEATURES_DEFAULT_MODE when not given)
+        Byte-identical uploads with the same parameters (client retries) are
+        served from the result cache or share the computation in flight.
         """
-        try:
-            # 1. Save temporary audio file
-            temp_path = f"temp_audio_{user.id}.{content_type}"
-            with open(temp_path, "wb") as f:
-                f.write(audio_bytes)
-            
-            # 2. Convert to proper format if needed
-            if content_type != "wav":
-                audio = AudioSegment.from_file(temp_path, format=content_type)
-                audio.export("converted.wav", format="wav")
-                temp_path = "converted.wav"
-            
-            # 3. Speech-to-Text
-            text = await self._transcribe_audio(temp_path)
-            
-            # 4. Emotional analysis
-            emotion = await self._analyze_emotion(temp_path)
-            
-            return text, VoiceAnalysisResult(
-                text=text,
-                emotion=emotion,
-                voice_features=await self._extract_features(temp_path)
-            )
-            
-        finally:
-            # Cleanup
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            if os.path.exists("converted.wav"):
-                os.remove("converted.wav")
-    
-    async def _transcribe_audio(self, file_path: str) -> Optional[str]:
-        """Convert speech to text using Google Web Speech API"""
-        try:
-            with AudioFile(file_path) as source:
-                audio_data = self.recognizer.record(source)
-                return self.recognizer.recognize_google(audio_data)
-        except UnknownValueError:
-            print("Google Speech Recognition could not understand audio")
-            return None
-        except RequestError as e:
-            print(f"Could not request results from Google: {e}")
-            return None
+        features_mode = features_mode or settings.VOICE_FEATURES_DEFAULT_MODE
+        key = audio_key(audio_bytes, content_type, self.sample_rate, features_mode, feature_dtype)
+        if self.cache.max_bytes:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        return await self._in_flight.run(
+            key,
+            lambda: self._process_and_cache(key, audio_bytes, content_type, features_mode, feature_dtype)
+        )
+
+    async def _process_and_cache(
+        self,
+        key: bytes,
+        audio_bytes: bytes,
+        content_type: str,
+        features_mode: str,
+        feature_dtype: str
+    ) -> VoiceResult:
+        result, transcribed = await self._process_uncached(
+            audio_bytes, content_type, features_mode, feature_dtype
+        )
+        # A transcript missing because the backends were down or busy would
+        # otherwise be replayed to every retry until the entry expires
+        if not transcribed:
+            self.uncached_failures += 1
+        elif self.cache.max_bytes:
+            self.cache.set(key, result)
+        return result
+
+    async def _process_uncached(
+        self,
+        audio_bytes: bytes,
+        content_type: str,
+        features_mode: str,
+        feature_dtype: str
+    ) -> Tuple[VoiceResult, bool]:
+        """The result, and whether transcription got an answer (cacheable)"""
+        # 1. Decode once, in memory and off the event loop; every stage below
+        # reads the same float32 buffer
+        y = await asyncio.get_running_loop().run_in_executor(
+            None, decode_audio, audio_bytes, content_type, self.sample_rate
+        )
+
+        # 2. Speech-to-text on the transcription pool, alongside emotional
+        # analysis and features (one STFT in a worker process)
+        (text, transcribed), analysis = await asyncio.gather(
+            transcription_service.transcribe(y, self.sample_rate),
+            voice_feature_engine.analyze(y, self.sample_rate)
+        )
+
+        result = text, VoiceAnalysisResult(
+            text=text,
+            emotion=self._analyze_emotion(analysis["measures"]),
+            features_mode=features_mode,
+            voice_features=encode_features(analysis["features"], features_mode, feature_dtype)
+        )
+        return result, transcribed
     
-    async def _analyze_emotion(self, file_path: str) -> dict:
-        """Analyze voice emotion using librosa"""
-        y, sr = librosa.load(file_path, sr=self.sample_rate)
-        
-        # Extract features
-        pitch = await self._extract_pitch(y, sr)
-        tempo = await self._extract_tempo(y)
-        energy = np.mean(librosa.feature.rms(y=y))
-        
-        # Classify emotion (simplified - replace with your ML model)
+    def stream_emotion(self, session: VoiceStreamSession) -> dict:
+        """Emotion from a stream's running measures (CPU-bound, run off the loop)"""
+        return self._analyze_emotion(session.measures())
+
+    async def finish_stream(
+        self,
+        session: VoiceStreamSession,
+        emotion: dict
+    ) -> Tuple[Optional[str], VoiceAnalysisResult]:
+        """Transcribe a finished stream (if it kept its audio) and wrap its emotion"""
+        text = None
+        if session.keep_audio and session.samples:
+            text, _ = await transcription_service.transcribe(session.audio(), session.sample_rate)
+        return text, VoiceAnalysisResult(
+            text=text,
+            emotion=emotion,
+            features_mode="none",
+            voice_features=None
+        )
+
+    def stats(self) -> dict:
         return {
-            "arousal": float(np.clip(energy * 2, 0, 1)),  # Energy level 0-1
-            "valence": float(np.clip(pitch / 500, 0, 1)),  # Positivity 0-1
-            "dominance": float(np.clip(tempo / 200, 0, 1))  # Control 0-1
+            **self.cache.stats(),
+            "in_flight": len(self._in_flight),
+            "shared_in_flight": self._in_flight.shared,
+            "uncached_failures": self.uncached_failures
         }
-    
-    async def _extract_features(self, file_path: str) -> dict:
-        """Extract advanced voice features"""
-        y, sr = librosa.load(file_path, sr=self.sample_rate)
+
+    def _analyze_emotion(self, measures: dict) -> dict:
+        """Map energy, pitch (Hz) and tempo (BPM) to emotion dimensions"""
+        # Classify emotion (simplified - replace with your ML model)
         return {
-            "mfcc": librosa.feature.mfcc(y=y, sr=sr).tolist(),
-            "spectral_centroid": librosa.feature.spectral_centroid(y=y, sr=sr).tolist(),
-            "zero_crossing_rate": librosa.feature.zero_crossing_rate(y).tolist()
+            "arousal": float(np.clip(measures["energy"] * 2, 0, 1)),  # Energy level 0-1
+            "valence": float(np.clip(measures["pitch"] / 500, 0, 1)),  # Positivity 0-1
+            "dominance": float(np.clip(measures["tempo"] / 200, 0, 1))  # Control 0-1
         }
-    
-    async def _extract_pitch(self, y: np.ndarray, sr: int) -> float:
-        """Extract dominant pitch in Hz"""
-        pitches, _ = librosa.piptrack(y=y, sr=sr)
-        return np.mean(pitches[pitches > 0])
-    
-    async def _extract_tempo(self, y: np.ndarray) -> float:
-        """Extract tempo in BPM"""
-        return float(librosa.beat.tempo(y=y)[0])
 
-voice_processor = VoiceProcessor()
\ No newline at end of file
+voice_processor = VoiceProcessor()
+metrics_registry.register("voice_result_cache", voice_processor.stats)
\ No newline at end of file
@@ -0,0 +1,94 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+from app.schemas.voice import VoiceAnalysisResult
+from app.services.audio_decode import normalize_format
+
+VoiceResult = Tuple[Optional[str], VoiceAnalysisResult]
+
+
+def audio_key(audio_bytes: bytes, content_type: str, *params) -> bytes:
+    """Hash of the upload bytes, its container and the processing parameters"""
+    digest = hashlib.blake2b(audio_bytes, digest_size=16)
+    digest.update(repr((normalize_format(content_type),) + params).encode("utf-8"))
+    return digest.digest()
+
+
+class VoiceResultCache:
+    """
+    TTL/LRU cache of processed uploads, bounded by the serialized size of
+    the cached results rather than their count (a "full" feature result is
+    a few hundred times larger than a summary one).
+    """
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[VoiceResult, int, float]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.oversized = 0
+
+    def get(self, key: bytes) -> Optional[VoiceResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        result, _, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def set(self, key: bytes, result: VoiceResult):
+        size = len(key) + len(result[0] or "") + len(result[1].model_dump_json())
+        if size > self.max_bytes:
+            self.oversized += 1
+            return
+
+        self._remove(key)
+        self._entries[key] = (result, size, time.monotonic() + self.ttl)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def _remove(self, key: bytes):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "oversized": self.oversized
+        }
+
+
+voice_result_cache = VoiceResultCache(
+    max_bytes=settings.VOICE_CACHE_MAX_BYTES,
+    ttl=settings.VOICE_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,60 @@
+import base64
+from typing import Dict, Optional
+import numpy as np
+
+FEATURE_MODES = ("summary", "full", "full-binary", "none")
+FEATURE_DTYPES = ("float16", "float32")
+SUMMARY_PERCENTILES = (10, 50, 90)
+
+
+def summarize(matrix: np.ndarray) -> dict:
+    """Per-row (coefficient) statistics over the time frames"""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.shape[-1] == 0:
+        empty = [0.0] * matrix.shape[0]
+        return {"frames": 0, "mean": empty, "std": empty,
+                **{f"p{p}": empty for p in SUMMARY_PERCENTILES}}
+    percentiles = np.percentile(matrix, SUMMARY_PERCENTILES, axis=1)
+    summary = {
+        "frames": int(matrix.shape[1]),
+        "mean": np.round(matrix.mean(axis=1), 6).tolist(),
+        "std": np.round(matrix.std(axis=1), 6).tolist()
+    }
+    for p, values in zip(SUMMARY_PERCENTILES, percentiles):
+        summary[f"p{p}"] = np.round(values, 6).tolist()
+    return summary
+
+
+def encode_array(matrix: np.ndarray, dtype: str) -> dict:
+    """Little-endian array bytes as base64, with what's needed to rebuild it"""
+    array = np.ascontiguousarray(matrix, dtype=np.dtype(dtype).newbyteorder("<"))
+    return {
+        "dtype": dtype,
+        "shape": list(array.shape),
+        "data": base64.b64encode(array.tobytes()).decode("ascii")
+    }
+
+
+def encode_features(
+    features: Dict[str, np.ndarray],
+    mode: str,
+    dtype: str = "float32"
+) -> Optional[Dict[str, object]]:
+    """
+    Feature matrices in the requested representation:
+    summary - per-coefficient mean/std/p10/p50/p90
+    full - nested lists of floats (large)
+    full-binary - base64 float16/float32 arrays
+    none - omitted
+    """
+    if mode not in FEATURE_MODES:
+        raise ValueError(f"Unknown features mode '{mode}'")
+    if mode == "none":
+        return None
+    if mode == "summary":
+        return {name: summarize(matrix) for name, matrix in features.items()}
+    if mode == "full-binary":
+        if dtype not in FEATURE_DTYPES:
+            raise ValueError(f"Unknown feature dtype '{dtype}'")
+        return {name: encode_array(matrix, dtype) for name, matrix in features.items()}
+    return {name: np.asarray(matrix).tolist() for name, matrix in features.items()}
@@ -0,0 +1,100 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+import numpy as np
+from app.core.config import settings
+from app.core.metrics import LatencyRecorder, metrics_registry
+from app.services import voice_worker
+
+
+class VoiceFeatureEngine:
+    """
+    Extracts voice features in worker processes (one shared STFT per clip,
+    see voice_worker.compute_features), so librosa's CPU work never runs on
+    the event loop. Keeps a latency histogram per feature step.
+    """
+    def __init__(self, workers: int, timeout: float, max_jobs_per_worker: int):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.clips = 0
+        self.timeouts = 0
+        self.pool_restarts = 0
+        self.total_latency = LatencyRecorder()
+        self.feature_latency: Dict[str, LatencyRecorder] = {}
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=voice_worker.init_worker,
+                max_tasks_per_child=self.max_jobs_per_worker
+            )
+        return self._pool
+
+    async def start(self):
+        """Spawn and warm every worker ahead of the first clip"""
+        loop = asyncio.get_running_loop()
+        pool = self._ensure_pool()
+        await asyncio.gather(*(
+            loop.run_in_executor(pool, voice_worker.ping)
+            for _ in range(self.workers)
+        ))
+
+    async def analyze(self, y: np.ndarray, sr: int) -> Dict[str, dict]:
+        """Emotion measures, feature matrices and per-step timings for one clip"""
+        loop = asyncio.get_running_loop()
+        pool = self._ensure_pool()
+        future = pool.submit(voice_worker.compute_features, y, sr)
+        try:
+            with self.total_latency.time():
+                result = await asyncio.wait_for(asyncio.wrap_future(future, loop=loop), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            # A clip already running in a worker: stop sending clips to that pool
+            if not future.cancel():
+                self._restart_pool(pool)
+            raise
+
+        self.clips += 1
+        for name, ms in result["timings"].items():
+            self.feature_latency.setdefault(name, LatencyRecorder()).record(ms / 1000)
+        return result
+
+    def _restart_pool(self, pool: ProcessPoolExecutor):
+        """
+        Replace `pool` with a fresh one on the next clip. The worker still
+        running the timed-out clip keeps its CPU until the clip finishes,
+        then exits.
+        """
+        if pool is not self._pool:
+            return
+        self._pool = None
+        self.pool_restarts += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "clips": self.clips,
+            "timeouts": self.timeouts,
+            "pool_restarts": self.pool_restarts,
+            "latency": self.total_latency.snapshot(),
+            "features": {name: r.snapshot() for name, r in self.feature_latency.items()}
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+voice_feature_engine = VoiceFeatureEngine(
+    workers=settings.VOICE_FEATURE_WORKERS,
+    timeout=settings.VOICE_FEATURE_TIMEOUT_SECONDS,
+    max_jobs_per_worker=settings.VOICE_FEATURE_WORKER_MAX_JOBS
+)
+metrics_registry.register("voice_features", voice_feature_engine.stats)
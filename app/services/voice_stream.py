@@ -0,0 +1,176 @@
+from functools import lru_cache
+from typing import Dict, List, Optional
+import numpy as np
+from app.core.metrics import LatencyRecorder, metrics_registry
+from app.services.voice_worker import HOP_LENGTH, N_FFT
+
+STREAM_ENCODINGS = {"pcm16": "<i2", "f32": "<f4"}
+
+
+class StreamLimitError(Exception):
+    """A voice stream went over its duration or chunk size limit"""
+
+
+@lru_cache(maxsize=8)
+def _mel_basis(sample_rate: int) -> np.ndarray:
+    import librosa
+    return librosa.filters.mel(sr=sample_rate, n_fft=N_FFT).astype(np.float32)
+
+
+class VoiceStreamSession:
+    """
+    Incremental voice analysis for audio that arrives in chunks. Samples are
+    framed exactly as voice_worker.compute_features frames them (N_FFT window,
+    HOP_LENGTH hop) and each complete frame is folded into running sums for
+    RMS energy, zero-crossing rate and voiced pitch, plus one onset-strength
+    value for tempo. Only the unframed tail of the signal is kept, so memory
+    doesn't grow with the clip unless `keep_audio` holds the PCM for
+    transcription (which max_seconds bounds).
+    """
+    def __init__(
+        self,
+        sample_rate: int,
+        encoding: str = "pcm16",
+        max_seconds: float = 120.0,
+        max_chunk_bytes: int = 256 * 1024,
+        keep_audio: bool = True
+    ):
+        if encoding not in STREAM_ENCODINGS:
+            raise ValueError(f"Unknown stream encoding '{encoding}'")
+        self.sample_rate = sample_rate
+        self.dtype = np.dtype(STREAM_ENCODINGS[encoding])
+        self.max_samples = int(max_seconds * sample_rate)
+        self.max_chunk_bytes = max_chunk_bytes
+        self.keep_audio = keep_audio
+        self.samples = 0
+        self.frames = 0
+        self._pending = b""  # trailing bytes of a sample split across chunks
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._audio = bytearray()
+        self._rms_sum = 0.0
+        self._zcr_sum = 0.0
+        self._pitch_sum = 0.0
+        self._voiced = 0
+        self._last_mel: Optional[np.ndarray] = None
+        self._onsets: List[np.ndarray] = []
+
+    @property
+    def seconds(self) -> float:
+        return self.samples / self.sample_rate
+
+    def feed(self, chunk: bytes):
+        """Decode one chunk and fold every frame it completes into the sums"""
+        if len(chunk) > self.max_chunk_bytes:
+            raise StreamLimitError(f"Chunk of {len(chunk)} bytes exceeds {self.max_chunk_bytes}")
+        data = self._pending + chunk
+        usable = len(data) - len(data) % self.dtype.itemsize
+        self._pending = data[usable:]
+        samples = np.frombuffer(data[:usable], dtype=self.dtype)
+        if self.samples + samples.size > self.max_samples:
+            raise StreamLimitError(
+                f"Stream exceeds {self.max_samples / self.sample_rate:.0f} seconds"
+            )
+        self.samples += samples.size
+
+        if self.dtype.kind == "i":
+            y = samples.astype(np.float32) / 32768.0
+            if self.keep_audio:
+                self._audio.extend(data[:usable])
+        else:
+            y = samples.astype(np.float32)
+            if self.keep_audio:
+                self._audio.extend((np.clip(y, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+
+        buffer = np.concatenate([self._tail, y])
+        n_frames = 1 + (buffer.size - N_FFT) // HOP_LENGTH if buffer.size >= N_FFT else 0
+        if n_frames:
+            self._fold(buffer[:(n_frames - 1) * HOP_LENGTH + N_FFT])
+            buffer = buffer[n_frames * HOP_LENGTH:]
+        self._tail = buffer.copy()
+
+    def _fold(self, y: np.ndarray):
+        import librosa
+
+        S = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH, center=False))
+        rms = librosa.feature.rms(y=y, frame_length=N_FFT, hop_length=HOP_LENGTH, center=False)
+        zcr = librosa.feature.zero_crossing_rate(y, frame_length=N_FFT, hop_length=HOP_LENGTH, center=False)
+        pitches, _ = librosa.piptrack(S=S, sr=self.sample_rate, n_fft=N_FFT, hop_length=HOP_LENGTH)
+        voiced = pitches[pitches > 0]
+
+        # Onset strength as librosa computes it: mean positive change of the
+        # log-mel spectrum from the previous frame (carried across chunks)
+        mel = librosa.power_to_db(_mel_basis(self.sample_rate) @ S ** 2, top_db=None)
+        previous = mel[:, :1] if self._last_mel is None else self._last_mel
+        diff = np.diff(np.concatenate([previous, mel], axis=1), axis=1)
+        self._onsets.append(np.maximum(0.0, diff).mean(axis=0).astype(np.float32))
+        self._last_mel = mel[:, -1:]
+
+        self.frames += S.shape[1]
+        self._rms_sum += float(rms.sum())
+        self._zcr_sum += float(zcr.sum())
+        self._pitch_sum += float(voiced.sum())
+        self._voiced += voiced.size
+
+    def finish(self):
+        """Analyze what's left when the stream ends before filling one frame"""
+        if self.frames == 0 and self._tail.size:
+            self._fold(np.pad(self._tail, (0, N_FFT - self._tail.size)))
+        self._tail = np.zeros(0, dtype=np.float32)
+
+    def measures(self) -> Dict[str, float]:
+        """Energy, pitch (Hz), tempo (BPM) and zero-crossing rate so far"""
+        import librosa
+
+        tempo = 0.0
+        if self._onsets:
+            onsets = np.concatenate(self._onsets)
+            self._onsets = [onsets]
+            if onsets.size > 1:
+                tempo = float(librosa.feature.tempo(
+                    onset_envelope=onsets, sr=self.sample_rate, hop_length=HOP_LENGTH
+                )[0])
+        frames = max(self.frames, 1)
+        return {
+            "energy": self._rms_sum / frames,
+            "pitch": self._pitch_sum / self._voiced if self._voiced else 0.0,
+            "tempo": tempo,
+            "zero_crossing_rate": self._zcr_sum / frames
+        }
+
+    def audio(self) -> np.ndarray:
+        """The kept PCM as float32, for transcription"""
+        return np.frombuffer(bytes(self._audio), dtype="<i2").astype(np.float32) / 32768.0
+
+    def buffered_bytes(self) -> int:
+        onsets = sum(o.nbytes for o in self._onsets)
+        return self._tail.nbytes + len(self._audio) + len(self._pending) + onsets
+
+
+class VoiceStreamStats:
+    """Session counts, chunk processing time and end-of-stream emotion latency"""
+    def __init__(self):
+        self.started = 0
+        self.completed = 0
+        self.rejected = 0
+        self.active = 0
+        self.bytes = 0
+        self.peak_buffered_bytes = 0
+        self.chunk_latency = LatencyRecorder()
+        self.emotion_latency = LatencyRecorder()
+
+    def snapshot(self) -> dict:
+        return {
+            "started": self.started,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "active": self.active,
+            "bytes": self.bytes,
+            "peak_buffered_bytes": self.peak_buffered_bytes,
+            "chunk": self.chunk_latency.snapshot(),
+            "emotion_after_last_chunk": self.emotion_latency.snapshot()
+        }
+
+
+voice_stream_stats = VoiceStreamStats()
+metrics_registry.register("voice_stream", voice_stream_stats.snapshot)
+
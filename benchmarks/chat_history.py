@@ -0,0 +1,159 @@
+"""
+/chat/history query plans and latency at scale, before and after the
+history indexes (alembic 7b2d4e8c1f90).
+
+Seeds a separate `history_bench` schema in the configured PostgreSQL
+database (10M messages by default; one "heavy" user owns a large share),
+then runs EXPLAIN (ANALYZE, BUFFERS) for the old ORDER BY ... LIMIT query
+and for the keyset query (first page and a deep `before` page), without
+and with the indexes. The app's own tables are never touched.
+
+    python -m benchmarks.chat_history --messages 10000000
+    python -m benchmarks.chat_history --skip-seed --plans
+"""
+import argparse
+import asyncio
+import time
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.future import select
+from app.core.config import settings
+from app.crud.chat import conversation_crud
+from app.db.models.chat import Conversation, Message
+
+SCHEMA = "history_bench"
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_messages_conversation_id_created_at_id "
+    "ON messages (conversation_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_conversations_user_id_ended_at "
+    "ON conversations (user_id, ended_at)"
+]
+DROP_INDEXES = [
+    "DROP INDEX IF EXISTS ix_messages_conversation_id_created_at_id",
+    "DROP INDEX IF EXISTS ix_conversations_user_id_ended_at"
+]
+
+
+async def _seed(conn, messages: int, users: int, per_user: int, heavy: int):
+    conversations = users * per_user
+    await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    await conn.execute(text(f"SET search_path TO {SCHEMA}"))
+    await conn.execute(text("""
+        CREATE TABLE conversations (
+            id integer PRIMARY KEY, user_id integer, started_at timestamptz,
+            ended_at timestamptz, summary varchar(500)
+        )"""))
+    await conn.execute(text("""
+        CREATE TABLE messages (
+            id integer PRIMARY KEY, conversation_id integer, content varchar(1000),
+            is_user boolean, sentiment_score double precision, created_at timestamptz,
+            heatmap_metadata json
+        )"""))
+    # The last conversation of every user is the active one
+    await conn.execute(text("""
+        INSERT INTO conversations (id, user_id, started_at, ended_at)
+        SELECT c, 1 + (c - 1) / :per_user,
+               timestamptz '2024-01-01' + c * interval '1 minute',
+               CASE WHEN c % :per_user = 0 THEN NULL
+                    ELSE timestamptz '2024-01-01' + c * interval '1 minute' END
+        FROM generate_series(1, :conversations) c
+    """), {"per_user": per_user, "conversations": conversations})
+    # The first `heavy` messages belong to user 1, the rest are scattered
+    await conn.execute(text("""
+        INSERT INTO messages (id, conversation_id, content, is_user, sentiment_score, created_at)
+        SELECT m,
+               CASE WHEN m <= :heavy THEN 1 + m % :per_user
+                    ELSE 1 + (m::bigint * 2654435761 % :conversations)::integer END,
+               'message ' || m, m % 2 = 0, 0.0,
+               timestamptz '2024-01-01' + m * interval '1 second'
+        FROM generate_series(1, :messages) m
+    """), {"heavy": heavy, "per_user": per_user, "conversations": conversations, "messages": messages})
+
+
+async def _explain(conn, stmt) -> tuple:
+    compiled = stmt.compile(dialect=conn.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {compiled}", params)
+    plan = [row[0] for row in result]
+    execution = next((line for line in plan if line.startswith("Execution Time")), "")
+    ms = float(execution.split(":")[1].split()[0]) if execution else float("nan")
+    return ms, plan
+
+
+def _legacy_statement(user_id: int, limit: int):
+    """The query /chat/history ran before keyset pagination"""
+    return (
+        select(Message)
+        .join(Conversation)
+        .where(Conversation.user_id == user_id)
+        .order_by(Message.created_at.desc())
+        .limit(limit)
+    )
+
+
+async def _run_queries(conn, users: dict, limit: int, show_plans: bool) -> list:
+    rows = []
+    for label, user_id in users.items():
+        # A cursor halfway through the user's history
+        middle = (await conn.execute(text("""
+            SELECT m.created_at, m.id FROM messages m JOIN conversations c ON c.id = m.conversation_id
+            WHERE c.user_id = :user_id ORDER BY m.created_at DESC, m.id DESC
+            OFFSET (SELECT count(*) / 2 FROM messages m2 JOIN conversations c2
+                    ON c2.id = m2.conversation_id WHERE c2.user_id = :user_id) LIMIT 1
+        """), {"user_id": user_id})).first()
+        queries = {
+            "legacy": _legacy_statement(user_id, limit),
+            "keyset first page": conversation_crud.history_statement(user_id, limit),
+        }
+        if middle is not None:
+            queries["keyset deep page"] = conversation_crud.history_statement(
+                user_id, limit, before=(middle.created_at, middle.id)
+            )
+        for name, stmt in queries.items():
+            await _explain(conn, stmt)  # warm the cache
+            ms, plan = await _explain(conn, stmt)
+            rows.append((label, name, ms))
+            if show_plans:
+                print(f"\n-- {label}: {name}")
+                print("\n".join(plan))
+    return rows
+
+
+async def main(args):
+    engine = create_async_engine(settings.DATABASE_URL)
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        if not args.skip_seed:
+            start = time.perf_counter()
+            await _seed(conn, args.messages, args.users, args.per_user, args.heavy)
+            print(f"seeded {args.messages:,} messages in {time.perf_counter() - start:.0f}s")
+        await conn.execute(text(f"SET search_path TO {SCHEMA}"))
+        users = {"heavy user": 1, "typical user": args.users // 2}
+
+        results = {}
+        for phase, statements in (("no indexes", DROP_INDEXES), ("indexes", INDEXES)):
+            for statement in statements:
+                await conn.execute(text(statement))
+            await conn.execute(text("ANALYZE conversations"))
+            await conn.execute(text("ANALYZE messages"))
+            if args.plans:
+                print(f"\n==== {phase} ====")
+            results[phase] = await _run_queries(conn, users, args.limit, args.plans)
+
+        print(f"\n{'user':>14} {'query':>18} {'no indexes (ms)':>16} {'indexes (ms)':>13}")
+        for before, after in zip(results["no indexes"], results["indexes"]):
+            print(f"{before[0]:>14} {before[1]:>18} {before[2]:>16.2f} {after[2]:>13.2f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--per-user", type=int, default=20, help="conversations per user")
+    parser.add_argument("--heavy", type=int, default=500_000, help="messages owned by user 1")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--plans", action="store_true", help="print every EXPLAIN plan")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,86 @@
+"""
+Heatmap pattern benchmark: the original per-object Python loops vs the
+vectorized 24x7 matrix in app.services.heatmap_analytics.
+
+The baseline reproduces the pre-aggregation HeatmapEngine._calculate_hourly_pattern
+and _calculate_weekly_pattern, which iterated over ORM objects.
+
+    python -m benchmarks.heatmap_analytics --sizes 1000 100000 1000000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import numpy as np
+from app.services.heatmap_analytics import engagement_matrix
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def loop_hourly_pattern(interactions: list) -> dict:
+    hours = [i.timestamp.hour for i in interactions]
+    if hours:
+        peak_hour = max(set(hours), key=hours.count)
+        return {"hour": peak_hour, "score": hours.count(peak_hour) / len(hours)}
+    return {}
+
+
+def loop_weekly_pattern(interactions: list) -> dict:
+    counts = {day: 0 for day in WEEKDAYS}
+    for i in interactions:
+        counts[WEEKDAYS[i.timestamp.weekday()]] += 1
+    total = max(1, len(interactions))
+    return {day: counts[day] / total for day in WEEKDAYS}
+
+
+def _generate(n: int, rng: np.random.Generator):
+    start = datetime(2026, 1, 1)
+    offsets = np.sort(rng.integers(0, 30 * 86400, n))
+    engagement = rng.random(n)
+    sentiment = rng.uniform(-1, 1, n)
+    timestamps = np.datetime64(start, "us") + offsets.astype("timedelta64[s]")
+
+    objects = [
+        SimpleNamespace(
+            timestamp=start + timedelta(seconds=int(o)),
+            engagement_score=float(e),
+            sentiment_score=float(s)
+        )
+        for o, e, s in zip(offsets, engagement, sentiment)
+    ]
+    columns = {"timestamps": timestamps, "engagement": engagement, "sentiment": sentiment}
+    return objects, columns
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes, repeat: int):
+    rng = np.random.default_rng(7)
+    print(f"{'n':>9} {'loops (ms)':>12} {'numpy (ms)':>12} {'speedup':>8}")
+    for n in sizes:
+        objects, columns = _generate(n, rng)
+        loops = _best_of(lambda: (loop_hourly_pattern(objects), loop_weekly_pattern(objects)), repeat)
+        vectorized = _best_of(lambda: engagement_matrix(columns), repeat)
+
+        # Same peak hour and weekday split as the loop version
+        matrix = engagement_matrix(columns)
+        assert matrix["peak_hour"]["hour"] == loop_hourly_pattern(objects)["hour"]
+        weekly = loop_weekly_pattern(objects)
+        assert all(abs(matrix["weekly_pattern"][d] - weekly[d]) < 1e-9 for d in WEEKDAYS)
+
+        print(f"{n:>9} {loops * 1000:>12.2f} {vectorized * 1000:>12.2f} {loops / vectorized:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
@@ -0,0 +1,65 @@
+"""
+QuantumDecisionEngine execution modes: per-call latency and selection equivalence.
+
+Runs seeded random candidate sets through the aer, statevector and analytic
+modes, checks that every mode picks the same candidate, and reports latency.
+
+    python -m benchmarks.quantum_modes --cases 200 --seed 7
+"""
+import argparse
+import random
+import time
+import numpy as np
+from app.services.quantum import EXECUTION_MODES, QuantumDecisionEngine
+
+WORDS = ["sense", "appreciate", "funny", "quantum", "message", "think", "sorry", "great",
+         "bad", "help", "carefully", "understand", "haha", "analysis", "matrix", "!"]
+
+
+def _random_case(rng: random.Random):
+    candidates = [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 14)))
+        for _ in range(rng.randint(2, 8))
+    ]
+    profile = {
+        "ideal_response_length": rng.choice([20, 50, 80]),
+        "empathy": rng.random(),
+        "humor": rng.random(),
+        "formality": rng.random()
+    }
+    context = {"current_sentiment": rng.uniform(-1, 1)}
+    return candidates, profile, context
+
+
+def main(cases: int, seed: int, shots: int):
+    rng = random.Random(seed)
+    engine = QuantumDecisionEngine(mode="analytic", seed=seed)
+    engine.shots = shots
+    scenarios = [_random_case(rng) for _ in range(cases)]
+
+    timings = {mode: [] for mode in EXECUTION_MODES}
+    mismatches = 0
+    for candidates, profile, context in scenarios:
+        picks = {}
+        for mode in EXECUTION_MODES:
+            start = time.perf_counter()
+            picks[mode] = engine.select_index(candidates, profile, context, mode=mode)
+            timings[mode].append(time.perf_counter() - start)
+        if len(set(picks.values())) != 1:
+            mismatches += 1
+            print("mismatch:", picks, candidates)
+
+    print(f"{cases} cases, {mismatches} selection mismatches")
+    print(f"{'mode':>12} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for mode, values in timings.items():
+        values = np.array(values) * 1000
+        print(f"{mode:>12} {np.percentile(values, 50):>10.3f} {np.percentile(values, 99):>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--shots", type=int, default=1024)
+    args = parser.parse_args()
+    main(args.cases, args.seed, args.shots)
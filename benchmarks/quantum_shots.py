@@ -0,0 +1,56 @@
+"""
+Adaptive shot allocation: shots spent, confidence and agreement per tier.
+
+Runs seeded random candidate sets through aer-mode decisions under each
+configured tier policy (plus a fixed-shot baseline) and compares every pick
+with the exact analytic selection.
+
+    python -m benchmarks.quantum_shots --cases 100 --seed 7
+"""
+import argparse
+import asyncio
+import random
+import time
+import numpy as np
+from app.services.quantum import QuantumDecisionEngine, quantum_engine
+from app.services.quantum_executor import quantum_executor
+from app.services.quantum_sampling import ShotPolicy
+from benchmarks.quantum_modes import _random_case
+
+
+async def main(cases: int, seed: int):
+    rng = random.Random(seed)
+    scenarios = [_random_case(rng) for _ in range(cases)]
+    policies = dict(quantum_engine.tier_policies)
+    policies["fixed"] = ShotPolicy(
+        initial_shots=quantum_engine.shots, max_shots=quantum_engine.shots,
+        confidence=0.95, adaptive=False
+    )
+    engine = QuantumDecisionEngine(mode="aer", seed=seed, tier_policies=policies)
+    await quantum_executor.start()
+
+    print(f"{'tier':>10} {'mean shots':>11} {'early stop':>11} {'min conf':>9} "
+          f"{'p50 (ms)':>9} {'p99 (ms)':>9} {'mismatches':>11}")
+    for tier in policies:
+        shots, confidences, timings, stopped, mismatches = [], [], [], 0, 0
+        for candidates, profile, context in scenarios:
+            expected = engine.select_index(candidates, profile, context, mode="analytic")
+            start = time.perf_counter()
+            decision = await engine.decide(candidates, profile, context, tier=tier)
+            timings.append((time.perf_counter() - start) * 1000)
+            shots.append(decision.shots)
+            confidences.append(decision.confidence)
+            stopped += decision.stopped_early
+            mismatches += decision.index != expected
+        print(f"{tier:>10} {np.mean(shots):>11.1f} {stopped / cases:>11.2%} "
+              f"{min(confidences):>9.4f} {np.percentile(timings, 50):>9.2f} "
+              f"{np.percentile(timings, 99):>9.2f} {mismatches:>11}")
+    quantum_executor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(main(args.cases, args.seed))
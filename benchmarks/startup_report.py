@@ -0,0 +1,107 @@
+"""
+Cold-start report: import time and RSS of the app and of each subsystem.
+
+Every measurement runs in a fresh interpreter so nothing is already
+imported. "app" is `import app.main` with lazy subsystems; each subsystem
+row is the extra cost of loading it on top of that. The package table
+attributes the app import time to top-level packages (from -X importtime).
+
+    python -m benchmarks.startup_report
+    python -m benchmarks.startup_report --json > startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+TARGETS = ["app", "quantum", "voice", "sentiment"]
+
+
+def _child(target: str):
+    """Measure one target inside this (fresh) interpreter and print JSON"""
+    from app.core.subsystems import current_rss
+
+    result = {"target": target}
+    try:
+        rss = current_rss()
+        start = time.perf_counter()
+        import app.main  # noqa: F401
+        if target != "app":
+            rss = current_rss()
+            start = time.perf_counter()
+            if target == "sentiment":
+                import asyncio
+                from app.services.sentiment import sentiment_engine
+                asyncio.run(sentiment_engine.warm())
+                result["backend"] = sentiment_engine.backend
+            else:
+                from app.core.subsystems import SUBSYSTEMS
+                SUBSYSTEMS[target].load()
+        result["seconds"] = round(time.perf_counter() - start, 4)
+        result["rss_mb"] = round((current_rss() - rss) / 2 ** 20, 2)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    print(json.dumps(result))
+
+
+def _measure(target: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-m", "benchmarks.startup_report", "--child", target],
+        capture_output=True, text=True, cwd=os.getcwd()
+    )
+    lines = output.stdout.strip().splitlines()
+    if output.returncode != 0 or not lines:
+        return {"target": target, "error": output.stderr.strip().splitlines()[-1:]}
+    return json.loads(lines[-1])
+
+
+def _package_breakdown(top: int) -> list:
+    """Self import time of `import app.main` summed per top-level package"""
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, cwd=os.getcwd()
+    )
+    totals = defaultdict(int)
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        totals[name.split(".")[0]] += int(self_us)
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{"package": name, "ms": round(us / 1000, 1)} for name, us in ranked]
+
+
+def main(targets, top: int, as_json: bool):
+    report = {
+        "subsystems": [_measure(target) for target in targets],
+        "packages": _package_breakdown(top)
+    }
+    if as_json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'target':>10} {'seconds':>9} {'rss (MB)':>9}  note")
+    for row in report["subsystems"]:
+        if "error" in row:
+            print(f"{row['target']:>10} {'-':>9} {'-':>9}  {row['error']}")
+        else:
+            print(f"{row['target']:>10} {row['seconds']:>9.3f} {row['rss_mb']:>9.1f}  {row.get('backend', '')}")
+    print(f"\nimport app.main by package (self time):")
+    for row in report["packages"]:
+        print(f"{row['package']:>24} {row['ms']:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--child")
+    parser.add_argument("--targets", nargs="+", default=TARGETS)
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child)
+    else:
+        main(args.targets, args.top, args.json)
@@ -0,0 +1,89 @@
+"""
+Voice upload decoding: old temp-file pipeline vs single in-memory decode.
+
+The old VoiceProcessor wrote the upload to disk, then librosa.load-ed it
+twice (emotion, features) and read it again through AudioFile for STT.
+The new one decodes the bytes once into a float32 buffer that every stage
+shares. Uploads are synthesized 44.1 kHz stereo WAV, so both paths resample.
+
+    python -m benchmarks.voice_decode --seconds 5 --runs 20
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+import wave
+import numpy as np
+import librosa
+from speech_recognition import AudioFile, Recognizer
+from app.services.audio_decode import decode_audio, to_pcm16
+
+SAMPLE_RATE = 16000
+
+
+def _synth_wav(seconds: float, rate: int = 44100) -> bytes:
+    t = np.arange(int(seconds * rate)) / rate
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * np.random.default_rng(0).standard_normal(len(t))
+    frames = (np.stack([tone, tone], axis=1) * 32767).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(frames.tobytes())
+    return buffer.getvalue()
+
+
+def _legacy(audio_bytes: bytes, directory: str) -> int:
+    """The old per-request steps; returns bytes moved through the filesystem"""
+    path = os.path.join(directory, "temp_audio_1.wav")
+    with open(path, "wb") as f:
+        f.write(audio_bytes)
+    io_bytes = len(audio_bytes)
+    with AudioFile(path) as source:
+        Recognizer().record(source)
+    librosa.load(path, sr=SAMPLE_RATE)  # _analyze_emotion
+    librosa.load(path, sr=SAMPLE_RATE)  # _extract_features
+    io_bytes += 3 * len(audio_bytes)
+    os.remove(path)
+    return io_bytes
+
+
+def _in_memory(audio_bytes: bytes) -> int:
+    y = decode_audio(audio_bytes, "wav", SAMPLE_RATE)
+    to_pcm16(y)
+    return 0
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main(seconds: float, runs: int):
+    audio_bytes = _synth_wav(seconds)
+    # Warm up resampler and file caches before timing
+    _in_memory(audio_bytes)
+    with tempfile.TemporaryDirectory() as directory:
+        _legacy(audio_bytes, directory)
+        legacy = [_timed(_legacy, audio_bytes, directory) for _ in range(runs)]
+    current = [_timed(_in_memory, audio_bytes) for _ in range(runs)]
+
+    print(f"{seconds:.1f} s upload ({len(audio_bytes) / 1024:.0f} KiB), {runs} runs")
+    print(f"{'pipeline':>10} {'p50 (ms)':>9} {'p99 (ms)':>9} {'disk I/O (KiB)':>15}")
+    for name, rows in (("temp-file", legacy), ("in-memory", current)):
+        times = np.array([ms for _, ms in rows])
+        print(f"{name:>10} {np.percentile(times, 50):>9.2f} {np.percentile(times, 99):>9.2f} "
+              f"{rows[0][0] / 1024:>15.0f}")
+    saved = np.median([ms for _, ms in legacy]) - np.median([ms for _, ms in current])
+    print(f"saved per request: {saved:.2f} ms, {legacy[0][0] / 1024:.0f} KiB of disk I/O")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    main(args.seconds, args.runs)
@@ -0,0 +1,56 @@
+"""
+Voice analysis response size and JSON serialization time per features mode.
+
+    python -m benchmarks.voice_encoding --seconds 30
+"""
+import argparse
+import time
+import numpy as np
+from app.schemas.voice import VoiceAnalysisResult, VoiceResponse
+from app.services.voice_encoding import FEATURE_MODES, encode_features
+from app.services.voice_worker import compute_features
+
+SAMPLE_RATE = 16000
+
+
+def _serialize(features, mode: str, dtype: str, runs: int):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        body = VoiceResponse(
+            text_response="ok",
+            emotion_adapted=True,
+            voice_analysis=VoiceAnalysisResult(
+                text="hello",
+                emotion={"arousal": 0.5, "valence": 0.5, "dominance": 0.5},
+                features_mode=mode,
+                voice_features=encode_features(features, mode, dtype)
+            )
+        ).model_dump_json()
+        best = min(best, time.perf_counter() - start)
+    return len(body), best
+
+
+def main(seconds: float, runs: int):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    y = (0.3 * np.sin(2 * np.pi * 220 * t * (1 + 0.1 * np.sin(t)))).astype(np.float32)
+    y += np.random.default_rng(0).standard_normal(y.size).astype(np.float32) * 0.01
+    features = compute_features(y, SAMPLE_RATE)["features"]
+    frames = features["mfcc"].shape[1]
+    print(f"{seconds:.0f}s clip, {frames} frames\n")
+
+    print(f"{'mode':>20} {'bytes':>10} {'encode+serialize (ms)':>22}")
+    for mode in FEATURE_MODES:
+        dtypes = ["float32", "float16"] if mode == "full-binary" else ["float32"]
+        for dtype in dtypes:
+            size, best = _serialize(features, mode, dtype, runs)
+            label = f"{mode} ({dtype})" if mode == "full-binary" else mode
+            print(f"{label:>20} {size:>10} {best * 1000:>22.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.seconds, args.runs)
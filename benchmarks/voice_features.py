@@ -0,0 +1,92 @@
+"""
+Voice feature extraction: per-feature transforms vs one shared STFT, and
+event-loop stalls with inline extraction vs the worker pool.
+
+    python -m benchmarks.voice_features --seconds 5 --runs 10
+"""
+import argparse
+import asyncio
+import time
+import numpy as np
+import librosa
+from app.services.audio_decode import decode_audio
+from app.services.voice_features import VoiceFeatureEngine
+from app.services.voice_worker import compute_features
+from benchmarks.voice_decode import _synth_wav
+
+SAMPLE_RATE = 16000
+
+
+def _separate(y: np.ndarray, sr: int):
+    """The old extraction: every call computes its own transform"""
+    pitches, _ = librosa.piptrack(y=y, sr=sr)
+    librosa.feature.tempo(y=y, sr=sr)
+    librosa.feature.rms(y=y)
+    librosa.feature.mfcc(y=y, sr=sr)
+    librosa.feature.spectral_centroid(y=y, sr=sr)
+    librosa.feature.zero_crossing_rate(y)
+
+
+async def _max_loop_stall(work) -> float:
+    """Longest gap (ms) a 1 ms ticker sees while `work` runs"""
+    stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal stall
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stall = max(stall, (now - last) * 1000)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    await work()
+    done = True
+    await task
+    return stall
+
+
+async def main(seconds: float, runs: int):
+    y = decode_audio(_synth_wav(seconds), "wav", SAMPLE_RATE)
+    _separate(y, SAMPLE_RATE)
+    compute_features(y, SAMPLE_RATE)
+
+    timings = {"separate": [], "shared": []}
+    steps = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        _separate(y, SAMPLE_RATE)
+        timings["separate"].append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        result = compute_features(y, SAMPLE_RATE)
+        timings["shared"].append((time.perf_counter() - start) * 1000)
+        for name, ms in result["timings"].items():
+            steps.setdefault(name, []).append(ms)
+
+    print(f"{seconds:.1f} s clip, {runs} runs")
+    for name, values in timings.items():
+        print(f"{name:>10} p50 {np.percentile(values, 50):8.2f} ms")
+    print("shared-STFT steps (p50 ms):")
+    for name, values in steps.items():
+        print(f"{name:>20} {np.percentile(values, 50):8.2f}")
+
+    async def inline():
+        compute_features(y, SAMPLE_RATE)
+
+    engine = VoiceFeatureEngine(workers=1, timeout=60, max_jobs_per_worker=1000)
+    await engine.start()
+    inline_stall = await _max_loop_stall(inline)
+    pooled_stall = await _max_loop_stall(lambda: engine.analyze(y, SAMPLE_RATE))
+    engine.shutdown()
+    print(f"max event-loop stall: inline {inline_stall:.1f} ms, worker pool {pooled_stall:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds, args.runs))
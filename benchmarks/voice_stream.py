@@ -0,0 +1,55 @@
+"""
+Streaming voice analysis vs whole-clip analysis: time from the last chunk
+to the emotion measures, and audio buffered per session, by clip length.
+
+    python -m benchmarks.voice_stream --seconds 10 60 300 --chunk-ms 250
+"""
+import argparse
+import time
+import numpy as np
+from app.services.voice_stream import VoiceStreamSession
+from app.services.voice_worker import compute_features
+
+SAMPLE_RATE = 16000
+
+
+def _synth(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    y = 0.3 * np.sin(2 * np.pi * (180 + 40 * np.sin(t)) * t) * (np.sin(2 * np.pi * 2 * t) > 0)
+    y += np.random.default_rng(0).standard_normal(t.size) * 0.01
+    return y.astype(np.float32)
+
+
+def main(lengths, chunk_ms: int):
+    compute_features(_synth(1), SAMPLE_RATE)  # import and warm librosa
+    chunk_bytes = int(SAMPLE_RATE * chunk_ms / 1000) * 2
+    print(f"{'clip (s)':>9} {'batch (ms)':>11} {'stream tail (ms)':>17} "
+          f"{'batch audio (KB)':>17} {'stream peak (KB)':>17} {'energy diff':>12}")
+    for seconds in lengths:
+        y = _synth(seconds)
+        start = time.perf_counter()
+        batch = compute_features(y, SAMPLE_RATE)["measures"]
+        batch_ms = (time.perf_counter() - start) * 1000
+
+        pcm = (y * 32767).astype("<i2").tobytes()
+        session = VoiceStreamSession(SAMPLE_RATE, max_seconds=seconds + 1, keep_audio=False)
+        peak = 0
+        for i in range(0, len(pcm), chunk_bytes):
+            session.feed(pcm[i:i + chunk_bytes])
+            peak = max(peak, session.buffered_bytes())
+        start = time.perf_counter()
+        session.finish()
+        stream = session.measures()
+        tail_ms = (time.perf_counter() - start) * 1000
+
+        diff = abs(stream["energy"] - batch["energy"]) / max(batch["energy"], 1e-9)
+        print(f"{seconds:>9.0f} {batch_ms:>11.1f} {tail_ms:>17.1f} "
+              f"{y.nbytes / 1024:>17.0f} {peak / 1024:>17.1f} {diff:>11.2%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, nargs="+", default=[10, 60, 300])
+    parser.add_argument("--chunk-ms", type=int, default=250)
+    args = parser.parse_args()
+    main(args.seconds, args.chunk_ms)
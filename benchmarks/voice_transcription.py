@@ -0,0 +1,61 @@
+"""
+Transcription off the event loop and alongside emotion analysis.
+
+The stub backend's delay stands in for a recognizer round trip, so the
+numbers don't depend on network access or installed speech models.
+
+    python -m benchmarks.voice_transcription --seconds 5 --delay 0.4 --runs 5
+"""
+import argparse
+import asyncio
+import time
+import numpy as np
+from app.services.audio_decode import decode_audio
+from app.services.transcription import StubTranscriber, TranscriptionService
+from app.services.voice_features import VoiceFeatureEngine
+from benchmarks.voice_decode import _synth_wav
+from benchmarks.voice_features import _max_loop_stall
+
+SAMPLE_RATE = 16000
+
+
+async def main(seconds: float, delay: float, runs: int):
+    y = decode_audio(_synth_wav(seconds), "wav", SAMPLE_RATE)
+    stub = StubTranscriber(delay=delay)
+    service = TranscriptionService([stub], workers=4, max_queue=16, timeout=30)
+    engine = VoiceFeatureEngine(workers=1, timeout=60, max_jobs_per_worker=1000)
+    await engine.start()
+
+    async def blocking():
+        # The old path: the recognizer call ran on the event loop, then analysis
+        stub.transcribe(None)
+        await engine.analyze(y, SAMPLE_RATE)
+
+    async def serial():
+        await service.transcribe(y, SAMPLE_RATE)
+        await engine.analyze(y, SAMPLE_RATE)
+
+    async def concurrent():
+        await asyncio.gather(service.transcribe(y, SAMPLE_RATE), engine.analyze(y, SAMPLE_RATE))
+
+    print(f"{seconds:.1f} s clip, transcription delay {delay * 1000:.0f} ms, {runs} runs")
+    print(f"{'path':>12} {'p50 (ms)':>10} {'max loop stall (ms)':>20}")
+    for name, work in (("blocking", blocking), ("serial", serial), ("concurrent", concurrent)):
+        latencies, stalls = [], []
+        for _ in range(runs):
+            start = time.perf_counter()
+            stalls.append(await _max_loop_stall(work))
+            latencies.append((time.perf_counter() - start) * 1000)
+        print(f"{name:>12} {np.percentile(latencies, 50):>10.1f} {max(stalls):>20.1f}")
+
+    engine.shutdown()
+    service.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--delay", type=float, default=0.4)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds, args.delay, args.runs))
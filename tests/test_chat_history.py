@@ -0,0 +1,29 @@
+from datetime import datetime, timezone, timedelta
+import pytest
+from fastapi import HTTPException
+from app.api.endpoints.chat import _parse_cursor
+
+
+def test_missing_cursor():
+    assert _parse_cursor(None, "before") is None
+
+
+def test_message_id():
+    assert _parse_cursor("12345", "before") == 12345
+
+
+def test_naive_timestamp_is_utc():
+    assert _parse_cursor("2024-05-01T10:30:00", "after") == datetime(2024, 5, 1, 10, 30, tzinfo=timezone.utc)
+
+
+def test_timestamp_keeps_its_offset():
+    moment = _parse_cursor("2024-05-01T10:30:00+02:00", "before")
+    assert moment.utcoffset() == timedelta(hours=2)
+
+
+@pytest.mark.parametrize("value", ["", "-5", "yesterday", "2024-13-01", "12.5"])
+def test_invalid_values_are_rejected(value):
+    with pytest.raises(HTTPException) as error:
+        _parse_cursor(value, "before")
+    assert error.value.status_code == 400
+    assert "before" in error.value.detail
@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.endpoints.quantum import _etag_matches, router
+from app.core.subsystems import circuit_renderer
+from app.services.auth import get_current_user
+from app.services.circuit_render import CircuitRenderer
+from app.services.quantum_errors import RenderBudgetExceededError
+from app.services.user_cache import CurrentUser
+
+ETAG = '"abc123"'
+
+
+@pytest.mark.parametrize("header,matches", [
+    (None, False),
+    ("", False),
+    ('"abc123"', True),
+    ('W/"abc123"', True),
+    ('"other", "abc123"', True),
+    ('"other"', False),
+    ("*", True)
+])
+def test_etag_matches(header, matches):
+    assert _etag_matches(header, ETAG) is matches
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router, prefix="/quantum")
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(
+        1, "ada", "ada@example.com", True, "premium", True, False, {}, {}
+    )
+    return TestClient(app)
+
+
+def test_repeat_request_with_the_etag_gets_a_304(client):
+    first = client.get("/quantum/visualize-circuit", params={"circuit": "ghz", "qubits": 4})
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and "max-age" in first.headers["cache-control"]
+
+    again = client.get("/quantum/visualize-circuit", params={"circuit": "ghz", "qubits": 4})
+    assert again.headers["etag"] == etag and again.content == first.content
+
+    revalidated = client.get(
+        "/quantum/visualize-circuit",
+        params={"circuit": "ghz", "qubits": 4},
+        headers={"If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.content == b"" and revalidated.headers["etag"] == etag
+
+    other = client.get(
+        "/quantum/visualize-circuit",
+        params={"circuit": "ghz", "qubits": 3},
+        headers={"If-None-Match": etag}
+    )
+    assert other.status_code == 200 and other.headers["etag"] != etag
+
+
+def test_too_many_marked_states_is_a_400(client):
+    renderer = asyncio.run(circuit_renderer.aload())
+    marked = ",".join(str(m) for m in range(renderer.max_marked + 1))
+    response = client.get(
+        "/quantum/visualize-circuit",
+        params={"circuit": "grover", "qubits": 4, "marked": marked}
+    )
+    assert response.status_code == 400
+
+
+def test_uncached_renders_are_limited_by_the_budget():
+    renderer = CircuitRenderer(cache_size=8, max_qubits=8, max_marked=4, renders_per_minute=2)
+
+    async def main():
+        for qubits in (2, 3):
+            await renderer.render(renderer.build("ghz", qubits), "text")
+        # Cached diagrams are still served once the budget is spent
+        await renderer.render(renderer.build("ghz", 2), "text")
+        with pytest.raises(RenderBudgetExceededError) as exc:
+            await renderer.render(renderer.build("ghz", 4), "text")
+        return exc.value
+
+    error = asyncio.run(main())
+    renderer.shutdown()
+    assert error.retry_after >= 1
+    assert renderer.over_budget == 1
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+import numpy as np
+from app.services.downsampling import downsample_series, lttb_indices
+
+
+def test_keeps_endpoints_and_returns_threshold_sorted_indices():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 30)
+    keep = lttb_indices(x, y, 50)
+    assert len(keep) == 50
+    assert keep[0] == 0 and keep[-1] == 999
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_keeps_spikes():
+    x = np.arange(500, dtype=float)
+    y = np.zeros(500)
+    y[123] = 10.0
+    y[377] = -10.0
+    keep = lttb_indices(x, y, 20)
+    assert 123 in keep and 377 in keep
+
+
+def test_short_series_and_tiny_thresholds_are_returned_whole():
+    x = np.arange(10, dtype=float)
+    assert np.array_equal(lttb_indices(x, x, 10), np.arange(10))
+    assert np.array_equal(lttb_indices(x, x, 2), np.arange(10))
+
+
+def test_nan_values_do_not_break_selection():
+    x = np.arange(100, dtype=float)
+    y = np.where(x % 7 == 0, np.nan, x)
+    assert len(lttb_indices(x, y, 10)) == 10
+
+
+def test_downsample_series_applies_the_same_indices_to_every_column():
+    start = datetime(2024, 1, 1)
+    series = {
+        "timestamps": [start + timedelta(minutes=i) for i in range(300)],
+        "engagement": [float(i % 17) for i in range(300)],
+        "sentiment": [None if i % 5 else 0.5 for i in range(300)]
+    }
+    small = downsample_series(series, 30)
+    assert all(len(values) == 30 for values in small.values())
+    index = [series["timestamps"].index(t) for t in small["timestamps"]]
+    assert small["engagement"] == [series["engagement"][i] for i in index]
+    assert small["sentiment"] == [series["sentiment"][i] for i in index]
+    assert downsample_series(series, 500) is series
@@ -0,0 +1,68 @@
+import asyncio
+from app.services.heatmap_ingest import WriteBehindQueue
+
+
+def test_rows_are_flushed_in_batches_of_batch_size():
+    batches = []
+
+    async def flush(rows):
+        batches.append([row["i"] for row in rows])
+
+    async def main():
+        queue = WriteBehindQueue(flush, batch_size=4, flush_interval=1.0, max_pending=100)
+        for i in range(10):
+            await queue.put({"i": i})
+        await queue.drain()
+        return queue
+
+    queue = asyncio.run(main())
+    assert [len(b) for b in batches[:2]] == [4, 4]
+    assert [i for b in batches for i in b] == list(range(10))
+    assert queue.flushed == 10 and queue.batches == len(batches)
+    assert queue.pending == 0
+
+
+def test_partial_batch_is_flushed_after_the_interval():
+    batches = []
+
+    async def flush(rows):
+        batches.append(len(rows))
+
+    async def main():
+        queue = WriteBehindQueue(flush, batch_size=100, flush_interval=0.02, max_pending=100)
+        await queue.put({})
+        await queue.put({})
+        await asyncio.sleep(0.1)
+        flushed_before_drain = list(batches)
+        await queue.drain()
+        return flushed_before_drain
+
+    assert asyncio.run(main()) == [2]
+
+
+def test_failed_flush_is_counted_and_the_worker_keeps_going():
+    calls = []
+
+    async def flush(rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise RuntimeError("database down")
+
+    async def main():
+        queue = WriteBehindQueue(flush, batch_size=2, flush_interval=1.0, max_pending=100)
+        for i in range(4):
+            await queue.put({"i": i})
+        await queue.drain()
+        return queue
+
+    queue = asyncio.run(main())
+    assert queue.failed == 2
+    assert queue.flushed == 2
+
+
+def test_drain_without_rows_is_a_no_op():
+    async def flush(rows):
+        raise AssertionError("nothing to flush")
+
+    queue = WriteBehindQueue(flush, batch_size=2, flush_interval=1.0, max_pending=10)
+    asyncio.run(queue.drain())
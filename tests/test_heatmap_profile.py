@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from app.db.models.heatmap import UserHeatmapProfile
+from app.services.heatmap import ProfileAggregates
+
+NOW = datetime(2024, 6, 30, 12, 0)
+
+
+def _interactions(days: int, per_day: int):
+    rng = np.random.default_rng(3)
+    for day in range(days):
+        for i in range(per_day):
+            moment = NOW - timedelta(days=day, hours=int(rng.integers(0, 12)), minutes=i)
+            yield moment, float(rng.uniform(-1, 1)), float(rng.uniform(0.1, 3)), float(rng.uniform(0, 1))
+
+
+def _aggregates(interactions) -> ProfileAggregates:
+    aggregates = ProfileAggregates(UserHeatmapProfile())
+    for moment, sentiment, response_time, engagement in interactions:
+        aggregates.add(moment, sentiment, response_time, engagement)
+    return aggregates
+
+
+def test_totals_match_the_interactions():
+    interactions = list(_interactions(10, 5))
+    aggregates = _aggregates(interactions)
+    assert aggregates.count == 50
+    assert aggregates.sentiment_sum == pytest.approx(sum(i[1] for i in interactions))
+    assert sum(aggregates.hour_counts) == 50
+    assert sum(aggregates.weekday_counts) == 50
+
+
+def test_expire_subtracts_buckets_outside_the_window():
+    interactions = list(_interactions(40, 3))
+    aggregates = _aggregates(interactions)
+    aggregates.expire(NOW)
+
+    cutoff = (NOW - timedelta(days=29)).date()
+    kept = [i for i in interactions if i[0].date() >= cutoff]
+    assert aggregates.count == len(kept)
+    assert aggregates.response_time_sum == pytest.approx(sum(i[2] for i in kept))
+    assert sum(aggregates.hour_counts) == len(kept)
+    assert min(aggregates.buckets) >= cutoff.isoformat()
+
+
+def test_trend_matches_a_least_squares_fit():
+    interactions = list(_interactions(7, 20))
+    aggregates = _aggregates(interactions)
+    x = np.array([(m - datetime(2024, 1, 1)).total_seconds() / 86400 for m, *_ in interactions])
+    y = np.array([i[3] for i in interactions])
+    assert aggregates.trend(NOW) == pytest.approx(np.polyfit(x, y, 1)[0], rel=1e-6)
+
+
+def test_buckets_round_trip_through_the_profile():
+    profile = UserHeatmapProfile()
+    aggregates = _aggregates(_interactions(5, 4))
+    aggregates.apply_to(profile, hourly={}, weekly={}, now=NOW)
+
+    reloaded = ProfileAggregates(profile)
+    reloaded.add(NOW, 0.5, 1.0, 0.5)
+    assert reloaded.count == 21
+    # The loaded bucket was copied before the write, not changed in place
+    assert profile.window_buckets[NOW.date().isoformat()]["n"] == reloaded.buckets[NOW.date().isoformat()]["n"] - 1
+    assert profile.avg_sentiment == pytest.approx(aggregates.sentiment_sum / 20)
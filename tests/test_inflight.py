@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from app.services.inflight import InFlight
+
+
+def test_concurrent_calls_share_one_computation():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def main():
+        in_flight = InFlight()
+        results = await asyncio.gather(*(in_flight.run("k", compute) for _ in range(5)))
+        return in_flight, results
+
+    in_flight, results = asyncio.run(main())
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+    assert in_flight.shared == 4 and len(in_flight) == 0
+
+
+def test_errors_reach_every_caller():
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise ValueError("bad audio")
+
+    async def main():
+        in_flight = InFlight()
+        return await asyncio.gather(
+            *(in_flight.run("k", compute) for _ in range(3)), return_exceptions=True
+        )
+
+    assert all(isinstance(r, ValueError) for r in asyncio.run(main()))
+
+
+def test_cancelling_the_owner_hands_the_work_to_a_waiter():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return len(calls)
+
+    async def main():
+        in_flight = InFlight()
+        owner = asyncio.create_task(in_flight.run("k", compute))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(in_flight.run("k", compute)) for _ in range(3)]
+        await asyncio.sleep(0.005)
+        owner.cancel()
+        results = await asyncio.gather(*waiters)
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return results
+
+    # One waiter recomputes; the others share its result
+    assert asyncio.run(main()) == [2, 2, 2]
+    assert len(calls) == 2
+
+
+def test_cancelled_waiter_leaves_the_owner_running():
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        in_flight = InFlight()
+        owner = asyncio.create_task(in_flight.run("k", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(in_flight.run("k", compute))
+        await asyncio.sleep(0.005)
+        waiter.cancel()
+        return await owner
+
+    assert asyncio.run(main()) == "done"
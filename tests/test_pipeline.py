@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+from app.services.pipeline import StageGraph
+
+
+def _graph(name: str) -> StageGraph:
+    return StageGraph(f"test.{name}")
+
+
+def test_independent_stages_overlap_and_dependents_see_results():
+    graph = _graph("overlap")
+    order = []
+
+    @graph.stage("a")
+    async def a(ctx):
+        order.append("a started")
+        await asyncio.sleep(0.01)
+        order.append("a")
+        return ctx["x"] + 1
+
+    @graph.stage("b")
+    async def b(ctx):
+        order.append("b started")
+        await asyncio.sleep(0.01)
+        order.append("b")
+        return ctx["x"] * 10
+
+    @graph.stage("c", depends_on=["a", "b"])
+    async def c(ctx):
+        order.append("c")
+        return ctx["a"] + ctx["b"]
+
+    run = asyncio.run(graph.run(x=2))
+    assert run["c"] == 23
+    # a and b ran concurrently rather than back to back
+    assert order[:2] == ["a started", "b started"]
+    assert order[-1] == "c"
+    assert set(run.timings) == {"a", "b", "c"}
+    assert "a;dur=" in run.server_timing()
+
+
+def test_timeout_and_error_use_the_fallback():
+    graph = _graph("fallback")
+
+    @graph.stage("slow", timeout=0.01, fallback="late")
+    async def slow(ctx):
+        await asyncio.sleep(1)
+
+    @graph.stage("broken", fallback=0.0)
+    async def broken(ctx):
+        raise RuntimeError("boom")
+
+    run = asyncio.run(graph.run())
+    assert run["slow"] == "late"
+    assert run["broken"] == 0.0
+    assert run.fallbacks["slow"] == "timeout"
+    assert "boom" in run.fallbacks["broken"]
+    assert graph.stats()["slow"]["fallbacks"] == 1
+
+
+def test_error_without_fallback_propagates_and_cancels_other_stages():
+    graph = _graph("propagate")
+    cancelled = []
+
+    @graph.stage("fails")
+    async def fails(ctx):
+        raise ValueError("bad input")
+
+    @graph.stage("waits")
+    async def waits(ctx):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            # Cleanup that itself awaits must be done before run() raises
+            await asyncio.sleep(0.01)
+            cancelled.append(True)
+            raise
+
+    async def main():
+        with pytest.raises(ValueError):
+            await graph.run()
+        return list(cancelled)
+
+    assert asyncio.run(main()) == [True]
+
+
+def test_errors_outside_fallback_on_propagate():
+    graph = _graph("fallback_on")
+
+    @graph.stage("read", timeout=0.01, fallback=[], fallback_on=(asyncio.TimeoutError,))
+    async def read(ctx):
+        if ctx["fail"]:
+            raise ConnectionError("database is down")
+        await asyncio.sleep(1)
+
+    assert asyncio.run(graph.run(fail=False))["read"] == []
+    with pytest.raises(ConnectionError):
+        asyncio.run(graph.run(fail=True))
+
+
+def test_unknown_dependency_is_rejected():
+    graph = _graph("unknown")
+    with pytest.raises(ValueError):
+        @graph.stage("b", depends_on=["a"])
+        async def b(ctx):
+            return None
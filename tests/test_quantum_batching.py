@@ -0,0 +1,121 @@
+import asyncio
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from qiskit import QuantumCircuit
+from app.services.quantum_batching import QuantumBatchScheduler
+from app.services.quantum_errors import QuantumExecutionError, QuantumOverloadedError
+from app.services.quantum_executor import QuantumExecutionService
+
+
+class _Security:
+    def validate_circuit(self, circuit):
+        pass
+
+
+class _BlockingExecutor:
+    """Holds every job until released and tracks how many run at once"""
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.security = _Security()
+        self.release = asyncio.Event()
+        self.running = 0
+        self.peak = 0
+        self.started = asyncio.Event()
+
+    async def run_batch(self, circuits, shots, seed):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        if self.running == self.workers:
+            self.started.set()
+        try:
+            await self.release.wait()
+        finally:
+            self.running -= 1
+        return [{"0": shots}] * len(circuits)
+
+
+def _circuit() -> QuantumCircuit:
+    circuit = QuantumCircuit(1, 1)
+    circuit.measure(0, 0)
+    return circuit
+
+
+def test_jobs_run_concurrently_up_to_the_worker_count():
+    async def main():
+        executor = _BlockingExecutor(workers=2)
+        scheduler = QuantumBatchScheduler(executor, max_batch_size=1, max_wait=0.0, max_queued=8)
+        submits = [asyncio.ensure_future(scheduler.submit(_circuit(), 16)) for _ in range(4)]
+        await asyncio.wait_for(executor.started.wait(), 1.0)
+        await asyncio.sleep(0.01)
+        # Both workers busy; the other two circuits wait in the queue
+        assert executor.running == 2 and scheduler.stats()["queue_depth"] == 2
+
+        executor.release.set()
+        results = await asyncio.gather(*submits)
+        scheduler.shutdown()
+        return executor, scheduler, results
+
+    executor, scheduler, results = asyncio.run(main())
+    assert results == [{"0": 16}] * 4
+    assert executor.peak == 2
+    assert scheduler.jobs == 4
+
+
+def test_submit_is_rejected_when_the_queue_is_full():
+    async def main():
+        executor = _BlockingExecutor(workers=2)
+        scheduler = QuantumBatchScheduler(executor, max_batch_size=1, max_wait=0.0, max_queued=2)
+        running = [asyncio.ensure_future(scheduler.submit(_circuit(), 16)) for _ in range(2)]
+        await asyncio.wait_for(executor.started.wait(), 1.0)
+        queued = [asyncio.ensure_future(scheduler.submit(_circuit(), 16)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(QuantumOverloadedError):
+            await scheduler.submit(_circuit(), 16)
+
+        executor.release.set()
+        await asyncio.gather(*running, *queued)
+        scheduler.shutdown()
+        return scheduler
+
+    scheduler = asyncio.run(main())
+    assert scheduler.rejected == 1
+    assert scheduler.jobs == 4
+
+
+def test_failed_job_frees_its_worker_slot():
+    class _FailingExecutor(_BlockingExecutor):
+        async def run_batch(self, circuits, shots, seed):
+            raise RuntimeError("worker died")
+
+    async def main():
+        scheduler = QuantumBatchScheduler(
+            _FailingExecutor(workers=1), max_batch_size=1, max_wait=0.0, max_queued=4
+        )
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(scheduler.submit(_circuit(), 16), 1.0)
+        scheduler.shutdown()
+
+    asyncio.run(main())
+
+
+def test_broken_pool_is_replaced():
+    class _BrokenPool:
+        shut_down = False
+
+        def submit(self, *args):
+            future = Future()
+            future.set_exception(BrokenProcessPool("worker exited"))
+            return future
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shut_down = True
+
+    executor = QuantumExecutionService(workers=1, max_pending=4, timeout=1.0, max_jobs_per_worker=10)
+    broken = executor._pool = _BrokenPool()
+    with pytest.raises(QuantumExecutionError):
+        asyncio.run(executor.run(_circuit(), 16))
+    assert broken.shut_down and executor._pool is None
+    assert executor.pool_restarts == 1
@@ -0,0 +1,104 @@
+import random
+import numpy as np
+import pytest
+from qiskit.quantum_info import Statevector
+from app.services.quantum import (
+    EXECUTION_MODES, QuantumDecisionEngine, build_grover_circuit,
+    grover_probabilities, optimal_iterations
+)
+
+WORDS = ["sense", "appreciate", "funny", "quantum", "message", "think", "sorry", "great",
+         "bad", "help", "carefully", "understand", "haha", "analysis", "matrix", "!"]
+
+SHOTS = 4096
+
+
+def _random_case(rng: random.Random):
+    candidates = [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 14)))
+        for _ in range(rng.randint(2, 8))
+    ]
+    profile = {
+        "ideal_response_length": rng.choice([20, 50, 80]),
+        "empathy": rng.random(),
+        "humor": rng.random(),
+        "formality": rng.random()
+    }
+    context = {"current_sentiment": rng.uniform(-1, 1)}
+    return candidates, profile, context
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = QuantumDecisionEngine(mode="analytic", seed=7)
+    engine.shots = SHOTS
+    return engine
+
+
+@pytest.mark.parametrize("num_states,num_marked,expected", [
+    (4, 0, 0),
+    (4, 1, 1),
+    (4, 2, 0),
+    (4, 3, 0),
+    (8, 1, 2),
+    (8, 3, 1),
+    (8, 4, 0)
+])
+def test_optimal_iterations(num_states, num_marked, expected):
+    assert optimal_iterations(num_states, num_marked) == expected
+
+
+@pytest.mark.parametrize("num_qubits,marked", [
+    (1, [1]),
+    (2, [3]),
+    (2, [0, 1, 2]),
+    (3, [5]),
+    (3, [0, 6, 7]),
+    (3, [1, 2, 3, 4])
+])
+def test_analytic_matches_statevector(num_qubits, marked):
+    iterations = optimal_iterations(2 ** num_qubits, len(marked))
+    exact = Statevector(build_grover_circuit(num_qubits, marked, iterations)).probabilities()
+    np.testing.assert_allclose(
+        grover_probabilities(num_qubits, marked, iterations), exact, atol=1e-9
+    )
+
+
+@pytest.mark.parametrize("num_qubits,marked", [(2, [3]), (3, [0, 6, 7]), (3, [2, 5])])
+def test_aer_matches_analytic_within_shot_noise(engine, num_qubits, marked):
+    iterations = optimal_iterations(2 ** num_qubits, len(marked))
+    circuit = engine._grover_circuit(num_qubits, marked, iterations, measured=True)
+    counts = engine.backend.run(circuit, shots=SHOTS, seed_simulator=7).result().get_counts()
+    sampled = engine._count_vector(counts, 2 ** num_qubits) / SHOTS
+
+    expected = grover_probabilities(num_qubits, marked, iterations)
+    # Five binomial standard errors per state, with a floor for p near 0 or 1
+    tolerance = 5 * np.sqrt(np.maximum(expected * (1 - expected), 1 / SHOTS) / SHOTS)
+    assert np.all(np.abs(sampled - expected) <= tolerance)
+
+
+def test_modes_pick_the_same_candidate(engine):
+    rng = random.Random(7)
+    for _ in range(40):
+        candidates, profile, context = _random_case(rng)
+        picks = {
+            mode: engine.select_index(candidates, profile, context, mode=mode)
+            for mode in EXECUTION_MODES
+        }
+        assert len(set(picks.values())) == 1, (picks, candidates)
+
+
+def test_three_of_four_marked_is_a_tie_in_every_mode(engine):
+    # Four candidates with three marked: no amplification, so the pick comes
+    # from the score tie-break rather than from shot noise
+    num_qubits, marked = 2, [0, 1, 2]
+    probabilities = grover_probabilities(num_qubits, marked, optimal_iterations(4, 3))
+    assert np.allclose(probabilities, 0.25)
+
+    scores = [0.2, 0.9, 0.5, 0.1]
+    picks = {engine._decode_probabilities(probabilities, 4, scores)}
+    circuit = engine._grover_circuit(num_qubits, marked, 0, measured=True)
+    for seed in range(5):
+        counts = engine.backend.run(circuit, shots=SHOTS, seed_simulator=seed).result().get_counts()
+        picks.add(engine._decode_counts(engine._count_vector(counts, 4), 4, scores))
+    assert picks == {1}
@@ -0,0 +1,67 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from qiskit import QuantumCircuit
+from app.services.quantum_optimizer import QuantumOptimizer
+
+
+def _slow_build(calls: list, started: threading.Event = None, release: threading.Event = None):
+    def build():
+        calls.append(threading.get_ident())
+        if started is not None:
+            started.set()
+            release.wait(1.0)
+        circuit = QuantumCircuit(1)
+        circuit.h(0)
+        return circuit
+    return build
+
+
+def test_concurrent_misses_share_one_compile():
+    optimizer = QuantumOptimizer(cache_size=4)
+    calls = []
+    build = _slow_build(calls)
+
+    def slow():
+        time.sleep(0.05)
+        return build()
+
+    with ThreadPoolExecutor(4) as pool:
+        circuits = list(pool.map(lambda _: optimizer.get_or_compile("k", slow, transpiled=False), range(4)))
+
+    assert len(calls) == 1
+    assert all(c is circuits[0] for c in circuits)
+    assert optimizer.stats()["shared_compiles"] == 3
+
+
+def test_other_keys_are_served_while_one_compiles():
+    optimizer = QuantumOptimizer(cache_size=4)
+    started, release = threading.Event(), threading.Event()
+    optimizer.get_or_compile("cached", _slow_build([]), transpiled=False)
+
+    with ThreadPoolExecutor(1) as pool:
+        slow = pool.submit(optimizer.get_or_compile, "slow", _slow_build([], started, release), False)
+        assert started.wait(1.0)
+        # Not blocked behind the compile in progress
+        assert optimizer.get_or_compile("cached", _slow_build([]), transpiled=False) is not None
+        release.set()
+        slow.result(1.0)
+
+
+def test_failed_compile_reaches_waiters_and_is_retried():
+    optimizer = QuantumOptimizer(cache_size=4)
+
+    def broken():
+        time.sleep(0.05)
+        raise RuntimeError("bad circuit")
+
+    with ThreadPoolExecutor(2) as pool:
+        futures = [pool.submit(optimizer.get_or_compile, "k", broken, False) for _ in range(2)]
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result()
+
+    calls = []
+    assert optimizer.get_or_compile("k", _slow_build(calls), transpiled=False) is not None
+    assert len(calls) == 1
@@ -0,0 +1,78 @@
+import asyncio
+import numpy as np
+import pytest
+from app.services.quantum import QuantumDecisionEngine
+from app.services.quantum_sampling import ShotPolicy, decision_confidence
+
+CANDIDATES = ["I sense this matters", "I appreciate it", "haha funny", "analysis matrix"]
+PROFILE = {"ideal_response_length": 20, "empathy": 0.5, "humor": 0.3, "formality": 0.6}
+CONTEXT = {"current_sentiment": 0.0}
+
+
+class _FixedScheduler:
+    """Returns the same measured distribution for every round"""
+    def __init__(self, distribution):
+        self.distribution = distribution
+        self.submitted = []
+
+    async def submit(self, circuit, shots, seed=None):
+        self.submitted.append(shots)
+        return {
+            format(state, "02b"): int(round(p * shots))
+            for state, p in enumerate(self.distribution) if p
+        }
+
+
+def _decide(distribution, policy: ShotPolicy):
+    engine = QuantumDecisionEngine(mode="aer", seed=7)
+    engine.scheduler = _FixedScheduler(distribution)
+    decision = asyncio.run(engine._sample_decision(CANDIDATES, PROFILE, CONTEXT, policy))
+    return decision, engine.scheduler.submitted
+
+
+def test_rounds_double_the_total_up_to_the_cap():
+    assert ShotPolicy(64, 512, 0.95).rounds() == [64, 64, 128, 256]
+    assert ShotPolicy(64, 500, 0.95).rounds() == [64, 64, 128, 244]
+    assert ShotPolicy(64, 512, 0.95, adaptive=False).rounds() == [512]
+    # Initial shots never exceed the cap
+    assert ShotPolicy(1024, 256, 0.95).rounds() == [256]
+
+
+def test_per_round_confidence_splits_the_error_budget():
+    policy = ShotPolicy(64, 512, 0.95)
+    assert policy.per_round_confidence == pytest.approx(1 - 0.05 / 4)
+
+
+def test_clear_leader_stops_after_the_first_round():
+    decision, submitted = _decide([0.0, 0.0, 0.97, 0.03], ShotPolicy(64, 1024, 0.95))
+    assert decision.index == 2
+    assert submitted == [64]
+    assert decision.stopped_early and decision.rounds == 1 and decision.shots == 64
+    assert decision.confidence >= ShotPolicy(64, 1024, 0.95).per_round_confidence
+
+
+def test_unclear_leader_spends_the_whole_cap():
+    policy = ShotPolicy(64, 512, 0.99)
+    # Candidates 0 and 1 are within shot noise of each other, so the pick goes
+    # to 0 on score; 1 is measured slightly more often, which keeps the
+    # confidence short of the target even with the indifference margin
+    decision, submitted = _decide([0.48, 0.52, 0.0, 0.0], policy)
+    assert decision.index == 0
+    assert submitted == policy.rounds()
+    assert decision.shots == 512
+    assert not decision.stopped_early and decision.rounds == len(policy.rounds())
+
+
+def test_indifference_margin_only_helps_against_candidates_that_lose_ties():
+    counts = np.array([500, 500])
+    # Equal counts: the lower-scored candidate would lose a tie anyway, so a
+    # gap under the margin is enough
+    assert decision_confidence(counts, 0, [0.9, 0.1], indifference=0.1) > 0.99
+    assert decision_confidence(counts, 0, [0.9, 0.1], indifference=0.0) == pytest.approx(0.5)
+    # Against a higher-scored candidate the margin doesn't apply
+    assert decision_confidence(counts, 0, [0.1, 0.9], indifference=0.1) == pytest.approx(0.5)
+
+
+def test_confidence_edge_cases():
+    assert decision_confidence(np.array([0, 0]), 0, [1, 0], 0.1) == 0.0
+    assert decision_confidence(np.array([7]), 0, [1], 0.1) == 1.0
@@ -0,0 +1,23 @@
+from app.services.sentiment import SentimentCache, text_key
+
+
+def test_text_key_ignores_case_and_whitespace():
+    assert text_key("Hello   World") == text_key(" hello world ")
+    assert text_key("hello world") != text_key("hello, world")
+
+
+def test_sentiment_cache_evicts_least_recently_used():
+    cache = SentimentCache(max_size=2)
+    cache.set(b"a", 0.1)
+    cache.set(b"b", 0.2)
+    assert cache.get(b"a") == 0.1  # a is now the most recent
+    cache.set(b"c", 0.3)
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == 0.1 and cache.get(b"c") == 0.3
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+
+def test_sentiment_cache_keeps_zero_scores():
+    cache = SentimentCache(max_size=2)
+    cache.set(b"neutral", 0.0)
+    assert cache.get(b"neutral") == 0.0
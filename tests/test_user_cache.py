@@ -0,0 +1,86 @@
+import dataclasses
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import UnmappedInstanceError
+import app.db.models.heatmap  # noqa: F401  (resolves User's relationships)
+from app.db.models.user import User
+from app.services.user_cache import CurrentUser, auth_user_cache
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    auth_user_cache.clear()
+    with Session(engine) as session:
+        session.add(User(username="ada", email="ada@example.com", hashed_password="x",
+                         subscription_tier="free"))
+        session.commit()
+        yield session
+    auth_user_cache.clear()
+
+
+def _cache(db, token="token"):
+    seen = auth_user_cache.generation
+    user = db.query(User).filter_by(email="ada@example.com").one()
+    return auth_user_cache.set(token, {"sub": user.email}, user, seen)
+
+
+def test_cached_user_is_a_read_only_copy(db):
+    cached = _cache(db)
+    assert isinstance(cached, CurrentUser)
+    assert cached.subscription_tier == "free"
+    assert cached.personality_matrix["empathy"] == 0.5
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        cached.subscription_tier = "premium"
+    with pytest.raises(UnmappedInstanceError):
+        db.add(cached)
+
+
+def test_tier_change_drops_the_entry_on_commit(db):
+    _cache(db)
+    user = db.query(User).one()
+    user.subscription_tier = "premium"
+    db.flush()
+    # Not committed yet: other requests must keep seeing the committed row
+    assert auth_user_cache.get("token") is not None
+
+    db.commit()
+    assert auth_user_cache.get("token") is None
+    assert _cache(db).subscription_tier == "premium"
+
+
+def test_rolled_back_change_keeps_the_entry(db):
+    _cache(db)
+    db.query(User).one().subscription_tier = "premium"
+    db.flush()
+    db.rollback()
+    assert auth_user_cache.get("token")[1].subscription_tier == "free"
+
+
+def test_unwatched_change_keeps_the_entry(db):
+    _cache(db)
+    db.query(User).one().created_at = None
+    db.commit()
+    assert auth_user_cache.get("token") is not None
+
+
+def test_bulk_update_clears_the_cache(db):
+    _cache(db, "a")
+    _cache(db, "b")
+    db.execute(update(User).values(quantum_access=True))
+    db.commit()
+    assert auth_user_cache.get("a") is None and auth_user_cache.get("b") is None
+
+
+def test_row_read_before_a_commit_is_not_cached(db):
+    seen = auth_user_cache.generation
+    stale = db.query(User).one()
+    # Another request commits a change while this one was reading
+    auth_user_cache.invalidate_subject(stale.email)
+
+    returned = auth_user_cache.set("token", {"sub": stale.email}, stale, seen)
+    assert returned.email == stale.email
+    assert auth_user_cache.get("token") is None
@@ -0,0 +1,54 @@
+from app.schemas.voice import VoiceAnalysisResult
+from app.services import voice_cache
+from app.services.voice_cache import VoiceResultCache, audio_key
+
+
+def _result(text: str = "hello", padding: int = 0):
+    return text, VoiceAnalysisResult(
+        text=text,
+        emotion={"arousal": 0.1, "valence": 0.2, "dominance": 0.3},
+        features_mode="summary",
+        voice_features={"pad": "x" * padding}
+    )
+
+
+def test_audio_key_depends_on_bytes_format_and_parameters():
+    key = audio_key(b"RIFF", "wav", 16000, "summary")
+    assert key == audio_key(b"RIFF", "wav", 16000, "summary")
+    assert key != audio_key(b"RIFX", "wav", 16000, "summary")
+    assert key != audio_key(b"RIFF", "wav", 16000, "full")
+    assert key != audio_key(b"RIFF", "mpeg", 16000, "summary")
+
+
+def test_voice_cache_is_bounded_by_bytes():
+    cache = VoiceResultCache(max_bytes=2000, ttl=60)
+    for i in range(10):
+        cache.set(bytes([i]), _result(padding=500))
+    assert cache.bytes <= 2000
+    assert cache.get(bytes([9])) is not None
+    assert cache.get(bytes([0])) is None
+    assert cache.evictions > 0
+
+
+def test_voice_cache_skips_results_larger_than_the_cache():
+    cache = VoiceResultCache(max_bytes=100, ttl=60)
+    cache.set(b"k", _result(padding=1000))
+    assert cache.get(b"k") is None
+    assert cache.stats()["oversized"] == 1
+
+
+def test_voice_cache_entries_expire(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(voice_cache.time, "monotonic", lambda: clock[0])
+    cache = VoiceResultCache(max_bytes=10_000, ttl=5)
+    cache.set(b"k", _result())
+    assert cache.get(b"k")[0] == "hello"
+    clock[0] += 6
+    assert cache.get(b"k") is None
+    assert cache.bytes == 0 and cache.stats()["expirations"] == 1
+
+
+def test_voice_cache_keeps_no_speech_results():
+    cache = VoiceResultCache(max_bytes=10_000, ttl=60)
+    cache.set(b"silence", _result(text=None))
+    assert cache.get(b"silence") is not None
@@ -0,0 +1,24 @@
+import asyncio
+from app.schemas.voice import VoiceAnalysisResult
+from app.services.ai_services import ai_service
+from app.services.user_cache import CurrentUser
+
+
+def _user(tier: str) -> CurrentUser:
+    return CurrentUser(1, "ada", "ada@example.com", True, tier, True, True, {"empathy": 0.9}, {})
+
+
+def _analysis(valence: float, arousal: float) -> VoiceAnalysisResult:
+    return VoiceAnalysisResult(text="hello", emotion={"valence": valence, "arousal": arousal})
+
+
+def test_premium_voice_response_is_one_of_the_candidates():
+    fallbacks = ai_service.quantum_fallbacks
+    response = asyncio.run(ai_service.generate_voice_response(_user("premium"), _analysis(0.8, 0.9)))
+    assert response in ai_service._voice_candidates()
+    assert ai_service.quantum_fallbacks == fallbacks
+
+
+def test_free_tier_gets_the_classic_response():
+    response = asyncio.run(ai_service.generate_voice_response(_user("free"), _analysis(0.1, 0.2)))
+    assert response == "I hear some frustration in your voice. Let me help."
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from app.services.voice_stream import StreamLimitError, VoiceStreamSession
+
+SAMPLE_RATE = 16000
+
+
+def _tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.4 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _feed(session: VoiceStreamSession, data: bytes, chunk: int):
+    for start in range(0, len(data), chunk):
+        session.feed(data[start:start + chunk])
+    session.finish()
+    return session.measures()
+
+
+def test_measures_do_not_depend_on_chunking():
+    pcm = (_tone(1.0) * 32767).astype("<i2").tobytes()
+    whole = _feed(VoiceStreamSession(SAMPLE_RATE), pcm, len(pcm))
+    # Odd chunk sizes split samples across chunks
+    chunked = _feed(VoiceStreamSession(SAMPLE_RATE), pcm, 777)
+    for name in ("energy", "pitch", "zero_crossing_rate", "tempo"):
+        assert chunked[name] == pytest.approx(whole[name], rel=1e-4, abs=1e-6)
+    assert 200 < whole["pitch"] < 240
+
+
+def test_pcm16_and_f32_streams_agree():
+    y = _tone(0.5)
+    pcm16 = _feed(VoiceStreamSession(SAMPLE_RATE, "pcm16"), (y * 32767).astype("<i2").tobytes(), 4096)
+    f32 = _feed(VoiceStreamSession(SAMPLE_RATE, "f32"), y.astype("<f4").tobytes(), 4096)
+    assert f32["energy"] == pytest.approx(pcm16["energy"], rel=1e-3)
+
+
+def test_kept_audio_round_trips_and_memory_stays_bounded_without_it():
+    y = _tone(0.5)
+    pcm = (y * 32767).astype("<i2").tobytes()
+    kept = VoiceStreamSession(SAMPLE_RATE, keep_audio=True)
+    dropped = VoiceStreamSession(SAMPLE_RATE, keep_audio=False)
+    _feed(kept, pcm, 3200)
+    _feed(dropped, pcm, 3200)
+    np.testing.assert_allclose(kept.audio(), y, atol=1e-4)
+    assert dropped.buffered_bytes() < kept.buffered_bytes()
+    assert dropped.audio().size == 0
+
+
+def test_limits():
+    session = VoiceStreamSession(SAMPLE_RATE, max_seconds=0.1, max_chunk_bytes=4096)
+    with pytest.raises(StreamLimitError):
+        session.feed(b"\0" * 8192)
+    session.feed(b"\0" * 3200)
+    with pytest.raises(StreamLimitError):
+        session.feed(b"\0" * 400)
+
+
+def test_clip_shorter_than_one_frame_is_still_analyzed():
+    session = VoiceStreamSession(SAMPLE_RATE)
+    session.feed((_tone(0.01) * 32767).astype("<i2").tobytes())
+    session.finish()
+    assert session.frames == 1
+    assert session.measures()["energy"] > 0
+
+
+def test_unknown_encoding():
+    with pytest.raises(ValueError):
+        VoiceStreamSession(SAMPLE_RATE, encoding="mp3")